@@ -1,10 +1,16 @@
 import abc
 from abc import abstractmethod
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from django.db.models import QuerySet
+from django.utils import timezone
+from pymongo.collection import Collection
 
 from DepartmentApp.models import Department
 from ProductManagementService.logger import logger
+from ProductManagementService.mongo import get_collection, get_version, \
+    lookups_to_query, set_fields, to_document, to_model, to_projection
 
 
 class DepartmentOps(abc.ABC):
@@ -13,14 +19,16 @@ class DepartmentOps(abc.ABC):
     """
 
     @abstractmethod
-    def query_all(self) -> QuerySet[Department]:
+    def query_all(self,
+                  fields: Optional[tuple] = None) -> QuerySet[Department]:
         """
         The method retrieves all departments from the database.
         """
         raise NotImplementedError
 
     @abstractmethod
-    def query_by_id(self, department_id: str) -> Department:
+    def query_by_id(self, department_id: str,
+                    fields: Optional[tuple] = None) -> Department:
         """
         The method retrieves a department by its ID from the
         database.
@@ -28,7 +36,8 @@ class DepartmentOps(abc.ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def query_by_name(self, name: str) -> Department:
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> Department:
         """
         This method defines the structure to query departments by name.
         """
@@ -48,6 +57,15 @@ class DepartmentOps(abc.ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def partial_update(self, department_id: str,
+                       changes: dict) -> Department:
+        """
+        This method sets only the given fields, and the last update date,
+        in a single atomic write.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def delete(self, department_id: str) -> bool:
         """
@@ -55,6 +73,14 @@ class DepartmentOps(abc.ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def version(self) -> Tuple[int, Optional[datetime]]:
+        """
+        This method returns the number of records and their most recent
+        last update date.
+        """
+        raise NotImplementedError
+
 
 class DepartmentOpsMongo(DepartmentOps):
     """
@@ -62,21 +88,33 @@ class DepartmentOpsMongo(DepartmentOps):
     interface by connecting to a Mongo database.
     """
 
-    def query_all(self) -> QuerySet[Department]:
+    def query_all(self,
+                  fields: Optional[tuple] = None) -> QuerySet[Department]:
         logger.info(" Adapter Layer - query_all method ::: ")
-        departments = Department.objects.all()
+        departments = self.select(fields).all()
         return departments
 
-    def query_by_id(self, department_id: str) -> Department:
+    def query_by_id(self, department_id: str,
+                    fields: Optional[tuple] = None) -> Department:
         logger.info("Adapter Layer - query_by_id method ::: ")
-        department = Department.objects.get(_id=department_id)
+        department = self.select(fields).get(_id=department_id)
         return department
 
-    def query_by_name(self, name: str) -> Department:
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> Department:
         logger.info("Adapter Layer - query_by_name method ::: ")
-        department = Department.objects.filter(name__icontains=name)
+        department = self.select(fields).filter(name__icontains=name)
         return department
 
+    def select(self, fields: Optional[tuple]) -> QuerySet[Department]:
+        """
+        This method restricts the loaded columns, djongo translates them
+        into the projection of the Mongo query.
+        """
+        if fields is None:
+            return Department.objects.all()
+        return Department.objects.only(*fields)
+
     def create(self, data: dict) -> Department:
         logger.info("Adapter Layer - new_department method ::: ")
         name = data.get("name")
@@ -90,8 +128,98 @@ class DepartmentOpsMongo(DepartmentOps):
         department.save()
         return department
 
+    def partial_update(self, department_id: str,
+                       changes: dict) -> Department:
+        logger.info("Adapter Layer - partial_update method :::")
+        # save() rewrites the whole document, the changes are sent as a $set.
+        return set_fields(Department, department_id, changes,
+                          "last_update_date")
+
     def delete(self, department_id: str) -> bool:
         logger.info("Adapter Layer - delete method ::: ")
         department = Department.objects.get(_id=department_id)
         department.delete()
         return True
+
+    def version(self) -> Tuple[int, Optional[datetime]]:
+        logger.info("Adapter Layer - version method ::: ")
+        return get_version(Department, {}, "last_update_date")
+
+
+class DepartmentOpsPyMongo(DepartmentOps):
+    """
+    The concrete class implements the operations of the DepartmentOps
+    interface with direct pymongo calls over the shared client, skipping the
+    SQL translation of djongo.
+    """
+
+    def collection(self) -> Collection:
+        return get_collection(Department)
+
+    def query_all(self,
+                  fields: Optional[tuple] = None) -> List[Department]:
+        logger.info(" Adapter Layer - query_all method ::: ")
+        documents = self.collection().find({}, to_projection(fields))
+        return [to_model(Department, document, fields)
+                for document in documents]
+
+    def query_by_id(self, department_id: str,
+                    fields: Optional[tuple] = None) -> Department:
+        logger.info("Adapter Layer - query_by_id method ::: ")
+        document = self.collection().find_one({"_id": department_id},
+                                              to_projection(fields))
+        if document is None:
+            raise Department.DoesNotExist(
+                "Department matching query does not exist.")
+        return to_model(Department, document, fields)
+
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> List[Department]:
+        logger.info("Adapter Layer - query_by_name method ::: ")
+        documents = self.collection().find(
+            lookups_to_query({"name__icontains": name}),
+            to_projection(fields))
+        return [to_model(Department, document, fields)
+                for document in documents]
+
+    def create(self, data: dict) -> Department:
+        logger.info("Adapter Layer - new_department method ::: ")
+        now = timezone.now()
+        document = {
+            "name": data.get("name"),
+            "description": data.get("description"),
+            "date": now,
+            "last_update_date": now,
+        }
+        document["_id"] = self.collection().insert_one(document).inserted_id
+        return to_model(Department, document)
+
+    def update(self, department: Department) -> Department:
+        logger.info("Adapter Layer - update method :::")
+        department.last_update_date = timezone.now()
+        document = to_document(department)
+        oid = document.pop("_id")
+        result = self.collection().update_one({"_id": oid},
+                                              {"$set": document})
+        if result.matched_count == 0:
+            raise Department.DoesNotExist(
+                "Department matching query does not exist.")
+        return department
+
+    def partial_update(self, department_id: str,
+                       changes: dict) -> Department:
+        logger.info("Adapter Layer - partial_update method :::")
+        return set_fields(Department, department_id, changes,
+                          "last_update_date")
+
+    def delete(self, department_id: str) -> bool:
+        logger.info("Adapter Layer - delete method ::: ")
+        result = self.collection().delete_one({"_id": department_id})
+        if result.deleted_count == 0:
+            raise Department.DoesNotExist(
+                "Department matching query does not exist.")
+        return True
+
+    def version(self) -> Tuple[int, Optional[datetime]]:
+        logger.info("Adapter Layer - version method ::: ")
+        return get_version(Department, {}, "last_update_date")
@@ -16,3 +16,5 @@ class AppConstants:
         DELETE_DEPARTMENT_ID_NAME: str = "delete_department"
         UPDATE_DEPARTMENT: str = "departments/update/"
         UPDATE_DEPARTMENT_NAME: str = "update_department"
+        ASYNC_DEPARTMENTS: str = "async/departments/"
+        ASYNC_DEPARTMENTS_NAME: str = "async_departments"
@@ -0,0 +1,22 @@
+from pymongo import ASCENDING
+
+from ProductManagementService.indexes import IndexSpec
+from .models import Department
+
+MODEL = Department
+
+INDEXES = (
+    IndexSpec(
+        name="name_1",
+        keys=(("name", ASCENDING),),
+        serves=(
+            "GET departments/?name= (the regex scans the index, not the "
+            "documents)",
+        ),
+    ),
+    IndexSpec(
+        name="last_update_date_1",
+        keys=(("last_update_date", ASCENDING),),
+        serves=("ETag of GET departments/ (covered max of last_update_date)",),
+    ),
+)
@@ -1,8 +1,14 @@
 import injector
 from injector import Binder, singleton
 
-from .components.department_ops import DepartmentOps, DepartmentOpsMongo
+from ProductManagementService.env import AppEnv
+from .components.department_async_ops import DepartmentAsyncOps, \
+    DepartmentOpsMotor
+from .components.department_ops import DepartmentOps, DepartmentOpsMongo, \
+    DepartmentOpsPyMongo
 from .services.departments import DepartmentsService, DepartmentsMongoService
+from .services.departments_async import DepartmentsAsyncService, \
+    DepartmentsMotorService
 
 
 class DepartmentInjector(injector.Module):
@@ -20,7 +26,8 @@ class DepartmentInjector(injector.Module):
         """
         binder.bind(
             DepartmentOps,
-            to=DepartmentOpsMongo,
+            to=DepartmentOpsPyMongo if AppEnv.MONGO_OPS_DRIVER == "pymongo"
+            else DepartmentOpsMongo,
             scope=singleton,
         )
         binder.bind(
@@ -28,3 +35,13 @@ class DepartmentInjector(injector.Module):
             to=DepartmentsMongoService,
             scope=singleton,
         )
+        binder.bind(
+            DepartmentAsyncOps,
+            to=DepartmentOpsMotor,
+            scope=singleton,
+        )
+        binder.bind(
+            DepartmentsAsyncService,
+            to=DepartmentsMotorService,
+            scope=singleton,
+        )
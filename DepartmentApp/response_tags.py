@@ -0,0 +1,13 @@
+from django.dispatch import receiver
+
+from DepartmentApp.signals import department_changed
+from ProductManagementService.response_cache import invalidate, \
+    record_tags
+
+# Tag of the cached department responses.
+DEPARTMENTS_TAG: str = "departments"
+
+
+@receiver(department_changed)
+def invalidate_department(sender, id: str, **kwargs):
+    invalidate(record_tags(DEPARTMENTS_TAG, id))
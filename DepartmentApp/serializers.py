@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from ProductManagementService.encoders import ModelEncoder
 from .models import Department
 
 
@@ -33,4 +34,8 @@ class OutSerializer(serializers.ModelSerializer):
 
     def get__id(self, obj):
         return str(obj._id)
-#
+
+
+DEPARTMENT_ENCODER = ModelEncoder(
+    fields=OutSerializer.Meta.fields,
+)
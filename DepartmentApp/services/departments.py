@@ -1,14 +1,30 @@
 import abc
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from bson import ObjectId
 from django.db.models import QuerySet
+from django.dispatch import receiver
 from injector import inject
 
 from DepartmentApp.components.department_ops import DepartmentOps
 from DepartmentApp.models import Department
+from DepartmentApp.serializers import DEPARTMENT_ENCODER
+from DepartmentApp.signals import department_changed
+from ProductManagementService import metrics
+from ProductManagementService.concurrency import SingleFlight, coalesced
 from ProductManagementService.logger import logger
 
+# The listings of departments that are read at the same time share the
+# query.
+DEPARTMENT_QUERIES = SingleFlight()
+metrics.register("department_queries", DEPARTMENT_QUERIES.stats)
+
+
+@receiver(department_changed)
+def forget_department_queries(sender, **kwargs):
+    DEPARTMENT_QUERIES.forget()
+
 
 class DepartmentsService(abc.ABC):
     """
@@ -16,7 +32,8 @@ class DepartmentsService(abc.ABC):
     """
 
     @abc.abstractmethod
-    def query_all(self) -> QuerySet[Department]:
+    def query_all(self,
+                  fields: Optional[tuple] = None) -> QuerySet[Department]:
         """
         The  method retrieves all departments from the concrete class
         'DepartmentOpsMongo'.
@@ -24,7 +41,8 @@ class DepartmentsService(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_id(self, department_id: str) -> Department:
+    def query_by_id(self, department_id: str,
+                    fields: Optional[tuple] = None) -> Department:
         """
         The method retrieves a department by ID from the
         'DepartmentOpsMongo' concrete class.
@@ -32,13 +50,22 @@ class DepartmentsService(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_name(self, name: str) -> List[dict]:
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> List[dict]:
         """
         The method retrieves a department by name from the
         'DepartmentOpsMongo' concrete class.
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def version(self) -> Tuple[int, Optional[datetime]]:
+        """
+        This method returns the number of departments and their most recent
+        last update date.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def create(self, data: dict) -> dict:
         """
@@ -53,6 +80,13 @@ class DepartmentsService(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def partial_update(self, validated_data: dict, id: str) -> dict:
+        """
+        This method sets only the fields sent by the client.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def delete(self, department_id: str) -> bool:
         """
@@ -71,63 +105,76 @@ class DepartmentsMongoService(DepartmentsService):
     def __init__(self, department_ops: DepartmentOps):
         self.department_ops = department_ops
 
-    def query_all(self) -> List[dict]:
+    @coalesced(DEPARTMENT_QUERIES)
+    def query_all(self, fields: Optional[tuple] = None) -> List[dict]:
         logger.info("Service Layer - query_all method ::: ")
-        departments = self.department_ops.query_all()
+        departments = self.department_ops.query_all(fields)
         department_list = [
-            self.convert_to_dict(department) for department in departments
+            self.convert_to_dict(department, fields)
+            for department in departments
 
         ]
         return department_list
 
-    def query_by_id(self, department_id: str) -> Department:
+    def query_by_id(self, department_id: str,
+                    fields: Optional[tuple] = None) -> Department:
         logger.info("Service Layer - query_by_id method :: ")
         oid = ObjectId(department_id)
-        department = self.convert_to_dict(self.department_ops.query_by_id(oid))
+        department = self.convert_to_dict(
+            self.department_ops.query_by_id(oid, fields), fields)
         return department
 
-    def query_by_name(self, name: str) -> List[dict]:
+    @coalesced(DEPARTMENT_QUERIES)
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> List[dict]:
         logger.info("Service Layer - query_by_name method :: ")
-        departments = self.department_ops.query_by_name(name)
+        departments = self.department_ops.query_by_name(name, fields)
         department_list = [
-            self.convert_to_dict(department) for department in departments
+            self.convert_to_dict(department, fields)
+            for department in departments
 
         ]
         return department_list
 
+    def version(self) -> Tuple[int, Optional[datetime]]:
+        logger.info("Service Layer - version method :: ")
+        return self.department_ops.version()
+
     def create(self, data: dict) -> dict:
         logger.info("Service Layer - create method :: ")
         department = self.convert_to_dict(self.department_ops.create(data))
+        department_changed.send(sender=self.__class__,
+                                id=str(department["_id"]))
         return department
 
     def update(self, validated_data: dict, id: str) -> dict:
         logger.info(
             "Service Layer - update method ::",
         )
+        # The fields sent as null keep their value.
+        changes = {field: value for field, value in validated_data.items()
+                   if value is not None}
         oid = ObjectId(id)
-        department = self.department_ops.query_by_id(oid)
-        name = validated_data.get("name")
-        if name is not None:
-            department.name = name
-        description = validated_data.get("description")
-        if description is not None:
-            department.description = description
-        department._id = oid
-        department_update = self.department_ops.update(department)
-        department_update._id = str(department_update._id)
-        return self.convert_to_dict(department_update)
+        department = self.department_ops.partial_update(oid, changes)
+        department_changed.send(sender=self.__class__, id=str(oid))
+        return self.convert_to_dict(department)
+
+    def partial_update(self, validated_data: dict, id: str) -> dict:
+        logger.info("Service Layer - partial_update method ::")
+        if not validated_data:
+            raise ValueError("The body does not contain any field.")
+        oid = ObjectId(id)
+        department = self.department_ops.partial_update(oid, validated_data)
+        department_changed.send(sender=self.__class__, id=str(oid))
+        return self.convert_to_dict(department)
 
     def delete(self, department_id: str) -> bool:
         logger.info("Service Layer - delete method :: ")
         department_oid = ObjectId(department_id)
-        return self.department_ops.delete(department_oid)
-
-    def convert_to_dict(self, object_model):
-        object_dict = {
-            '_id': str(object_model._id),
-            'name': object_model.name,
-            'description': object_model.description,
-            'date': object_model.formatted_date(),
-            'last_update_date': object_model.formatted_last_update_date()
-        }
-        return object_dict
+        result = self.department_ops.delete(department_oid)
+        department_changed.send(sender=self.__class__,
+                                id=str(department_oid))
+        return result
+
+    def convert_to_dict(self, object_model, fields: Optional[tuple] = None):
+        return DEPARTMENT_ENCODER.subset(fields).from_model(object_model)
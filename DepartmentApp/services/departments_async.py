@@ -0,0 +1,88 @@
+import abc
+from typing import List, Optional
+
+from bson import ObjectId
+from injector import inject
+
+from DepartmentApp.components.department_async_ops import \
+    DepartmentAsyncOps
+from DepartmentApp.serializers import DEPARTMENT_ENCODER
+from DepartmentApp.signals import department_changed
+from ProductManagementService.logger import logger
+
+
+class DepartmentsAsyncService(abc.ABC):
+    """
+    This interface defines the business logic used by the async views,
+    every method is a coroutine.
+    """
+
+    @abc.abstractmethod
+    async def query_all(self, fields: Optional[tuple] = None) -> List[dict]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def query_by_id(self, department_id: str,
+                          fields: Optional[tuple] = None) -> dict:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def query_by_name(self, name: str,
+                            fields: Optional[tuple] = None) -> List[dict]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def create(self, data: dict) -> dict:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, department_id: str) -> bool:
+        raise NotImplementedError
+
+
+class DepartmentsMotorService(DepartmentsAsyncService):
+    """
+    Concrete class implements the methods of the 'DepartmentsAsyncService'
+    interface over the DepartmentAsyncOps operations.
+    """
+
+    @inject
+    def __init__(self, department_ops: DepartmentAsyncOps):
+        self.department_ops = department_ops
+
+    async def query_all(self, fields: Optional[tuple] = None) -> List[dict]:
+        logger.info("Service Layer - async query_all method :: ")
+        encoder = DEPARTMENT_ENCODER.subset(fields)
+        departments = await self.department_ops.query_all(fields)
+        return [encoder.from_model(department)
+                for department in departments]
+
+    async def query_by_id(self, department_id: str,
+                          fields: Optional[tuple] = None) -> dict:
+        logger.info("Service Layer - async query_by_id method :: ")
+        department = await self.department_ops.query_by_id(
+            ObjectId(department_id), fields)
+        return DEPARTMENT_ENCODER.subset(fields).from_model(department)
+
+    async def query_by_name(self, name: str,
+                            fields: Optional[tuple] = None) -> List[dict]:
+        logger.info("Service Layer - async query_by_name method :: ")
+        encoder = DEPARTMENT_ENCODER.subset(fields)
+        departments = await self.department_ops.query_by_name(name, fields)
+        return [encoder.from_model(department)
+                for department in departments]
+
+    async def create(self, data: dict) -> dict:
+        logger.info("Service Layer - async create method :: ")
+        department = await self.department_ops.create(data)
+        department_changed.send(sender=self.__class__,
+                                id=str(department._id))
+        return DEPARTMENT_ENCODER.from_model(department)
+
+    async def delete(self, department_id: str) -> bool:
+        logger.info("Service Layer - async delete method :: ")
+        department_oid = ObjectId(department_id)
+        result = await self.department_ops.delete(department_oid)
+        department_changed.send(sender=self.__class__,
+                                id=str(department_oid))
+        return result
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after a department is created, updated or deleted, the 'id' argument
+# is the id of the department as a string.
+department_changed = Signal()
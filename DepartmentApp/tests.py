@@ -1,3 +1,376 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from bson import ObjectId
+from django.http import HttpResponse
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from DepartmentApp.components.department_ops import DepartmentOpsPyMongo
+from DepartmentApp.models import Department
+from DepartmentApp.response_tags import DEPARTMENTS_TAG
+from DepartmentApp.services.departments import DEPARTMENT_QUERIES, \
+    DepartmentsMongoService
+from DepartmentApp.signals import department_changed
+from DepartmentApp.views import DepartmentsAPIView
+from ProductManagementService import cache, response_cache
+from ProductManagementService.cache import ResponseCache
+from ProductManagementService.mongo import to_projection
+from ProductManagementService.response_cache import cached_response, \
+    collection_tags
+
+
+class ResponseCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(cache.time, "monotonic",
+                                    lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ResponseCache(max_bytes=100, ttl=10,
+                                   max_entry_bytes=60)
+
+    def test_hit_and_miss(self):
+        self.assertEqual(self.cache.get("a"), (None, False))
+        self.assertTrue(self.cache.set("a", "value", 10, ("tag",),
+                                       self.cache.generation))
+        self.assertEqual(self.cache.get("a"), ("value", False))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_entry_expires_after_ttl(self):
+        self.cache.set("a", "value", 10, (), self.cache.generation)
+        self.now += 10
+        self.assertEqual(self.cache.get("a"), (None, False))
+        self.assertEqual(self.cache.stats()["bytes"], 0)
+
+    def test_invalidation_drops_only_the_entries_of_its_tags(self):
+        generation = self.cache.generation
+        self.cache.set("a", "a", 10, ("departments",), generation)
+        self.cache.set("b", "b", 10, ("departments:1",), generation)
+        self.cache.invalidate_tags(("departments",))
+        self.assertEqual(self.cache.get("a"), (None, False))
+        self.assertEqual(self.cache.get("b"), ("b", False))
+
+    def test_fill_started_before_an_invalidation_is_not_stored(self):
+        generation = self.cache.generation
+        self.cache.invalidate_tags(("other",))
+        self.assertFalse(self.cache.set("a", "value", 10, ("tag",),
+                                        generation))
+        self.assertEqual(self.cache.get("a"), (None, False))
+
+    def test_evicts_least_recently_used_entries_by_size(self):
+        generation = self.cache.generation
+        self.cache.set("a", "a", 40, (), generation)
+        self.cache.set("b", "b", 40, (), generation)
+        self.cache.get("a")
+        self.cache.set("c", "c", 40, (), generation)
+        self.assertEqual(self.cache.get("b"), (None, False))
+        self.assertEqual(self.cache.get("a"), ("a", False))
+        self.assertEqual(self.cache.get("c"), ("c", False))
+        stats = self.cache.stats()
+        self.assertEqual((stats["bytes"], stats["evictions"]), (80, 1))
+
+    def test_large_entries_are_not_stored(self):
+        self.assertFalse(self.cache.set("a", "value", 61, (),
+                                        self.cache.generation))
+
+
+class DepartmentListView(APIView):
+    """
+    A view that counts its reads instead of querying the departments.
+    """
+
+    reads = 0
+    instances = []
+    # Set to write a department while the response is read.
+    write_during_read = None
+    # Set to make the reads fail.
+    error = None
+
+    def cache_tags(self, request):
+        return collection_tags(DEPARTMENTS_TAG,
+                               request.query_params.get("id"))
+
+    @cached_response(cache_tags)
+    def get(self, request):
+        type(self).reads += 1
+        type(self).instances.append(self)
+        if self.error is not None:
+            raise self.error
+        if self.write_during_read is not None:
+            department_changed.send(sender=None, id=self.write_during_read)
+        response = HttpResponse(b'[{"name":"a"}]',
+                                content_type="application/json")
+        response["ETag"] = '"v1"'
+        return response
+
+
+class CachedResponseTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(
+            response_cache, "RESPONSE_CACHE",
+            ResponseCache(max_bytes=1000, ttl=60, max_entry_bytes=1000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        DepartmentListView.reads = 0
+        DepartmentListView.instances = []
+        DepartmentListView.write_during_read = None
+        DepartmentListView.error = None
+        self.factory = APIRequestFactory()
+        self.view = DepartmentListView.as_view()
+        self.id = str(ObjectId())
+
+    def get(self, path="/departments/", **headers):
+        return self.view(self.factory.get(path, **headers))
+
+    def test_second_request_is_a_hit(self):
+        first = self.get()
+        second = self.get()
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], '"v1"')
+        self.assertEqual(DepartmentListView.reads, 1)
+
+    def test_parameters_in_another_order_share_the_entry(self):
+        self.get(f"/departments/?id={self.id}&fields=name")
+        response = self.get(f"/departments/?fields=name&id={self.id}")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_write_invalidates_its_tags(self):
+        listing = "/departments/"
+        record = f"/departments/?id={self.id}"
+        other = f"/departments/?id={ObjectId()}"
+        for path in (listing, record, other):
+            self.get(path)
+        department_changed.send(sender=None, id=self.id)
+        self.assertEqual(self.get(listing)["X-Cache"], "MISS")
+        self.assertEqual(self.get(record)["X-Cache"], "MISS")
+        self.assertEqual(self.get(other)["X-Cache"], "HIT")
+
+    def test_response_read_during_a_write_is_not_stored(self):
+        DepartmentListView.write_during_read = self.id
+        response = self.get()
+        self.assertNotIn("X-Cache", response)
+        DepartmentListView.write_during_read = None
+        self.assertEqual(self.get()["X-Cache"], "MISS")
+        self.assertEqual(DepartmentListView.reads, 2)
+
+    def test_not_modified_is_answered_from_the_cache(self):
+        self.get()
+        response = self.get(HTTP_IF_NONE_MATCH='"v1"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], '"v1"')
+        self.assertEqual(response.content, b"")
+        self.assertEqual(DepartmentListView.reads, 1)
+
+
+class ManualExecutor:
+    """
+    A refresh pool that runs the submitted calls when the test asks.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, function, *args):
+        self.calls.append((function, args))
+
+    def run(self):
+        calls, self.calls = self.calls, []
+        for function, args in calls:
+            function(*args)
+
+
+class StaleWhileRevalidateTests(SimpleTestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.executor = ManualExecutor()
+        for patcher in (
+            mock.patch.object(cache.time, "monotonic", lambda: self.now),
+            mock.patch.object(
+                response_cache, "RESPONSE_CACHE",
+                ResponseCache(max_bytes=1000, ttl=10, max_entry_bytes=1000,
+                              max_staleness=5)),
+            mock.patch.object(response_cache, "get_refresh_executor",
+                              lambda: self.executor),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        DepartmentListView.reads = 0
+        DepartmentListView.instances = []
+        DepartmentListView.write_during_read = None
+        DepartmentListView.error = None
+        self.factory = APIRequestFactory()
+        self.view = DepartmentListView.as_view()
+
+    def get(self, **headers):
+        return self.view(self.factory.get("/departments/", **headers))
+
+    def test_stale_only_within_the_staleness_window(self):
+        self.get()
+        self.now += 9
+        self.assertEqual(self.get()["X-Cache"], "HIT")
+        self.now += 1
+        response = self.get()
+        self.assertEqual(response["X-Cache"], "STALE")
+        self.assertEqual(response["Age"], "10")
+        self.now += 5
+        self.assertEqual(self.get()["X-Cache"], "MISS")
+
+    def test_single_refresh_per_key(self):
+        self.get()
+        self.now += 10
+        self.assertEqual(self.get()["X-Cache"], "STALE")
+        self.assertEqual(self.get()["X-Cache"], "STALE")
+        self.assertEqual(len(self.executor.calls), 1)
+        self.executor.run()
+        self.assertEqual(DepartmentListView.reads, 2)
+        self.assertEqual(self.get()["X-Cache"], "HIT")
+
+    def test_refresh_uses_a_new_view(self):
+        self.get(HTTP_IF_NONE_MATCH='"v0"')
+        self.now += 10
+        self.get(HTTP_IF_NONE_MATCH='"v0"')
+        self.executor.run()
+        first, refreshed = DepartmentListView.instances
+        self.assertIsNot(refreshed, first)
+        # The refresh must read the whole response, not a 304.
+        self.assertNotIn("HTTP_IF_NONE_MATCH", refreshed.request.META)
+
+    def test_failed_refresh_keeps_serving_the_stale_entry(self):
+        self.get()
+        self.now += 10
+        DepartmentListView.error = RuntimeError("not primary")
+        self.get()
+        with self.assertLogs(level="CRITICAL"):
+            self.executor.run()
+        self.assertEqual(self.get()["X-Cache"], "STALE")
+        # The failed refresh does not block the next one.
+        self.assertEqual(len(self.executor.calls), 1)
+        DepartmentListView.error = None
+        self.executor.run()
+        self.assertEqual(self.get()["X-Cache"], "HIT")
+
+
+class DepartmentQueriesTests(SimpleTestCase):
+
+    def test_write_forgets_the_queries_in_progress(self):
+        with mock.patch.object(DEPARTMENT_QUERIES, "forget") as forget:
+            department_changed.send(sender=None, id=str(ObjectId()))
+        forget.assert_called_once_with()
+
+
+class DepartmentFieldsetTests(SimpleTestCase):
+
+    def setUp(self):
+        self.ops = DepartmentOpsPyMongo()
+        self.collection = mock.Mock()
+        self.ops.collection = mock.Mock(return_value=self.collection)
+
+    def test_projection_of_the_requested_fields(self):
+        self.assertIsNone(to_projection(None))
+        self.assertEqual(to_projection(("_id", "name")),
+                         {"_id": True, "name": True})
+
+    def test_fields_are_pushed_down_to_mongo(self):
+        _id = ObjectId()
+        self.collection.find.return_value = [{"_id": _id, "name": "bakery"}]
+        departments = self.ops.query_all(("_id", "name"))
+        self.collection.find.assert_called_once_with(
+            {}, {"_id": True, "name": True})
+        self.assertEqual(departments[0]._id, _id)
+        self.assertEqual(departments[0].name, "bakery")
+        # The fields that were not read are deferred, not empty.
+        self.assertEqual(departments[0].get_deferred_fields(),
+                         {"description", "date", "last_update_date"})
+
+    def test_all_fields_without_a_fieldset(self):
+        self.collection.find_one.return_value = {"_id": 1, "name": "bakery"}
+        department = self.ops.query_by_id(1)
+        self.collection.find_one.assert_called_once_with({"_id": 1}, None)
+        self.assertEqual(department.get_deferred_fields(), set())
+
+    def test_missing_department(self):
+        self.collection.find_one.return_value = None
+        with self.assertRaises(Department.DoesNotExist):
+            self.ops.query_by_id(1, ("_id",))
+
+
+class DepartmentPatchTests(SimpleTestCase):
+
+    def setUp(self):
+        self.department_ops = mock.Mock()
+        self.oid = ObjectId()
+        self.department_ops.partial_update.side_effect = \
+            lambda oid, changes: Department(_id=oid, **changes)
+        self.service = DepartmentsMongoService(self.department_ops)
+
+    def patch(self, body: dict):
+        view = DepartmentsAPIView(self.service)
+        request = APIRequestFactory().patch(
+            f"/departments/update/?id={self.oid}", body, format="json")
+        view.setup(request)
+        return view.dispatch(request)
+
+    def test_only_the_sent_fields_are_written(self):
+        with mock.patch.object(department_changed, "send") as send:
+            response = self.patch({"description": None})
+        self.assertEqual(response.status_code, 200)
+        self.department_ops.partial_update.assert_called_once_with(
+            self.oid, {"description": None})
+        send.assert_called_once_with(sender=DepartmentsMongoService,
+                                     id=str(self.oid))
+
+    def test_empty_body_is_rejected(self):
+        with self.assertLogs(level="CRITICAL"):
+            response = self.patch({})
+        self.assertEqual(response.status_code, 400)
+        self.department_ops.partial_update.assert_not_called()
+
+    def test_missing_department(self):
+        self.department_ops.partial_update.side_effect = \
+            Department.DoesNotExist("Department matching query does not "
+                                    "exist.")
+        with self.assertLogs(level="CRITICAL"):
+            response = self.patch({"name": "Bakery"})
+        self.assertEqual(response.status_code, 404)
+
+
+class DepartmentConditionalGetTests(SimpleTestCase):
+
+    def setUp(self):
+        # The cached responses would answer before the ETag is checked.
+        patcher = mock.patch.object(
+            response_cache, "RESPONSE_CACHE",
+            ResponseCache(max_bytes=0, ttl=60, max_entry_bytes=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.department_ops = mock.Mock()
+        self.department_ops.version.return_value = (1, None)
+        self.department_ops.query_all.return_value = [
+            Department(_id=ObjectId(), name="Bakery")]
+        self.view = DepartmentsAPIView(
+            DepartmentsMongoService(self.department_ops))
+
+    def get(self, **headers):
+        request = APIRequestFactory().get("/departments/", **headers)
+        self.view.setup(request)
+        return self.view.dispatch(request)
+
+    def test_unchanged_departments_are_not_read(self):
+        etag = self.get()["ETag"]
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.department_ops.query_all.assert_called_once()
+
+    def test_write_changes_the_etag(self):
+        etag = self.get()["ETag"]
+        self.department_ops.version.return_value = (2, None)
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertNotEqual(response.status_code, 304)
+        self.assertNotEqual(response["ETag"], etag)
@@ -1,7 +1,7 @@
 from django.urls import path
 
 from .constants import AppConstants
-from .views import DepartmentsAPIView
+from .views import DepartmentsAPIView, DepartmentsAsyncAPIView
 
 urlpatterns = [
     path(
@@ -29,4 +29,9 @@ urlpatterns = [
         DepartmentsAPIView.as_view(),
         name=AppConstants.Api.CREATE_DEPARTMENT_NAME,
     ),
+    path(
+        AppConstants.Api.ASYNC_DEPARTMENTS,
+        DepartmentsAsyncAPIView.as_view(),
+        name=AppConstants.Api.ASYNC_DEPARTMENTS_NAME
+    ),
 ]
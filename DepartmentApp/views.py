@@ -1,20 +1,29 @@
 # Create your views here.
-import json
 import logging
 
 from django.core.exceptions import ObjectDoesNotExist
-from django.http import JsonResponse
 from injector import inject
 from rest_framework import request, status
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
 from rest_framework.views import APIView
 
 from DepartmentApp.serializers import (
+    DEPARTMENT_ENCODER,
     InDepartmentSerializer,
-    OutSerializer,
 )
+from DepartmentApp.response_tags import DEPARTMENTS_TAG
 from DepartmentApp.services.departments import DepartmentsService
+from DepartmentApp.services.departments_async import \
+    DepartmentsAsyncService
+from ProductManagementService import json_codec
+from ProductManagementService.async_views import AsyncAPIView
+from ProductManagementService.conditional import conditional_get
+from ProductManagementService.encoders import EncodedJsonResponse, \
+    JsonResponse
 from ProductManagementService.logger import logger
 from ProductManagementService.messages import ApiMessages as msg
+from ProductManagementService.response_cache import cached_response, \
+    collection_tags
 
 
 class DepartmentsAPIView(APIView):
@@ -37,9 +46,8 @@ class DepartmentsAPIView(APIView):
     def post(self, request: request.Request):
         logger.info("View - post method :::")
         try:
-            data = json.loads(request.body)
             serialized_department = InDepartmentSerializer(
-                data=data,
+                data=request.data,
                 many=False,
             )
             if not serialized_department.is_valid():
@@ -49,21 +57,9 @@ class DepartmentsAPIView(APIView):
                 )
             new_department = self.department_service.create(
                 serialized_department.validated_data)
-            serializer = OutSerializer(
-                data=new_department,
-                many=False
-            )
-            if not serializer.is_valid():
-                return JsonResponse(
-                    {"error": str(serializer.errors)},
-                    status=status.HTTP_400_BAD_REQUEST,
-                    safe=False
-                )
-            return JsonResponse(
-                serializer.validated_data,
-                status=status.HTTP_200_OK
-            )
-        except ValueError as e:
+            return EncodedJsonResponse(
+                DEPARTMENT_ENCODER.dumps(new_department))
+        except (ParseError, UnsupportedMediaType, ValueError) as e:
             logging.critical(f"A critical error occurred: {str(e)}",
                              exc_info=True)
             return JsonResponse(
@@ -96,21 +92,52 @@ class DepartmentsAPIView(APIView):
             department = self.department_service.update(
                 serialized_department.validated_data, department_id
             )
-            serializer_out = OutSerializer(
-                data=department,
+            return EncodedJsonResponse(DEPARTMENT_ENCODER.dumps(department))
+
+        except ObjectDoesNotExist as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except (ParseError, UnsupportedMediaType, ValueError) as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def patch(self, request: request.Request):
+        """
+        This method updates only the fields present in the body, with a
+        single write that also sets the last update date.
+        """
+        logger.info("View - patch method :::")
+        try:
+            serialized_department = InDepartmentSerializer(
+                data=request.data,
                 many=False,
+                partial=True
             )
-            if not serializer_out.is_valid():
+            if not serialized_department.is_valid():
                 return JsonResponse(
-                    {"error": str(serializer_out.errors)},
-                    status=status.HTTP_400_BAD_REQUEST,
-                    safe=False
+                    {"error": str(serialized_department.errors)},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
-            return JsonResponse(
-                serializer_out.validated_data,
-                status=status.HTTP_200_OK
+            department = self.department_service.partial_update(
+                serialized_department.validated_data,
+                request.query_params.get("id")
             )
-
+            return EncodedJsonResponse(DEPARTMENT_ENCODER.dumps(department))
         except ObjectDoesNotExist as e:
             logging.critical(f"A critical error occurred:{str(e)}",
                              exc_info=True)
@@ -118,7 +145,7 @@ class DepartmentsAPIView(APIView):
                 {"error": str(e)},
                 status=status.HTTP_404_NOT_FOUND
             )
-        except ValueError as e:
+        except (ParseError, UnsupportedMediaType, ValueError) as e:
             logging.critical(f"A critical error occurred:{str(e)}",
                              exc_info=True)
             return JsonResponse(
@@ -133,6 +160,16 @@ class DepartmentsAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def version(self, request: request.Request):
+        # Any write to the collection changes the ETag of every listing.
+        return self.department_service.version()
+
+    def cache_tags(self, request: request.Request):
+        return collection_tags(DEPARTMENTS_TAG,
+                               request.query_params.get("id"))
+
+    @cached_response(cache_tags)
+    @conditional_get(version)
     def get(self, request: request.Request):
         """
         This method handles GET requests to retrieve department data.
@@ -146,46 +183,26 @@ class DepartmentsAPIView(APIView):
         try:
             id: str = request.query_params.get("id")
             name: str = request.query_params.get("name")
+            fields = DEPARTMENT_ENCODER.parse_fields(
+                request.query_params.get("fields"))
             if id is not None:
-                department = self.department_service.query_by_id(id)
-                serializer = OutSerializer(
-                    data=department,
-                    many=False
-                )
+                content = self.department_service.query_by_id(id, fields)
             elif name is not None:
-                department_list = self.department_service.query_by_name(name)
-                if department_list:
-                    serializer = OutSerializer(
-                        data=department_list,
-                        many=True,
-                    )
-                else:
+                content = self.department_service.query_by_name(name, fields)
+                if not content:
                     return JsonResponse(
                         {"error": "There are no records that show."},
                         status=status.HTTP_404_NOT_FOUND
                     )
             else:
-                department_list = self.department_service.query_all()
-                if department_list:
-                    serializer = OutSerializer(
-                        data=department_list,
-                        many=True
-                    )
-                else:
+                content = self.department_service.query_all(fields)
+                if not content:
                     return JsonResponse(
                         {"error": "There are no records that show."},
                         status=status.HTTP_404_NOT_FOUND
                     )
-            if not serializer.is_valid():
-                logging.critical("A critical error occurred",
-                                 serializer.errors)
-                return JsonResponse({"error": str(serializer.errors)},
-                                    status=status.HTTP_400_BAD_REQUEST)
-
-            return JsonResponse(serializer.validated_data,
-                                status=status.HTTP_201_CREATED,
-                                safe=False
-                                )
+            return EncodedJsonResponse(DEPARTMENT_ENCODER.dumps(content),
+                                       status=status.HTTP_201_CREATED)
         except ObjectDoesNotExist as e:
             logging.critical(f"A critical error occurred: {str(e)}",
                              exc_info=True)
@@ -233,3 +250,115 @@ class DepartmentsAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
 
             )
+
+
+class DepartmentsAsyncAPIView(AsyncAPIView):
+    """
+    A view class that serves the 'Department' queries, creation and
+    deletion natively under ASGI.
+    """
+
+    @inject
+    def __init__(self, department_service: DepartmentsAsyncService,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.department_service = department_service
+
+    async def post(self, request):
+        logger.info("View - async post method :::")
+        try:
+            serialized_department = InDepartmentSerializer(
+                data=json_codec.loads(request.body),
+                many=False,
+            )
+            if not serialized_department.is_valid():
+                return JsonResponse(
+                    {"error": str(serialized_department.errors)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            new_department = await self.department_service.create(
+                serialized_department.validated_data)
+            return EncodedJsonResponse(
+                DEPARTMENT_ENCODER.dumps(new_department))
+        except ValueError as e:
+            logging.critical(f"A critical error occurred: {str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred: {str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    async def get(self, request):
+        logger.info("View - async get method :::")
+        try:
+            id: str = request.GET.get("id")
+            name: str = request.GET.get("name")
+            fields = DEPARTMENT_ENCODER.parse_fields(
+                request.GET.get("fields"))
+            if id is not None:
+                content = await self.department_service.query_by_id(
+                    id, fields)
+            else:
+                if name is not None:
+                    content = await self.department_service.query_by_name(
+                        name, fields)
+                else:
+                    content = await self.department_service.query_all(
+                        fields)
+                if not content:
+                    return JsonResponse(
+                        {"error": "There are no records that show."},
+                        status=status.HTTP_404_NOT_FOUND
+                    )
+            return EncodedJsonResponse(DEPARTMENT_ENCODER.dumps(content))
+        except ObjectDoesNotExist as e:
+            logging.critical(f"A critical error occurred: {str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except ValueError as e:
+            logging.critical(f"A critical error occurred: {str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred: {str(e)}",
+                             exc_info=True)
+            return JsonResponse({"error": str(e)},
+                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    async def delete(self, request):
+        logger.info("View - async delete method :::")
+        try:
+            await self.department_service.delete(request.GET.get("id"))
+            return JsonResponse(
+                {
+                    "Message": msg.SUCCESSFUL_DELETION_MESSAGE,
+                },
+                status=status.HTTP_200_OK
+            )
+        except ObjectDoesNotExist as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
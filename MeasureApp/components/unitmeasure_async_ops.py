@@ -0,0 +1,101 @@
+import abc
+from typing import List, Optional
+
+from bson import ObjectId
+from django.utils import timezone
+
+from MeasureApp.models import UnitMeasure
+from ProductManagementService.logger import logger
+from ProductManagementService.mongo import get_async_collection, \
+    lookups_to_query, to_model, to_projection
+
+
+class UnitMeasureAsyncOps(abc.ABC):
+    """
+    The interface encompasses the operations of the UnitMeasure model that
+    are used by the async views, every method is a coroutine.
+    """
+
+    @abc.abstractmethod
+    async def query_all(self, fields: Optional[tuple] = None
+                        ) -> List[UnitMeasure]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def query_by_id(self, unit_measure_id: ObjectId,
+                          fields: Optional[tuple] = None) -> UnitMeasure:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def query_by_name(self, name: str,
+                            fields: Optional[tuple] = None
+                            ) -> List[UnitMeasure]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def create(self, data: dict) -> UnitMeasure:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, unit_measure_id: ObjectId) -> bool:
+        raise NotImplementedError
+
+
+class UnitMeasureOpsMotor(UnitMeasureAsyncOps):
+    """
+    The concrete class implements the operations of the UnitMeasureAsyncOps
+    interface with motor.
+    """
+
+    def collection(self):
+        return get_async_collection(UnitMeasure)
+
+    async def query_all(self, fields: Optional[tuple] = None
+                        ) -> List[UnitMeasure]:
+        logger.info(" Adapter Layer - async query_all method ::: ")
+        cursor = self.collection().find({}, to_projection(fields))
+        return [to_model(UnitMeasure, document, fields)
+                async for document in cursor]
+
+    async def query_by_id(self, unit_measure_id: ObjectId,
+                          fields: Optional[tuple] = None) -> UnitMeasure:
+        logger.info("Adapter Layer - async query_by_id method ::: ")
+        document = await self.collection().find_one(
+            {"_id": unit_measure_id}, to_projection(fields))
+        if document is None:
+            raise UnitMeasure.DoesNotExist(
+                "UnitMeasure matching query does not exist.")
+        return to_model(UnitMeasure, document, fields)
+
+    async def query_by_name(self, name: str,
+                            fields: Optional[tuple] = None
+                            ) -> List[UnitMeasure]:
+        logger.info("Adapter Layer - async query_by_name method ::: ")
+        cursor = self.collection().find(
+            lookups_to_query({"name__icontains": name}),
+            to_projection(fields))
+        return [to_model(UnitMeasure, document, fields)
+                async for document in cursor]
+
+    async def create(self, data: dict) -> UnitMeasure:
+        logger.info("Adapter Layer - async create method ::: ")
+        now = timezone.now()
+        document = {
+            "name": data.get("name"),
+            "abbreviation": data.get("abbreviation"),
+            "description": data.get("description"),
+            "date": now,
+            "last_update_date": now,
+        }
+        result = await self.collection().insert_one(document)
+        document["_id"] = result.inserted_id
+        return to_model(UnitMeasure, document)
+
+    async def delete(self, unit_measure_id: ObjectId) -> bool:
+        logger.info("Adapter Layer - async delete method ::: ")
+        result = await self.collection().delete_one(
+            {"_id": unit_measure_id})
+        if result.deleted_count == 0:
+            raise UnitMeasure.DoesNotExist(
+                "UnitMeasure matching query does not exist.")
+        return True
@@ -1,9 +1,15 @@
 import abc
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from django.db.models import QuerySet
+from django.utils import timezone
+from pymongo.collection import Collection
 
 from MeasureApp.models import UnitMeasure
 from ProductManagementService.logger import logger
+from ProductManagementService.mongo import get_collection, get_version, \
+    lookups_to_query, to_document, to_model, to_projection
 
 
 class UnitMeasureOps(abc.ABC):
@@ -12,14 +18,16 @@ class UnitMeasureOps(abc.ABC):
     """
 
     @abc.abstractmethod
-    def query_all(self) -> QuerySet[UnitMeasure]:
+    def query_all(self,
+                  fields: Optional[tuple] = None) -> QuerySet[UnitMeasure]:
         """
         This method queries all unit measures.
         """
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_id(self, unit_measure_id: str) -> UnitMeasure:
+    def query_by_id(self, unit_measure_id: str,
+                    fields: Optional[tuple] = None) -> UnitMeasure:
         """
         This method queries a unit measure by Id.
         """
@@ -27,7 +35,9 @@ class UnitMeasureOps(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_name(self, name: str) -> QuerySet[UnitMeasure]:
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None
+                      ) -> QuerySet[UnitMeasure]:
         """
         This method queries unit measures by name.
         """
@@ -54,6 +64,14 @@ class UnitMeasureOps(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def version(self) -> Tuple[int, Optional[datetime]]:
+        """
+        This method returns the number of records and their most recent
+        last update date.
+        """
+        raise NotImplementedError
+
 
 class UnitMeasureOpsMongo(UnitMeasureOps):
     """
@@ -61,14 +79,27 @@ class UnitMeasureOpsMongo(UnitMeasureOps):
     interface by connecting to a Mongo database.
     """
 
-    def query_all(self) -> QuerySet[UnitMeasure]:
-        return UnitMeasure.objects.all()
+    def query_all(self,
+                  fields: Optional[tuple] = None) -> QuerySet[UnitMeasure]:
+        return self.select(fields).all()
+
+    def query_by_id(self, unit_measure_id: str,
+                    fields: Optional[tuple] = None) -> UnitMeasure:
+        return self.select(fields).get(_id=unit_measure_id)
 
-    def query_by_id(self, unit_measure_id: str) -> UnitMeasure:
-        return UnitMeasure.objects.get(_id=unit_measure_id)
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None
+                      ) -> QuerySet[UnitMeasure]:
+        return self.select(fields).filter(name__icontains=name)
 
-    def query_by_name(self, name: str) -> QuerySet[UnitMeasure]:
-        return UnitMeasure.objects.filter(name__icontains=name)
+    def select(self, fields: Optional[tuple]) -> QuerySet[UnitMeasure]:
+        """
+        This method restricts the loaded columns, djongo translates them
+        into the projection of the Mongo query.
+        """
+        if fields is None:
+            return UnitMeasure.objects.all()
+        return UnitMeasure.objects.only(*fields)
 
     def create(self, data: dict) -> UnitMeasure:
         logger.info("Adapter layer - create method :::")
@@ -90,3 +121,78 @@ class UnitMeasureOpsMongo(UnitMeasureOps):
         logger.info("Adapter layer - update method :::")
         unit_measure.save()
         return unit_measure
+
+    def version(self) -> Tuple[int, Optional[datetime]]:
+        logger.info("Adapter Layer - version method ::: ")
+        return get_version(UnitMeasure, {}, "last_update_date")
+
+
+class UnitMeasureOpsPyMongo(UnitMeasureOps):
+    """
+    The concrete class implements the operations of the UnitMeasureOps
+    interface with direct pymongo calls over the shared client, skipping the
+    SQL translation of djongo.
+    """
+
+    def collection(self) -> Collection:
+        return get_collection(UnitMeasure)
+
+    def query_all(self,
+                  fields: Optional[tuple] = None) -> List[UnitMeasure]:
+        documents = self.collection().find({}, to_projection(fields))
+        return [to_model(UnitMeasure, document, fields)
+                for document in documents]
+
+    def query_by_id(self, unit_measure_id: str,
+                    fields: Optional[tuple] = None) -> UnitMeasure:
+        document = self.collection().find_one({"_id": unit_measure_id},
+                                              to_projection(fields))
+        if document is None:
+            raise UnitMeasure.DoesNotExist(
+                "UnitMeasure matching query does not exist.")
+        return to_model(UnitMeasure, document, fields)
+
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> List[UnitMeasure]:
+        documents = self.collection().find(
+            lookups_to_query({"name__icontains": name}),
+            to_projection(fields))
+        return [to_model(UnitMeasure, document, fields)
+                for document in documents]
+
+    def create(self, data: dict) -> UnitMeasure:
+        logger.info("Adapter layer - create method :::")
+        now = timezone.now()
+        document = {
+            "name": data.get("name"),
+            "abbreviation": data.get("abbreviation"),
+            "description": data.get("description"),
+            "date": now,
+            "last_update_date": now,
+        }
+        document["_id"] = self.collection().insert_one(document).inserted_id
+        return to_model(UnitMeasure, document)
+
+    def delete(self, unit_measure_id: str) -> bool:
+        logger.info("Adapter layer - delete method :::")
+        result = self.collection().delete_one({"_id": unit_measure_id})
+        if result.deleted_count == 0:
+            raise UnitMeasure.DoesNotExist(
+                "UnitMeasure matching query does not exist.")
+        return True
+
+    def update(self, unit_measure: UnitMeasure) -> UnitMeasure:
+        logger.info("Adapter layer - update method :::")
+        unit_measure.last_update_date = timezone.now()
+        document = to_document(unit_measure)
+        oid = document.pop("_id")
+        result = self.collection().update_one({"_id": oid},
+                                              {"$set": document})
+        if result.matched_count == 0:
+            raise UnitMeasure.DoesNotExist(
+                "UnitMeasure matching query does not exist.")
+        return unit_measure
+
+    def version(self) -> Tuple[int, Optional[datetime]]:
+        logger.info("Adapter Layer - version method ::: ")
+        return get_version(UnitMeasure, {}, "last_update_date")
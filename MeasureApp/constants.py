@@ -15,3 +15,5 @@ class AppConstants:
         DELETE_UNITMEASURE_NAME: str = "delete_unit_measure"
         UPDATE_UNITMEASURE: str = "unitmeasure/update/"
         UPDATE_UNITMEASURE_NAME: str = "update_unit_measure"
+        ASYNC_UNITMEASURE: str = "async/unitmeasure/"
+        ASYNC_UNITMEASURE_NAME: str = "async_unitmeasure"
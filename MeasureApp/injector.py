@@ -1,8 +1,14 @@
 import injector
 from injector import Binder, singleton
 
-from .components.unitmeasure_ops import UnitMeasureOps, UnitMeasureOpsMongo
+from ProductManagementService.env import AppEnv
+from .components.unitmeasure_async_ops import UnitMeasureAsyncOps, \
+    UnitMeasureOpsMotor
+from .components.unitmeasure_ops import UnitMeasureOps, \
+    UnitMeasureOpsMongo, UnitMeasureOpsPyMongo
 from .services.unitmeasure import UnitMeasureService, UnitMeasureMongoService
+from .services.unitmeasure_async import UnitMeasureAsyncService, \
+    UnitMeasureMotorService
 
 
 class UnitMeasureInjector(injector.Module):
@@ -15,6 +21,14 @@ class UnitMeasureInjector(injector.Module):
             This method defines the relationship between an interface and
             its implementation class.
         """
-        binder.bind(UnitMeasureOps, to=UnitMeasureOpsMongo, scope=singleton, )
+        binder.bind(UnitMeasureOps,
+                    to=UnitMeasureOpsPyMongo
+                    if AppEnv.MONGO_OPS_DRIVER == "pymongo"
+                    else UnitMeasureOpsMongo,
+                    scope=singleton, )
         binder.bind(UnitMeasureService, to=UnitMeasureMongoService,
                     scope=singleton, )
+        binder.bind(UnitMeasureAsyncOps, to=UnitMeasureOpsMotor,
+                    scope=singleton, )
+        binder.bind(UnitMeasureAsyncService, to=UnitMeasureMotorService,
+                    scope=singleton, )
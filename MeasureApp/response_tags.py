@@ -0,0 +1,13 @@
+from django.dispatch import receiver
+
+from MeasureApp.signals import unit_measure_changed
+from ProductManagementService.response_cache import invalidate, \
+    record_tags
+
+# Tag of the cached unit measure responses.
+UNIT_MEASURES_TAG: str = "unit_measures"
+
+
+@receiver(unit_measure_changed)
+def invalidate_unit_measure(sender, id: str, **kwargs):
+    invalidate(record_tags(UNIT_MEASURES_TAG, id))
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from ProductManagementService.encoders import ModelEncoder
 from .models import UnitMeasure
 
 
@@ -53,3 +54,8 @@ class OutInitMeasureWithIdSerializer(OutUnitMeasureSerializer):
         model = UnitMeasure
         fields = ("_id", "name", "abbreviation", "description", "date",
                   "last_update_date")
+
+
+UNIT_MEASURE_ENCODER = ModelEncoder(
+    fields=OutInitMeasureWithIdSerializer.Meta.fields,
+)
@@ -1,12 +1,28 @@
 import abc
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from bson import ObjectId
+from django.dispatch import receiver
 from injector import inject
 
 from MeasureApp.components.unitmeasure_ops import UnitMeasureOps
+from MeasureApp.serializer import UNIT_MEASURE_ENCODER
+from MeasureApp.signals import unit_measure_changed
+from ProductManagementService import metrics
+from ProductManagementService.concurrency import SingleFlight, coalesced
 from ProductManagementService.logger import logger
 
+# The listings of unit measures that are read at the same time share the
+# query.
+UNIT_MEASURE_QUERIES = SingleFlight()
+metrics.register("unit_measure_queries", UNIT_MEASURE_QUERIES.stats)
+
+
+@receiver(unit_measure_changed)
+def forget_unit_measure_queries(sender, **kwargs):
+    UNIT_MEASURE_QUERIES.forget()
+
 
 class UnitMeasureService(abc.ABC):
     """
@@ -18,7 +34,7 @@ class UnitMeasureService(abc.ABC):
         self.unit_measure_ops = unit_measure_ops
 
     @abc.abstractmethod
-    def query_all(self) -> dict:
+    def query_all(self, fields: Optional[tuple] = None) -> dict:
         """
         This method retrieves all unit measures from
         the UnitMeasureOpsMongo concrete class
@@ -26,7 +42,8 @@ class UnitMeasureService(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_id(self, unit_measure_id: str) -> dict:
+    def query_by_id(self, unit_measure_id: str,
+                    fields: Optional[tuple] = None) -> dict:
         """
         This method retrieves a unit measure by ID from the
         UnitMeasureOpsMongo concrete class.
@@ -34,7 +51,8 @@ class UnitMeasureService(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_name(self, name: str) -> List[dict]:
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> List[dict]:
         """
         This method retrieves unit measures by name from
         the UnitMeasureOpsMongo concrete class.
@@ -49,6 +67,14 @@ class UnitMeasureService(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def version(self) -> Tuple[int, Optional[datetime]]:
+        """
+        This method returns the number of unit measures and their most
+        recent last update date.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def delete(self, unit_measure_id: str) -> bool:
         """
@@ -68,27 +94,32 @@ class UnitMeasureService(abc.ABC):
 
 
 class UnitMeasureMongoService(UnitMeasureService):
-    def query_all(self) -> List[dict]:
+    @coalesced(UNIT_MEASURE_QUERIES)
+    def query_all(self, fields: Optional[tuple] = None) -> List[dict]:
         logger.info("Service Layer - querry_all method:::")
-        unit_measures = self.unit_measure_ops.query_all()
+        unit_measures = self.unit_measure_ops.query_all(fields)
         unit_measure_list = [
-            self.convert_to_dict(unit_measure) for unit_measure in
+            self.convert_to_dict(unit_measure, fields) for unit_measure in
             unit_measures
         ]
         return unit_measure_list
 
-    def query_by_id(self, unit_measure_id: str) -> dict:
+    def query_by_id(self, unit_measure_id: str,
+                    fields: Optional[tuple] = None) -> dict:
         logger.info("Service Layer - query_by_id method:::")
         unit_measure_oid = ObjectId(unit_measure_id)
         unit_measure = self.unit_measure_ops.query_by_id(
-            unit_measure_oid)
-        return self.convert_to_dict(unit_measure)
+            unit_measure_oid, fields)
+        return self.convert_to_dict(unit_measure, fields)
 
-    def query_by_name(self, name: str) -> List[dict]:
+    @coalesced(UNIT_MEASURE_QUERIES)
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> List[dict]:
         logger.info("Service Layer - query_by_name method:::")
-        unit_measures = list(self.unit_measure_ops.query_by_name(name))
+        unit_measures = list(self.unit_measure_ops.query_by_name(name,
+                                                                 fields))
         unit_measure_list = [
-            self.convert_to_dict(unit_measure) for unit_measure in
+            self.convert_to_dict(unit_measure, fields) for unit_measure in
             unit_measures
         ]
         return unit_measure_list
@@ -96,12 +127,20 @@ class UnitMeasureMongoService(UnitMeasureService):
     def create(self, data: dict) -> dict:
         logger.info("Service Layer - create method:::")
         new_object = self.convert_to_dict(self.unit_measure_ops.create(data))
+        unit_measure_changed.send(sender=self.__class__,
+                                  id=str(new_object["_id"]))
         return new_object
 
+    def version(self) -> Tuple[int, Optional[datetime]]:
+        logger.info("Service Layer - version method:::")
+        return self.unit_measure_ops.version()
+
     def delete(self, unit_measure_id: str) -> bool:
         logger.info("Service Layer - delete method:::")
         unit_measure_oid = ObjectId(unit_measure_id)
         self.unit_measure_ops.delete(unit_measure_oid)
+        unit_measure_changed.send(sender=self.__class__,
+                                  id=str(unit_measure_oid))
         return True
 
     def update(self, data: dict, id: str) -> dict:
@@ -118,16 +157,9 @@ class UnitMeasureMongoService(UnitMeasureService):
         if description is not None:
             unit_measure.description = data.get("description")
         unit_measure_update = self.unit_measure_ops.update(unit_measure)
+        unit_measure_changed.send(sender=self.__class__,
+                                  id=str(unit_measure_oid))
         return self.convert_to_dict(unit_measure_update)
 
-    def convert_to_dict(self, object_model):
-
-        object_dict = {
-            '_id': str(object_model._id),
-            'name': object_model.name,
-            'abbreviation': object_model.abbreviation,
-            'description': object_model.description,
-            'date': object_model.formatted_date(),
-            'last_update_date': object_model.formatted_last_update_date()
-        }
-        return object_dict
+    def convert_to_dict(self, object_model, fields: Optional[tuple] = None):
+        return UNIT_MEASURE_ENCODER.subset(fields).from_model(object_model)
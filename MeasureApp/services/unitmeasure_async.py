@@ -0,0 +1,88 @@
+import abc
+from typing import List, Optional
+
+from bson import ObjectId
+from injector import inject
+
+from MeasureApp.components.unitmeasure_async_ops import \
+    UnitMeasureAsyncOps
+from MeasureApp.serializer import UNIT_MEASURE_ENCODER
+from MeasureApp.signals import unit_measure_changed
+from ProductManagementService.logger import logger
+
+
+class UnitMeasureAsyncService(abc.ABC):
+    """
+    This interface defines the business logic used by the async views,
+    every method is a coroutine.
+    """
+
+    @abc.abstractmethod
+    async def query_all(self, fields: Optional[tuple] = None) -> List[dict]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def query_by_id(self, unit_measure_id: str,
+                          fields: Optional[tuple] = None) -> dict:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def query_by_name(self, name: str,
+                            fields: Optional[tuple] = None) -> List[dict]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def create(self, data: dict) -> dict:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, unit_measure_id: str) -> bool:
+        raise NotImplementedError
+
+
+class UnitMeasureMotorService(UnitMeasureAsyncService):
+    """
+    Concrete class implements the methods of the 'UnitMeasureAsyncService'
+    interface over the UnitMeasureAsyncOps operations.
+    """
+
+    @inject
+    def __init__(self, unit_measure_ops: UnitMeasureAsyncOps):
+        self.unit_measure_ops = unit_measure_ops
+
+    async def query_all(self, fields: Optional[tuple] = None) -> List[dict]:
+        logger.info("Service Layer - async query_all method :: ")
+        encoder = UNIT_MEASURE_ENCODER.subset(fields)
+        unit_measures = await self.unit_measure_ops.query_all(fields)
+        return [encoder.from_model(unit_measure)
+                for unit_measure in unit_measures]
+
+    async def query_by_id(self, unit_measure_id: str,
+                          fields: Optional[tuple] = None) -> dict:
+        logger.info("Service Layer - async query_by_id method :: ")
+        unit_measure = await self.unit_measure_ops.query_by_id(
+            ObjectId(unit_measure_id), fields)
+        return UNIT_MEASURE_ENCODER.subset(fields).from_model(unit_measure)
+
+    async def query_by_name(self, name: str,
+                            fields: Optional[tuple] = None) -> List[dict]:
+        logger.info("Service Layer - async query_by_name method :: ")
+        encoder = UNIT_MEASURE_ENCODER.subset(fields)
+        unit_measures = await self.unit_measure_ops.query_by_name(name, fields)
+        return [encoder.from_model(unit_measure)
+                for unit_measure in unit_measures]
+
+    async def create(self, data: dict) -> dict:
+        logger.info("Service Layer - async create method :: ")
+        unit_measure = await self.unit_measure_ops.create(data)
+        unit_measure_changed.send(sender=self.__class__,
+                                  id=str(unit_measure._id))
+        return UNIT_MEASURE_ENCODER.from_model(unit_measure)
+
+    async def delete(self, unit_measure_id: str) -> bool:
+        logger.info("Service Layer - async delete method :: ")
+        unit_measure_oid = ObjectId(unit_measure_id)
+        result = await self.unit_measure_ops.delete(unit_measure_oid)
+        unit_measure_changed.send(sender=self.__class__,
+                                  id=str(unit_measure_oid))
+        return result
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after a unit measure is created, updated or deleted, the 'id'
+# argument is the id of the unit measure as a string.
+unit_measure_changed = Signal()
@@ -1,3 +1,114 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from bson import ObjectId
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+
+from MeasureApp.components.unitmeasure_ops import UnitMeasureOpsPyMongo
+from MeasureApp.models import UnitMeasure
+from MeasureApp.services.unitmeasure import UNIT_MEASURE_QUERIES, \
+    UnitMeasureMongoService
+from MeasureApp.signals import unit_measure_changed
+from MeasureApp.views import UnitMeasureAPIView
+from ProductApp.components import reference_cache
+from ProductApp.components.reference_response import ReferenceResponse
+from ProductManagementService import response_cache
+from ProductManagementService.cache import ResponseCache
+
+
+class UnitMeasureQueriesTests(SimpleTestCase):
+
+    def test_write_forgets_the_queries_in_progress(self):
+        with mock.patch.object(UNIT_MEASURE_QUERIES, "forget") as forget:
+            unit_measure_changed.send(sender=None, id=str(ObjectId()))
+        forget.assert_called_once_with()
+
+    def test_write_invalidates_the_reference_check(self):
+        id = str(ObjectId())
+        reference_cache.UNIT_MEASURE_CACHE.set(id, ReferenceResponse(200))
+        unit_measure_changed.send(sender=None, id=id.upper())
+        self.assertEqual(reference_cache.UNIT_MEASURE_CACHE.get(id),
+                         (False, None))
+
+
+class UnitMeasureOpsPyMongoTests(SimpleTestCase):
+
+    def setUp(self):
+        self.ops = UnitMeasureOpsPyMongo()
+        self.collection = mock.Mock()
+        self.ops.collection = mock.Mock(return_value=self.collection)
+
+    def test_create_returns_the_stored_record(self):
+        _id = ObjectId()
+        self.collection.insert_one.return_value.inserted_id = _id
+        unit_measure = self.ops.create({"name": "Kilogram",
+                                        "abbreviation": "kg",
+                                        "description": "Mass"})
+        document = self.collection.insert_one.call_args.args[0]
+        self.assertEqual(unit_measure._id, _id)
+        self.assertEqual(unit_measure.abbreviation, "kg")
+        self.assertEqual(document["date"], document["last_update_date"])
+
+    def test_query_by_name_is_case_insensitive(self):
+        self.collection.find.return_value = [{"_id": 1, "name": "Kilogram"}]
+        unit_measures = self.ops.query_by_name("kilo", ("_id", "name"))
+        self.collection.find.assert_called_once_with(
+            {"name": {"$regex": "kilo", "$options": "i"}},
+            {"_id": True, "name": True})
+        self.assertEqual(unit_measures[0].name, "Kilogram")
+
+    def test_update_sets_every_field_but_the_id(self):
+        unit_measure = UnitMeasure(_id=ObjectId(), name="Gram",
+                                   abbreviation="g", description="Mass")
+        self.ops.update(unit_measure)
+        query, update = self.collection.update_one.call_args.args
+        self.assertEqual(query, {"_id": unit_measure._id})
+        self.assertNotIn("_id", update["$set"])
+        self.assertEqual(update["$set"]["abbreviation"], "g")
+        self.assertIsNotNone(update["$set"]["last_update_date"])
+
+    def test_missing_records_raise_does_not_exist(self):
+        self.collection.find_one.return_value = None
+        self.collection.delete_one.return_value.deleted_count = 0
+        self.collection.update_one.return_value.matched_count = 0
+        with self.assertRaises(UnitMeasure.DoesNotExist):
+            self.ops.query_by_id(ObjectId())
+        with self.assertRaises(UnitMeasure.DoesNotExist):
+            self.ops.delete(ObjectId())
+        with self.assertRaises(UnitMeasure.DoesNotExist):
+            self.ops.update(UnitMeasure(_id=ObjectId()))
+
+
+class UnitMeasureConditionalGetTests(SimpleTestCase):
+
+    def setUp(self):
+        # The cached responses would answer before the ETag is checked.
+        patcher = mock.patch.object(
+            response_cache, "RESPONSE_CACHE",
+            ResponseCache(max_bytes=0, ttl=60, max_entry_bytes=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.unit_measure_ops = mock.Mock()
+        self.unit_measure_ops.version.return_value = (1, None)
+        self.unit_measure_ops.query_all.return_value = [
+            UnitMeasure(_id=ObjectId(), name="Kilogram", abbreviation="kg")]
+        self.view = UnitMeasureAPIView(
+            UnitMeasureMongoService(self.unit_measure_ops))
+
+    def get(self, **headers):
+        request = APIRequestFactory().get("/unit_measures/", **headers)
+        self.view.setup(request)
+        return self.view.dispatch(request)
+
+    def test_unchanged_unit_measures_are_not_read(self):
+        etag = self.get()["ETag"]
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.unit_measure_ops.query_all.assert_called_once()
+
+    def test_other_listings_have_their_own_etag(self):
+        etag = self.get()["ETag"]
+        request = APIRequestFactory().get("/unit_measures/?fields=name",
+                                          HTTP_IF_NONE_MATCH=etag)
+        self.view.setup(request)
+        self.assertEqual(self.view.dispatch(request).status_code, 200)
@@ -1,7 +1,7 @@
 from django.urls import path
 
 from .constants import AppConstants
-from .views import UnitMeasureAPIView
+from .views import UnitMeasureAPIView, UnitMeasureAsyncAPIView
 
 urlpatterns = [
     path(
@@ -28,6 +28,10 @@ urlpatterns = [
         AppConstants.Api.UPDATE_UNITMEASURE,
         UnitMeasureAPIView.as_view(),
         name=AppConstants.Api.UPDATE_UNITMEASURE_NAME
-    )
-
+    ),
+    path(
+        AppConstants.Api.ASYNC_UNITMEASURE,
+        UnitMeasureAsyncAPIView.as_view(),
+        name=AppConstants.Api.ASYNC_UNITMEASURE_NAME
+    ),
 ]
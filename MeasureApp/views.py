@@ -1,20 +1,28 @@
 # Create your views here.
 # Create your views here.
-import json
 import logging
 
 import requests
 from django.core.exceptions import ObjectDoesNotExist
-from django.http import JsonResponse
 from injector import inject
 from rest_framework import request, status
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
 from rest_framework.views import APIView
 
 from MeasureApp.serializer import (InUnitMeasureSerializer,
-                                   OutInitMeasureWithIdSerializer)
+                                   UNIT_MEASURE_ENCODER)
+from MeasureApp.response_tags import UNIT_MEASURES_TAG
 from MeasureApp.services.unitmeasure import UnitMeasureService
+from MeasureApp.services.unitmeasure_async import UnitMeasureAsyncService
+from ProductManagementService import json_codec
+from ProductManagementService.async_views import AsyncAPIView
+from ProductManagementService.conditional import conditional_get
+from ProductManagementService.encoders import EncodedJsonResponse, \
+    JsonResponse
 from ProductManagementService.logger import logger
 from ProductManagementService.messages import ApiMessages as msg
+from ProductManagementService.response_cache import cached_response, \
+    collection_tags
 
 
 class UnitMeasureAPIView(APIView):
@@ -29,54 +37,47 @@ class UnitMeasureAPIView(APIView):
         super().__init__()
         self.unit_measure_service = unit_measure_service
 
+    def version(self, request: request.Request):
+        # Any write to the collection changes the ETag of every listing.
+        return self.unit_measure_service.version()
+
+    def cache_tags(self, request: request.Request):
+        return collection_tags(UNIT_MEASURES_TAG,
+                               request.query_params.get("id"))
+
+    @cached_response(cache_tags)
+    @conditional_get(version)
     def get(self, request: request.Request):
         logger.info("View - get method :::")
         name: str = request.query_params.get("name")
         id: str = request.query_params.get("id")
         try:
+            fields = UNIT_MEASURE_ENCODER.parse_fields(
+                request.query_params.get("fields"))
             if id is not None:
-                response_message = self.unit_measure_service.query_by_id(id)
+                response_message = self.unit_measure_service.query_by_id(
+                    id, fields)
                 if not response_message:
                     return JsonResponse({
                         "error": "No unit measures found with the given id."},
                         status=status.HTTP_404_NOT_FOUND)
-                serializer_class = OutInitMeasureWithIdSerializer(
-                    data=response_message,
-                    many=False
-                )
             elif name is not None:
                 response_message = self.unit_measure_service.query_by_name(
-                    name)
+                    name, fields)
                 if not response_message:
                     return JsonResponse({
                         "error":
                             "No unit measures found with the given name."},
                         status=status.HTTP_404_NOT_FOUND)
-                serializer_class = OutInitMeasureWithIdSerializer(
-                    data=response_message,
-                    many=True
-
-                )
             else:
-                response_message = self.unit_measure_service.query_all()
+                response_message = self.unit_measure_service.query_all(
+                    fields)
                 if not response_message:
                     return JsonResponse({
                         "error": "No records founds"},
                         status=status.HTTP_404_NOT_FOUND)
-                serializer_class = OutInitMeasureWithIdSerializer(
-                    data=response_message,
-                    many=True
-
-                )
-            if not serializer_class.is_valid():
-                return JsonResponse({"error": str(
-                    serializer_class.errors)},
-                    status=status.HTTP_400_BAD_REQUEST)
-            return JsonResponse(
-                serializer_class.data,
-                status=status.HTTP_200_OK,
-                safe=False
-            )
+            return EncodedJsonResponse(
+                UNIT_MEASURE_ENCODER.dumps(response_message))
         except ObjectDoesNotExist as e:
             logging.critical(f"A critical error occurred:  {str(e)}",
                              exc_info=True)
@@ -95,9 +96,8 @@ class UnitMeasureAPIView(APIView):
     def post(self, request: request.Request):
         logger.info("View: post method::: ")
         try:
-            data = json.loads(request.body)
             serialized_unitmeasue = InUnitMeasureSerializer(
-                data=data,
+                data=request.data,
                 many=False
             )
             if not serialized_unitmeasue.is_valid():
@@ -110,20 +110,9 @@ class UnitMeasureAPIView(APIView):
                 return JsonResponse({
                     "error": "INTERNAL SERVICE ERROR"},
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            serializer_class = OutInitMeasureWithIdSerializer(
-                data=new_object,
-                many=False
-            )
-            if not serializer_class.is_valid():
-                self.unit_measure_service.delete(str(new_object['_id']))
-                return JsonResponse({"error": str(
-                    serializer_class.errors)},
-                    status=status.HTTP_400_BAD_REQUEST)
-
-            return JsonResponse(serializer_class.data,
-                                status=status.HTTP_201_CREATED
-                                )
-        except ValueError as e:
+            return EncodedJsonResponse(UNIT_MEASURE_ENCODER.dumps(new_object),
+                                       status=status.HTTP_201_CREATED)
+        except (ParseError, UnsupportedMediaType, ValueError) as e:
             logging.error(f"Validation error:  {str(e)}")
             return JsonResponse({"error": str(e)},
                                 status=status.HTTP_400_BAD_REQUEST)
@@ -168,11 +157,9 @@ class UnitMeasureAPIView(APIView):
             if serialized_unit_measure.is_valid():
                 unit_measure = self.unit_measure_service.update(
                     serialized_unit_measure.validated_data, unit_measure_id)
-                return JsonResponse(
-                    unit_measure,
-                    status=status.HTTP_201_CREATED,
-                    safe=False
-
+                return EncodedJsonResponse(
+                    UNIT_MEASURE_ENCODER.dumps(unit_measure),
+                    status=status.HTTP_201_CREATED
                 )
             else:
                 self.unit_measure_service.delete(unit_measure_id)
@@ -186,9 +173,89 @@ class UnitMeasureAPIView(APIView):
                              exc_info=True)
             return JsonResponse({"error": str(e)},
                                 status=status.HTTP_404_NOT_FOUND)
+        except (ParseError, UnsupportedMediaType, ValueError) as e:
+            logging.critical(f"A critical error occurred: {str(e)}",
+                             exc_info=True)
+            return JsonResponse({"error": str(e)},
+                                status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logging.critical(f"A critical error occurred: {str(e)}",
+                             exc_info=True)
+            return JsonResponse({"error": str(e)},
+                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class UnitMeasureAsyncAPIView(AsyncAPIView):
+    """
+        A view class that serves the 'UnitMeasure' queries, creation and
+        deletion natively under ASGI.
+    """
+
+    @inject
+    def __init__(self, unit_measure_service: UnitMeasureAsyncService,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.unit_measure_service = unit_measure_service
+
+    async def get(self, request):
+        logger.info("View - async get method :::")
+        name: str = request.GET.get("name")
+        id: str = request.GET.get("id")
+        try:
+            fields = UNIT_MEASURE_ENCODER.parse_fields(
+                request.GET.get("fields"))
+            if id is not None:
+                response_message = await self.unit_measure_service \
+                    .query_by_id(id, fields)
+            elif name is not None:
+                response_message = await self.unit_measure_service \
+                    .query_by_name(name, fields)
+                if not response_message:
+                    return JsonResponse({
+                        "error":
+                            "No unit measures found with the given name."},
+                        status=status.HTTP_404_NOT_FOUND)
+            else:
+                response_message = await self.unit_measure_service \
+                    .query_all(fields)
+                if not response_message:
+                    return JsonResponse({
+                        "error": "No records founds"},
+                        status=status.HTTP_404_NOT_FOUND)
+            return EncodedJsonResponse(
+                UNIT_MEASURE_ENCODER.dumps(response_message))
+        except ObjectDoesNotExist as e:
+            logging.critical(f"A critical error occurred:  {str(e)}",
+                             exc_info=True)
+            return JsonResponse({"error": str(e)},
+                                status=status.HTTP_404_NOT_FOUND)
         except ValueError as e:
+            logging.error(f"Validation error:  {str(e)}")
+            return JsonResponse({"error": str(e)},
+                                status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
             logging.critical(f"A critical error occurred: {str(e)}",
                              exc_info=True)
+            return JsonResponse({"error": str(e)},
+                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    async def post(self, request):
+        logger.info("View: async post method::: ")
+        try:
+            serialized_unitmeasure = InUnitMeasureSerializer(
+                data=json_codec.loads(request.body),
+                many=False
+            )
+            if not serialized_unitmeasure.is_valid():
+                return JsonResponse({"error": str(
+                    serialized_unitmeasure.errors)},
+                    status=status.HTTP_400_BAD_REQUEST)
+            new_object = await self.unit_measure_service.create(
+                serialized_unitmeasure.validated_data)
+            return EncodedJsonResponse(UNIT_MEASURE_ENCODER.dumps(new_object),
+                                       status=status.HTTP_201_CREATED)
+        except ValueError as e:
+            logging.error(f"Validation error:  {str(e)}")
             return JsonResponse({"error": str(e)},
                                 status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
@@ -196,3 +263,22 @@ class UnitMeasureAPIView(APIView):
                              exc_info=True)
             return JsonResponse({"error": str(e)},
                                 status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    async def delete(self, request):
+        logger.info("View - async delete method ::: ")
+        try:
+            await self.unit_measure_service.delete(request.GET.get("id"))
+            return JsonResponse(
+                {"message": msg.SUCCESSFUL_DELETION_MESSAGE},
+                status=status.HTTP_200_OK
+            )
+        except ObjectDoesNotExist as e:
+            logging.critical(f"A critical error occurred: {str(e)}",
+                             exc_info=True)
+            return JsonResponse({"error": str(e)},
+                                status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse({"error": str(e)},
+                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,106 @@
+import abc
+
+from asgiref.sync import sync_to_async
+from bson.errors import InvalidId
+from django.core.exceptions import ObjectDoesNotExist
+from injector import inject
+
+from DepartmentApp.services.departments_async import \
+    DepartmentsAsyncService
+from MeasureApp.services.unitmeasure_async import UnitMeasureAsyncService
+from ProductManagementService.logger import logger
+from .department_api_request import DepartmentRequest
+from .reference_response import ReferenceResponse
+from .unitmeasure_api_request import UnitMeasureRequest
+
+
+class AsyncDepartmentRequest(abc.ABC):
+    """
+    The interface checks a department from the async views.
+    """
+
+    @abc.abstractmethod
+    async def query_by_id(self, id: str) -> ReferenceResponse:
+        raise NotImplementedError
+
+
+class AsyncUnitMeasureRequest(abc.ABC):
+    """
+    The interface checks a unit measure from the async views.
+    """
+
+    @abc.abstractmethod
+    async def query_by_id(self, id: str) -> ReferenceResponse:
+        raise NotImplementedError
+
+
+class DepartmentAsyncServiceRequest(AsyncDepartmentRequest):
+    """
+    The concrete class queries the async DepartmentApp service of the same
+    process.
+    """
+
+    @inject
+    def __init__(self, department_service: DepartmentsAsyncService):
+        self.department_service = department_service
+
+    async def query_by_id(self, id: str) -> ReferenceResponse:
+        logger.info("Adapter Layer - async query_by_id method ::: ")
+        try:
+            department = await self.department_service.query_by_id(
+                id, ("_id",))
+        except ObjectDoesNotExist as e:
+            return ReferenceResponse.from_content(404, {"error": str(e)})
+        except (InvalidId, TypeError) as e:
+            return ReferenceResponse.from_content(400, {"error": str(e)})
+        return ReferenceResponse.from_content(200, department)
+
+
+class UnitMeasureAsyncServiceRequest(AsyncUnitMeasureRequest):
+    """
+    The concrete class queries the async MeasureApp service of the same
+    process.
+    """
+
+    @inject
+    def __init__(self, unit_measure_service: UnitMeasureAsyncService):
+        self.unit_measure_service = unit_measure_service
+
+    async def query_by_id(self, id: str) -> ReferenceResponse:
+        logger.info("Adapter Layer - async query_by_id method ::: ")
+        try:
+            unit_measure = await self.unit_measure_service.query_by_id(
+                id, ("_id",))
+        except ObjectDoesNotExist as e:
+            return ReferenceResponse.from_content(404, {"error": str(e)})
+        except (InvalidId, TypeError) as e:
+            return ReferenceResponse.from_content(400, {"error": str(e)})
+        return ReferenceResponse.from_content(200, unit_measure)
+
+
+class ThreadedDepartmentRequest(AsyncDepartmentRequest):
+    """
+    The concrete class runs a synchronous department adapter, e.g. the api
+    rest one, in a worker thread so the event loop is not blocked.
+    """
+
+    def __init__(self, department_request: DepartmentRequest):
+        self.query = sync_to_async(department_request.query_by_id,
+                                   thread_sensitive=False)
+
+    async def query_by_id(self, id: str) -> ReferenceResponse:
+        return await self.query(id)
+
+
+class ThreadedUnitMeasureRequest(AsyncUnitMeasureRequest):
+    """
+    The concrete class runs a synchronous unit measure adapter, e.g. the
+    api rest one, in a worker thread so the event loop is not blocked.
+    """
+
+    def __init__(self, unit_measure_request: UnitMeasureRequest):
+        self.query = sync_to_async(unit_measure_request.query_by_id,
+                                   thread_sensitive=False)
+
+    async def query_by_id(self, id: str) -> ReferenceResponse:
+        return await self.query(id)
@@ -0,0 +1,110 @@
+import abc
+from typing import List, Optional, Tuple
+
+from bson import ObjectId
+from django.utils import timezone
+
+from ProductApp.models import ProductTombstone, product
+from ProductManagementService.logger import logger
+from ProductManagementService.mongo import get_async_collection, \
+    lookups_to_query, to_model, to_projection
+from .product_ops import ProductOps, ProductOpsMongo, page_query
+
+
+class ProductAsyncOps(abc.ABC):
+    """
+    The interface encompasses the operations of the product model that are
+    used by the async views, every method is a coroutine.
+    """
+
+    @abc.abstractmethod
+    async def create(self, data: dict) -> product:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def query_by_id(self, id: ObjectId,
+                          fields: Optional[tuple] = None) -> product:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def query_by_filters(self, filters: dict,
+                               fields: Optional[tuple] = None
+                               ) -> List[product]:
+        """
+        This method queries the records that match the filters, an empty
+        dictionary returns every record.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def query_page(self, filters: dict, sort_key: str,
+                         after: Optional[Tuple], limit: int,
+                         fields: Optional[tuple] = None) -> List[product]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, id: ObjectId) -> product:
+        """
+        :return: The deleted record with only its references.
+        """
+        raise NotImplementedError
+
+
+class ProductOpsMotor(ProductAsyncOps):
+    """
+    The concrete class implements the operations of the ProductAsyncOps
+    interface with motor, the event loop is not blocked while Mongo
+    answers. The records are returned as model instances, as the pymongo
+    implementation does.
+    """
+
+    def collection(self):
+        return get_async_collection(product)
+
+    async def create(self, data: dict) -> product:
+        logger.info("Adapter Layer - async create method ::: ")
+        document = ProductOpsMongo.new_document(data, timezone.now())
+        result = await self.collection().insert_one(document)
+        document["_id"] = result.inserted_id
+        return to_model(product, document)
+
+    async def query_by_id(self, id: ObjectId,
+                          fields: Optional[tuple] = None) -> product:
+        logger.info("Adapter Layer - async query_by_id method:::")
+        document = await self.collection().find_one({"_id": id},
+                                                    to_projection(fields))
+        if document is None:
+            raise product.DoesNotExist(
+                "product matching query does not exist.")
+        return to_model(product, document, fields)
+
+    async def query_by_filters(self, filters: dict,
+                               fields: Optional[tuple] = None
+                               ) -> List[product]:
+        logger.info("Adapter Layer - async query_by_filters method:::")
+        cursor = self.collection().find(lookups_to_query(filters),
+                                        to_projection(fields))
+        return [to_model(product, document, fields)
+                async for document in cursor]
+
+    async def query_page(self, filters: dict, sort_key: str,
+                         after: Optional[Tuple], limit: int,
+                         fields: Optional[tuple] = None) -> List[product]:
+        logger.info("Adapter Layer - async query_page method:::")
+        query, sort = page_query(filters, sort_key, after)
+        cursor = self.collection().find(
+            query, to_projection(fields)).sort(sort).limit(limit)
+        return [to_model(product, document, fields)
+                async for document in cursor]
+
+    async def delete(self, id: ObjectId) -> product:
+        logger.info("Adapter Layer - async delete method:::")
+        fields = ("_id", *ProductOps.REFERENCE_FIELDS)
+        document = await self.collection().find_one_and_delete(
+            {"_id": id}, projection=to_projection(fields))
+        if document is None:
+            raise product.DoesNotExist(
+                "product matching query does not exist.")
+        await get_async_collection(ProductTombstone).insert_one(
+            {"product_id": str(id), "deleted_at": timezone.now()})
+        return to_model(product, document, fields)
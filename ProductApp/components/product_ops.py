@@ -1,66 +1,263 @@
 import abc
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from django.db.models import QuerySet
+from bson import ObjectId
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, OperationFailure
 
-from ProductApp.models import product
+from ProductApp.exceptions import MissingIndexError
+from ProductApp.models import ProductTombstone, product
 from ProductManagementService.logger import logger
+from ProductManagementService.mongo import get_collection, get_version, \
+    lookups_to_query, set_fields, set_fields_with_previous, to_document, \
+    to_model, to_projection
+
+# The fields returned by a stock adjustment.
+STOCK_FIELDS: tuple = ("_id", "quantity", "department_id", "unit_measure_id")
+
+# The code of the error Mongo returns for a $text query without a text
+# index.
+INDEX_NOT_FOUND: int = 27
+
+
+def page_query(filters: dict, sort_key: str,
+               after: Optional[Tuple]) -> Tuple[dict, list]:
+    """
+    This function builds the Mongo query and sort of a keyset page.
+    :param filters: Lookups of a ProductFilter.
+    :param sort_key: Field to sort by, with a '-' prefix when descending.
+    :param after: Value of the sort field and _id of the last record of the
+    previous page, or None for the first page.
+    :return: Tuple with the query and the sort specification.
+    """
+    field = sort_key.lstrip("-")
+    descending = sort_key.startswith("-")
+    query = lookups_to_query(filters)
+    if after is not None:
+        value, last_id = after
+        operator = "$lt" if descending else "$gt"
+        if field == "_id":
+            position = {"_id": {operator: last_id}}
+        else:
+            position = {"$or": [
+                {field: {operator: value}},
+                {field: value, "_id": {operator: last_id}},
+            ]}
+        query = {"$and": [query, position]} if query else position
+    direction = DESCENDING if descending else ASCENDING
+    sort = [(field, direction)]
+    if field != "_id":
+        sort.append(("_id", direction))
+    return query, sort
+
+
+def record_tombstones(ids: List[ObjectId]):
+    """
+    This function records the deletion of the products for the changes
+    feed. It runs after the deletion, if it fails the mirrors keep the
+    products until they sync the whole catalog again.
+    """
+    if not ids:
+        return
+    now = timezone.now()
+    get_collection(ProductTombstone).insert_many(
+        [{"product_id": str(id), "deleted_at": now} for id in ids],
+        ordered=False
+    )
 
 
 class ProductOps(abc.ABC):
     """
     The interface encompasses all the operations of the product model.
     """
+    # The fields that decide which scoped listings contain a record.
+    REFERENCE_FIELDS: tuple = ("department_id", "unit_measure_id")
 
     @abc.abstractmethod
     def create(self, data: dict) -> product:
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_all(self, data: dict) -> QuerySet[product]:
+    def bulk_create(self, data: List[dict]
+                    ) -> Tuple[List[ObjectId], Dict[int, dict]]:
+        """
+        This method inserts a batch of records in a single round trip.
+        :param data: Validated records.
+        :return: The _id assigned to each record, in input order, and the
+        write errors by position of the records that were not inserted.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def bulk_update(self, updates: List[Tuple[dict, dict, dict]],
+                    upsert: bool = False, ordered: bool = False) -> dict:
+        """
+        This method applies a batch of partial updates in a single round
+        trip.
+        :param updates: Triples of (selector, changes, defaults), the
+        defaults are only written when the record is inserted.
+        :param upsert: Insert the records whose selector does not match.
+        :param ordered: Stop at the first error.
+        :return: The matched and modified counts, the _id of the upserted
+        records and the write errors, both by position.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def count_by_key(self, key: str, values: List[str]) -> Dict[str, int]:
+        """
+        This method counts the records that have each value of a field.
+        :return: The number of records by value, the values without records
+        are not included.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def query_all(self, fields: Optional[tuple] = None) -> QuerySet[product]:
         """
         This method queries all unit measures.
         """
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_id(self, id: str) -> product:
+    def query_by_id(self, id: str,
+                    fields: Optional[tuple] = None) -> product:
         """
         This method queries a product by ID
         """
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_department_id(self, id: str) -> QuerySet[product]:
+    def query_by_department_id(
+            self, id: str,
+            fields: Optional[tuple] = None) -> QuerySet[product]:
         """
         This method queries a product by ID
         """
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_unit_measure_id(self, id: str) -> QuerySet[product]:
+    def query_by_unit_measure_id(
+            self, id: str,
+            fields: Optional[tuple] = None) -> QuerySet[product]:
         """
         This method queries a product by ID
         """
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_name(self, name: str) -> QuerySet[product]:
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> QuerySet[product]:
         """
         This method queries a product by name
         """
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_description(self, description: str) -> QuerySet[product]:
+    def query_by_description(
+            self, description: str,
+            fields: Optional[tuple] = None) -> QuerySet[product]:
         """
         This method queries a product by description
         """
         raise NotImplementedError
 
     @abc.abstractmethod
-    def delete(self, id: str) -> bool:
+    def query_by_filters(self, filters: dict,
+                         fields: Optional[tuple] = None) -> QuerySet[product]:
+        """
+        This method queries the products that match all the ORM lookups
+        built by ProductFilter.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def query_page(self, filters: dict, sort_key: str,
+                   after: Optional[Tuple], limit: int,
+                   fields: Optional[tuple] = None) -> List[product]:
+        """
+        This method queries a page of products ordered by the sort key and
+        the _id, starting after the (value, _id) pair of the previous page.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def query_tombstones(self, after: Optional[Tuple], until: datetime,
+                         limit: int) -> List[ProductTombstone]:
+        """
+        This method queries the deletions recorded up to a date, ordered by
+        the deletion date and the _id, starting after the (deleted_at, _id)
+        pair of the previous page.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iterate(self, filters: dict, batch_size: int,
+                fields: Optional[tuple] = None) -> Iterator[product]:
+        """
+        This method iterates over the products that match the filters,
+        reading them from the database in batches.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def search(self, text: str, limit: int,
+               fields: Optional[tuple] = None) -> List[dict]:
+        """
+        This method runs a full-text search over name, description and
+        comments, it returns the raw documents with their relevance in the
+        'score' key, best matches first.
+        :raise MissingIndexError: The text index has not been created.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, id: str) -> Optional[product]:
         """
         This method deletes a record by ID.
+        :return: The deleted record with at least its references, or None
+        if it was not deleted.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def count(self, filters: dict) -> int:
+        """
+        This method counts the records that match the filters.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def version(self, filters: dict) -> Tuple[int, Optional[datetime]]:
+        """
+        This method returns the number of records that match the filters
+        and their most recent last update date.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete_many(self, filters: dict) -> int:
+        """
+        This method deletes the records that match the filters in a single
+        round trip.
+        :return: The number of deleted records.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def adjust_stock(self, id: ObjectId, delta: int,
+                     allow_negative: bool = False) -> Optional[product]:
+        """
+        This method adds a signed delta to the quantity in a single atomic
+        write.
+        :param allow_negative: Apply a negative delta even if the quantity
+        goes below zero, otherwise the record is not updated.
+        :return: The record with only its resulting quantity and its
+        references, or None if no record was updated.
         """
         raise NotImplementedError
 
@@ -71,27 +268,125 @@ class ProductOps(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def partial_update(self, id: ObjectId,
+                       changes: dict) -> Tuple[product, dict]:
+        """
+        This method sets only the given fields, and the last update date,
+        in a single atomic write.
+        :return: The record after the update and the references it had
+        before.
+        """
+        raise NotImplementedError
+
 
 class ProductOpsMongo(ProductOps):
+    DOCUMENT_FIELDS: tuple = (
+        "name", "description", "quantity", "url_picture", "location",
+        "lot_flag", "price_lot_flag", "alert_minimum_stock_flag",
+        "alert_expiration_date_flag", "comments", "department_id",
+        "unit_measure_id",
+    )
 
-    def query_all(self) -> QuerySet[product]:
+    def query_all(self, fields: Optional[tuple] = None) -> QuerySet[product]:
         logger.info("Adapter Layer - query_all method:::")
-        return product.objects.all()
+        return self.select(fields).all()
 
-    def query_by_id(self, id: str) -> product:
-        return product.objects.get(_id=id)
+    def query_by_id(self, id: str,
+                    fields: Optional[tuple] = None) -> product:
+        return self.select(fields).get(_id=id)
 
-    def query_by_department_id(self, id: str) -> QuerySet[product]:
-        return product.objects.filter(department_id=id)
+    def query_by_department_id(
+            self, id: str,
+            fields: Optional[tuple] = None) -> QuerySet[product]:
+        return self.select(fields).filter(department_id=id)
 
-    def query_by_unit_measure_id(self, id: str) -> QuerySet[product]:
-        return product.objects.filter(unit_measure_id=id)
+    def query_by_unit_measure_id(
+            self, id: str,
+            fields: Optional[tuple] = None) -> QuerySet[product]:
+        return self.select(fields).filter(unit_measure_id=id)
 
-    def query_by_name(self, name: str) -> QuerySet[product]:
-        return product.objects.filter(name__icontains=name)
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> QuerySet[product]:
+        return self.select(fields).filter(name__icontains=name)
+
+    def query_by_description(
+            self, description: str,
+            fields: Optional[tuple] = None) -> QuerySet[product]:
+        return self.select(fields).filter(
+            description__icontains=description)
+
+    def query_by_filters(self, filters: dict,
+                         fields: Optional[tuple] = None) -> QuerySet[product]:
+        logger.info("Adapter Layer - query_by_filters method:::")
+        return self.select(fields).filter(Q(*filters.items()))
+
+    def query_page(self, filters: dict, sort_key: str,
+                   after: Optional[Tuple], limit: int,
+                   fields: Optional[tuple] = None) -> List[product]:
+        logger.info("Adapter Layer - query_page method:::")
+        field = sort_key.lstrip("-")
+        descending = sort_key.startswith("-")
+        products = self.select(fields).filter(Q(*filters.items()))
+        if after is not None:
+            value, last_id = after
+            operator = "lt" if descending else "gt"
+            if field == "_id":
+                products = products.filter(**{f"_id__{operator}": last_id})
+            else:
+                products = products.filter(
+                    Q(**{f"{field}__{operator}": value}) |
+                    Q(**{field: value, f"_id__{operator}": last_id})
+                )
+        ordering = [sort_key]
+        if field != "_id":
+            ordering.append("-_id" if descending else "_id")
+        return list(products.order_by(*ordering)[:limit])
+
+    def query_tombstones(self, after: Optional[Tuple], until: datetime,
+                         limit: int) -> List[ProductTombstone]:
+        logger.info("Adapter Layer - query_tombstones method:::")
+        tombstones = ProductTombstone.objects.filter(deleted_at__lte=until)
+        if after is not None:
+            value, last_id = after
+            tombstones = tombstones.filter(
+                Q(deleted_at__gt=value) | Q(deleted_at=value, _id__gt=last_id)
+            )
+        return list(tombstones.order_by("deleted_at", "_id")[:limit])
+
+    def iterate(self, filters: dict, batch_size: int,
+                fields: Optional[tuple] = None) -> Iterator[product]:
+        logger.info("Adapter Layer - iterate method:::")
+        products = self.select(fields).filter(Q(*filters.items()))
+        return products.order_by("_id").iterator(chunk_size=batch_size)
+
+    def select(self, fields: Optional[tuple]) -> QuerySet[product]:
+        """
+        This method restricts the loaded columns, djongo translates them
+        into the projection of the Mongo query.
+        """
+        if fields is None:
+            return product.objects.all()
+        return product.objects.only(*fields)
 
-    def query_by_description(self, description: str) -> QuerySet[product]:
-        return product.objects.filter(description__icontains=description)
+    def search(self, text: str, limit: int,
+               fields: Optional[tuple] = None) -> List[dict]:
+        logger.info("Adapter Layer - search method:::")
+        collection = get_collection(product)
+        projection = {"score": {"$meta": "textScore"}}
+        if fields is not None:
+            projection.update({field: True for field in fields})
+        documents = collection.find(
+            {"$text": {"$search": text}}, projection
+        ).sort([("score", {"$meta": "textScore"})]).limit(limit)
+        try:
+            return list(documents)
+        except OperationFailure as e:
+            if e.code != INDEX_NOT_FOUND:
+                raise
+            raise MissingIndexError(
+                "The text index of the products does not exist, run "
+                "'manage.py sync_indexes'.")
 
     def create(self, data: dict) -> product:
         logger.info("Adapter Layer -create method ::: ")
@@ -127,15 +422,288 @@ class ProductOpsMongo(ProductOps):
         )
         return new_product
 
-    def delete(self, id: str) -> bool:
+    @classmethod
+    def new_document(cls, data: dict, now: datetime) -> dict:
+        """
+        This method builds the document of a new record, the dates are set
+        here because the pre_save signal is not sent for raw inserts.
+        """
+        document = {name: data.get(name) for name in cls.DOCUMENT_FIELDS}
+        document["date"] = now
+        document["last_update"] = now
+        return document
+
+    def bulk_create(self, data: List[dict]
+                    ) -> Tuple[List[ObjectId], Dict[int, dict]]:
+        """
+        The ORM inserts the records in order and stops at the first error,
+        so the batch is written with an unordered insert_many and every
+        valid record is inserted.
+        """
+        logger.info("Adapter Layer - bulk_create method:::")
+        now = timezone.now()
+        documents = [self.new_document(row, now) for row in data]
+        errors = {}
+        try:
+            get_collection(product).insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            errors = {error["index"]: error
+                      for error in e.details["writeErrors"]}
+        # insert_many assigns the _id of each document before sending it.
+        return [document["_id"] for document in documents], errors
+
+    def bulk_update(self, updates: List[Tuple[dict, dict, dict]],
+                    upsert: bool = False, ordered: bool = False) -> dict:
+        """
+        The ORM reads and saves the whole document of each record, so the
+        batch is written with a single bulk_write of $set operations. The
+        upserts complete the new documents with $setOnInsert, so an update
+        never resets the fields that the record left out.
+        """
+        logger.info("Adapter Layer - bulk_update method:::")
+        now = timezone.now()
+        operations = []
+        for selector, changes, defaults in updates:
+            update = {"$set": dict(changes, last_update=now)}
+            if upsert:
+                update["$setOnInsert"] = {
+                    name: value for name, value
+                    in self.new_document(defaults, now).items()
+                    if name not in update["$set"]
+                }
+            operations.append(UpdateOne(selector, update, upsert=upsert))
+        try:
+            result = get_collection(product).bulk_write(
+                operations, ordered=ordered).bulk_api_result
+        except BulkWriteError as e:
+            result = e.details
+        return {
+            "matched": result["nMatched"],
+            "modified": result["nModified"],
+            "upserted": {item["index"]: item["_id"]
+                         for item in result["upserted"]},
+            "errors": {error["index"]: error
+                       for error in result["writeErrors"]},
+        }
+
+    def count_by_key(self, key: str, values: List[str]) -> Dict[str, int]:
+        logger.info("Adapter Layer - count_by_key method:::")
+        if not values:
+            return {}
+        groups = get_collection(product).aggregate([
+            {"$match": {key: {"$in": values}}},
+            {"$group": {"_id": f"${key}", "count": {"$sum": 1}}},
+        ])
+        return {group["_id"]: group["count"] for group in groups}
+
+    def delete(self, id: str) -> Optional[product]:
         get_product = product.objects.get(_id=id)
         delete_count, delete_dict = get_product.delete()
         if delete_count > 0:
-            return True
+            record_tombstones([id])
+            return get_product
         else:
-            return False
+            return None
+
+    def count(self, filters: dict) -> int:
+        logger.info("Adapter Layer - count method:::")
+        return product.objects.filter(Q(*filters.items())).count()
+
+    def version(self, filters: dict) -> Tuple[int, Optional[datetime]]:
+        """
+        djongo can not run a covered query, so the version is read with
+        pymongo.
+        """
+        logger.info("Adapter Layer - version method:::")
+        return get_version(product, lookups_to_query(filters), "last_update")
+
+    def delete_many(self, filters: dict) -> int:
+        """
+        The model has no relations nor delete signals, so Django runs a
+        single DELETE without loading the records. Only the ids are read
+        first, to record the tombstones, and only those records are deleted.
+        """
+        logger.info("Adapter Layer - delete_many method:::")
+        ids = list(product.objects.filter(Q(*filters.items()))
+                   .values_list("_id", flat=True))
+        if not ids:
+            return 0
+        delete_count, delete_dict = product.objects.filter(
+            _id__in=ids).delete()
+        record_tombstones(ids)
+        return delete_count
+
+    def adjust_stock(self, id: ObjectId, delta: int,
+                     allow_negative: bool = False) -> Optional[product]:
+        """
+        The ORM can not return the record of an update, so the increment is
+        sent with find_one_and_update. It is an update pipeline because a
+        $inc on a null quantity fails, the products created without a
+        quantity count as 0.
+        """
+        logger.info("Adapter Layer - adjust_stock method:::")
+        query = {"_id": id}
+        if delta < 0 and not allow_negative:
+            query["quantity"] = {"$gte": -delta}
+        document = get_collection(product).find_one_and_update(
+            query,
+            [{"$set": {
+                "quantity": {"$add": [{"$ifNull": ["$quantity", 0]}, delta]},
+                "last_update": timezone.now()
+            }}],
+            projection=to_projection(STOCK_FIELDS),
+            return_document=ReturnDocument.AFTER
+        )
+        return None if document is None \
+            else to_model(product, document, STOCK_FIELDS)
 
     def update(self, product_object: product) -> product:
         logger.info("Adapter layer -update method:::")
         product_object.save()
         return product_object
+
+    def partial_update(self, id: ObjectId,
+                       changes: dict) -> Tuple[product, dict]:
+        """
+        save() rewrites the whole document, so the changes are sent as a
+        $set with pymongo. When they replace a reference the previous
+        document is returned by the same write, otherwise the references
+        did not change.
+        """
+        logger.info("Adapter layer - partial_update method:::")
+        if not set(self.REFERENCE_FIELDS).intersection(changes):
+            updated = set_fields(product, id, changes, "last_update")
+            previous = {field: getattr(updated, field)
+                        for field in self.REFERENCE_FIELDS}
+            return updated, previous
+        updated, document = set_fields_with_previous(product, id, changes,
+                                                     "last_update")
+        return updated, {field: document.get(field)
+                         for field in self.REFERENCE_FIELDS}
+
+
+class ProductOpsPyMongo(ProductOpsMongo):
+    """
+    The concrete class implements the operations of the ProductOps interface
+    with direct pymongo calls over the shared client, skipping the SQL
+    translation of djongo. It returns the same model instances, so the
+    services do not depend on the selected implementation.
+    """
+    def collection(self) -> Collection:
+        return get_collection(product)
+
+    def find(self, query: dict, fields: Optional[tuple] = None) -> List:
+        documents = self.collection().find(query, to_projection(fields))
+        return [to_model(product, document, fields)
+                for document in documents]
+
+    def query_all(self, fields: Optional[tuple] = None) -> List[product]:
+        logger.info("Adapter Layer - query_all method:::")
+        return self.find({}, fields)
+
+    def query_by_id(self, id: str,
+                    fields: Optional[tuple] = None) -> product:
+        document = self.collection().find_one({"_id": id},
+                                              to_projection(fields))
+        if document is None:
+            raise product.DoesNotExist(
+                "product matching query does not exist.")
+        return to_model(product, document, fields)
+
+    def query_by_department_id(
+            self, id: str,
+            fields: Optional[tuple] = None) -> List[product]:
+        return self.find({"department_id": str(id)}, fields)
+
+    def query_by_unit_measure_id(
+            self, id: str,
+            fields: Optional[tuple] = None) -> List[product]:
+        return self.find({"unit_measure_id": str(id)}, fields)
+
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> List[product]:
+        return self.find(lookups_to_query({"name__icontains": name}), fields)
+
+    def query_by_description(
+            self, description: str,
+            fields: Optional[tuple] = None) -> List[product]:
+        return self.find(
+            lookups_to_query({"description__icontains": description}),
+            fields)
+
+    def query_by_filters(self, filters: dict,
+                         fields: Optional[tuple] = None) -> List[product]:
+        logger.info("Adapter Layer - query_by_filters method:::")
+        return self.find(lookups_to_query(filters), fields)
+
+    def query_page(self, filters: dict, sort_key: str,
+                   after: Optional[Tuple], limit: int,
+                   fields: Optional[tuple] = None) -> List[product]:
+        logger.info("Adapter Layer - query_page method:::")
+        query, sort = page_query(filters, sort_key, after)
+        documents = self.collection().find(
+            query, to_projection(fields)).sort(sort).limit(limit)
+        return [to_model(product, document, fields)
+                for document in documents]
+
+    def query_tombstones(self, after: Optional[Tuple], until: datetime,
+                         limit: int) -> List[ProductTombstone]:
+        logger.info("Adapter Layer - query_tombstones method:::")
+        query, sort = page_query({"deleted_at__lte": until}, "deleted_at",
+                                 after)
+        documents = get_collection(ProductTombstone).find(query).sort(
+            sort).limit(limit)
+        return [to_model(ProductTombstone, document)
+                for document in documents]
+
+    def iterate(self, filters: dict, batch_size: int,
+                fields: Optional[tuple] = None) -> Iterator[product]:
+        logger.info("Adapter Layer - iterate method:::")
+        documents = self.collection().find(
+            lookups_to_query(filters), to_projection(fields)
+        ).sort("_id", ASCENDING).batch_size(batch_size)
+        return (to_model(product, document, fields)
+                for document in documents)
+
+    def create(self, data: dict) -> product:
+        logger.info("Adapter Layer -create method ::: ")
+        document = self.new_document(data, timezone.now())
+        document["_id"] = self.collection().insert_one(document).inserted_id
+        return to_model(product, document)
+
+    def delete(self, id: str) -> Optional[product]:
+        fields = ("_id", *self.REFERENCE_FIELDS)
+        document = self.collection().find_one_and_delete(
+            {"_id": id}, projection=to_projection(fields))
+        if document is None:
+            raise product.DoesNotExist(
+                "product matching query does not exist.")
+        record_tombstones([id])
+        return to_model(product, document, fields)
+
+    def count(self, filters: dict) -> int:
+        logger.info("Adapter Layer - count method:::")
+        return self.collection().count_documents(lookups_to_query(filters))
+
+    def delete_many(self, filters: dict) -> int:
+        logger.info("Adapter Layer - delete_many method:::")
+        ids = [document["_id"] for document in self.collection().find(
+            lookups_to_query(filters), {"_id": True})]
+        if not ids:
+            return 0
+        deleted_count = self.collection().delete_many(
+            {"_id": {"$in": ids}}).deleted_count
+        record_tombstones(ids)
+        return deleted_count
+
+    def update(self, product_object: product) -> product:
+        logger.info("Adapter layer -update method:::")
+        product_object.last_update = timezone.now()
+        document = to_document(product_object)
+        oid = document.pop("_id")
+        result = self.collection().update_one({"_id": oid},
+                                              {"$set": document})
+        if result.matched_count == 0:
+            raise product.DoesNotExist(
+                "product matching query does not exist.")
+        return product_object
@@ -0,0 +1,153 @@
+from typing import Union
+
+import requests
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.dispatch import receiver
+
+from DepartmentApp.signals import department_changed
+from MeasureApp.signals import unit_measure_changed
+from ProductManagementService import metrics
+from ProductManagementService.cache import TTLCache
+from ProductManagementService.env import AppEnv
+from ProductManagementService.logger import logger
+from .async_reference_request import AsyncDepartmentRequest, \
+    AsyncUnitMeasureRequest
+from .department_api_request import DepartmentRequest
+from .reference_response import ReferenceResponse
+from .unitmeasure_api_request import UnitMeasureRequest
+
+DEPARTMENT_CACHE = TTLCache(AppEnv.REFERENCE_CACHE_SIZE,
+                            AppEnv.REFERENCE_CACHE_TTL)
+UNIT_MEASURE_CACHE = TTLCache(AppEnv.REFERENCE_CACHE_SIZE,
+                              AppEnv.REFERENCE_CACHE_TTL)
+metrics.register("department_reference_cache", DEPARTMENT_CACHE.stats)
+metrics.register("unit_measure_reference_cache", UNIT_MEASURE_CACHE.stats)
+
+
+def cache_key(id: str) -> str:
+    """
+    This function returns the canonical text of an id, so the ids sent in
+    another hex case share the entry that the write signals invalidate.
+    The invalid ids are kept as they are, their check is not cached.
+    """
+    try:
+        return str(ObjectId(id))
+    except (InvalidId, TypeError):
+        return id
+
+
+def cached_query_by_id(cache: TTLCache,
+                       request: Union[DepartmentRequest, UnitMeasureRequest],
+                       id: str
+                       ) -> Union[requests.Response, ReferenceResponse]:
+    """
+    This function returns the cached result of a reference check. The ids
+    that exist are cached with the default TTL and the ids that were not
+    found with the negative TTL, any other error is not cached.
+    """
+    key = cache_key(id)
+    found, response = cache.get(key)
+    if found:
+        return response
+    response = request.query_by_id(id)
+    remember(cache, key, response)
+    return response
+
+
+async def cached_query_by_id_async(
+        cache: TTLCache,
+        request: Union[AsyncDepartmentRequest, AsyncUnitMeasureRequest],
+        id: str) -> ReferenceResponse:
+    key = cache_key(id)
+    found, response = cache.get(key)
+    if found:
+        return response
+    response = await request.query_by_id(id)
+    remember(cache, key, response)
+    return response
+
+
+def remember(cache: TTLCache, id: str,
+             response: Union[requests.Response, ReferenceResponse]):
+    if response.ok:
+        cache.set(id, ReferenceResponse(response.status_code, response.text))
+    elif response.status_code == 404:
+        cache.set(id, ReferenceResponse(response.status_code, response.text),
+                  AppEnv.REFERENCE_CACHE_NEGATIVE_TTL)
+
+
+class CachedDepartmentRequest(DepartmentRequest):
+    """
+    The concrete class puts the reference cache in front of another
+    department adapter.
+    """
+
+    def __init__(self, department_request: DepartmentRequest,
+                 cache: TTLCache = DEPARTMENT_CACHE):
+        self.department_request = department_request
+        self.cache = cache
+
+    def query_by_id(self, id: str
+                    ) -> Union[requests.Response, ReferenceResponse]:
+        logger.info("Adapter Layer - cached query_by_id method ::: ")
+        return cached_query_by_id(self.cache, self.department_request, id)
+
+
+class CachedUnitMeasureRequest(UnitMeasureRequest):
+    """
+    The concrete class puts the reference cache in front of another unit
+    measure adapter.
+    """
+
+    def __init__(self, unit_measure_request: UnitMeasureRequest,
+                 cache: TTLCache = UNIT_MEASURE_CACHE):
+        self.unit_measure_request = unit_measure_request
+        self.cache = cache
+
+    def query_by_id(self, id: str
+                    ) -> Union[requests.Response, ReferenceResponse]:
+        logger.info("Adapter Layer - cached query_by_id method ::: ")
+        return cached_query_by_id(self.cache, self.unit_measure_request, id)
+
+
+class CachedAsyncDepartmentRequest(AsyncDepartmentRequest):
+    """
+    The concrete class puts the reference cache in front of an async
+    department adapter, it shares the entries with the sync adapters.
+    """
+
+    def __init__(self, department_request: AsyncDepartmentRequest,
+                 cache: TTLCache = DEPARTMENT_CACHE):
+        self.department_request = department_request
+        self.cache = cache
+
+    async def query_by_id(self, id: str) -> ReferenceResponse:
+        return await cached_query_by_id_async(self.cache,
+                                              self.department_request, id)
+
+
+class CachedAsyncUnitMeasureRequest(AsyncUnitMeasureRequest):
+    """
+    The concrete class puts the reference cache in front of an async unit
+    measure adapter, it shares the entries with the sync adapters.
+    """
+
+    def __init__(self, unit_measure_request: AsyncUnitMeasureRequest,
+                 cache: TTLCache = UNIT_MEASURE_CACHE):
+        self.unit_measure_request = unit_measure_request
+        self.cache = cache
+
+    async def query_by_id(self, id: str) -> ReferenceResponse:
+        return await cached_query_by_id_async(self.cache,
+                                              self.unit_measure_request, id)
+
+
+@receiver(department_changed)
+def invalidate_department(sender, id: str, **kwargs):
+    DEPARTMENT_CACHE.invalidate(cache_key(id))
+
+
+@receiver(unit_measure_changed)
+def invalidate_unit_measure(sender, id: str, **kwargs):
+    UNIT_MEASURE_CACHE.invalidate(cache_key(id))
@@ -0,0 +1,23 @@
+from typing import Any
+
+from ProductManagementService import json_codec
+
+
+class ReferenceResponse:
+    """
+    This class contains the attributes of requests.Response that the
+    services read, it is returned by the in-process reference adapters.
+    """
+
+    def __init__(self, status_code: int, text: str = ""):
+        self.status_code = status_code
+        self.text = text
+
+    @classmethod
+    def from_content(cls, status_code: int,
+                     content: Any) -> "ReferenceResponse":
+        return cls(status_code, json_codec.dumps(content).decode("utf-8"))
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
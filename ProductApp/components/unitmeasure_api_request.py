@@ -1,8 +1,18 @@
 import abc
+from typing import Union
 
 import requests
+from bson.errors import InvalidId
+from django.core.exceptions import ObjectDoesNotExist
+from injector import inject
 
+from MeasureApp.services.unitmeasure import UnitMeasureService
+from ProductManagementService import metrics
+from ProductManagementService.env import AppEnv
+from ProductManagementService.http_client import CircuitOpenError, \
+    HttpClient
 from ProductManagementService.logger import logger
+from .reference_response import ReferenceResponse
 
 
 class UnitMeasureRequest(abc.ABC):
@@ -11,11 +21,59 @@ class UnitMeasureRequest(abc.ABC):
     """
 
     @abc.abstractmethod
-    def query_by_id(self, url: str) -> requests.Response:
+    def query_by_id(self, id: str
+                    ) -> Union[requests.Response, ReferenceResponse]:
+        """
+        This method queries a unit measure by ID, the result has the
+        status_code, text and ok attributes of an HTTP response.
+        """
         raise NotImplementedError
 
 
 class UnitMeasureApiRest(UnitMeasureRequest):
-    def query_by_id(self, url: str) -> requests.Response:
+    """
+    The concrete class queries the unit measure api rest, it is used when
+    the unit measures are served by a separate deployment.
+    """
+
+    def __init__(self):
+        self.client = HttpClient()
+        metrics.register("unit_measure_api", self.client.stats)
+
+    def query_by_id(self, id: str
+                    ) -> Union[requests.Response, ReferenceResponse]:
+        logger.info("Adapter Layer - query_by_id method ::: ")
+        try:
+            return self.client.get(AppEnv.QUERY_UNIT_MEASURE_BY_ID,
+                                   params={"id": id})
+        except (CircuitOpenError, requests.RequestException) as e:
+            # Fail fast instead of holding the worker, the error is not
+            # cached.
+            logger.error(f"The unit measure service is unavailable:"
+                         f"{str(e)}")
+            return ReferenceResponse.from_content(503, {
+                "error": "The unit measure service is unavailable, please "
+                         "try again later."})
+
+
+class UnitMeasureServiceRequest(UnitMeasureRequest):
+    """
+    The concrete class queries the MeasureApp service of the same process,
+    it avoids a loopback HTTP request through the whole middleware and
+    serializer stack.
+    """
+
+    @inject
+    def __init__(self, unit_measure_service: UnitMeasureService):
+        self.unit_measure_service = unit_measure_service
+
+    def query_by_id(self, id: str) -> ReferenceResponse:
         logger.info("Adapter Layer - query_by_id method ::: ")
-        return requests.get(url)
+        try:
+            unit_measure = self.unit_measure_service.query_by_id(id,
+                                                                 ("_id",))
+        except ObjectDoesNotExist as e:
+            return ReferenceResponse.from_content(404, {"error": str(e)})
+        except (InvalidId, TypeError) as e:
+            return ReferenceResponse.from_content(400, {"error": str(e)})
+        return ReferenceResponse.from_content(200, unit_measure)
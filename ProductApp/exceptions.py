@@ -0,0 +1,20 @@
+class ExpiredWatermarkError(Exception):
+    """
+    The token of the changes feed is older than the retention of the
+    tombstones, some deletions may be lost and the mirror must sync the
+    whole catalog again.
+    """
+
+
+class MissingIndexError(Exception):
+    """
+    A query needs an index that has not been created yet, the indexes are
+    created at deploy time by 'manage.py sync_indexes'.
+    """
+
+
+class AmbiguousKeyError(Exception):
+    """
+    The external key of an upsert matches more than one record, so the
+    record to update is not known.
+    """
@@ -0,0 +1,108 @@
+from datetime import timezone as dt_timezone
+from typing import List
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+def parse_object_id(name: str, value: str) -> str:
+    try:
+        return str(ObjectId(value))
+    except (InvalidId, TypeError):
+        raise ValueError(f"The '{name}' parameter must be a valid id.")
+
+
+def parse_object_id_list(name: str, value: str) -> List[str]:
+    values = [item.strip() for item in value.split(",") if item.strip()]
+    if not values:
+        raise ValueError(f"The '{name}' parameter must contain at least one "
+                         f"id.")
+    return [parse_object_id(name, item) for item in values]
+
+
+def parse_primary_key_list(name: str, value: str) -> List[ObjectId]:
+    return [ObjectId(item) for item in parse_object_id_list(name, value)]
+
+
+def parse_text(name: str, value: str) -> str:
+    if not value.strip():
+        raise ValueError(f"The '{name}' parameter can not be empty.")
+    return value
+
+
+def parse_integer(name: str, value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"The '{name}' parameter must be an integer.")
+
+
+def parse_boolean(name: str, value: str) -> bool:
+    lowered = value.lower()
+    if lowered in ("true", "1"):
+        return True
+    if lowered in ("false", "0"):
+        return False
+    raise ValueError(f"The '{name}' parameter must be true or false.")
+
+
+def parse_date(name: str, value: str):
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f"The '{name}' parameter must be an ISO 8601 "
+                         f"datetime.")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+class ProductFilter:
+    """
+    This class translates the query parameters of the product listing into
+    a single set of ORM lookups combined with AND, so the Mongo query
+    planner chooses the index among all the predicates.
+    """
+
+    PARAMETERS: dict = {
+        "_id__in": ("_id__in", parse_primary_key_list),
+        "department_id": ("department_id", parse_object_id),
+        "unit_measure_id": ("unit_measure_id", parse_object_id),
+        "department_id__in": ("department_id__in", parse_object_id_list),
+        "unit_measure_id__in": ("unit_measure_id__in", parse_object_id_list),
+        "quantity": ("quantity", parse_integer),
+        "quantity__gt": ("quantity__gt", parse_integer),
+        "quantity__gte": ("quantity__gte", parse_integer),
+        "quantity__lt": ("quantity__lt", parse_integer),
+        "quantity__lte": ("quantity__lte", parse_integer),
+        "date__gte": ("date__gte", parse_date),
+        "date__lte": ("date__lte", parse_date),
+        "last_update__gte": ("last_update__gte", parse_date),
+        "last_update__lte": ("last_update__lte", parse_date),
+        "lot_flag": ("lot_flag", parse_boolean),
+        "price_lot_flag": ("price_lot_flag", parse_boolean),
+        "alert_minimum_stock_flag": ("alert_minimum_stock_flag",
+                                     parse_boolean),
+        "alert_expiration_date_flag": ("alert_expiration_date_flag",
+                                       parse_boolean),
+        "name": ("name__icontains", parse_text),
+        "description": ("description__icontains", parse_text),
+    }
+
+    def __init__(self, query_params):
+        """
+        :param query_params: QueryDict of the request, the parameters that
+        are not filters (limit, fields, etc.) are ignored.
+        """
+        self.lookups: dict = {}
+        for name, (lookup, parser) in self.PARAMETERS.items():
+            value = query_params.get(name)
+            if value is not None:
+                self.lookups[lookup] = parser(name, value)
+
+    def __bool__(self) -> bool:
+        return bool(self.lookups)
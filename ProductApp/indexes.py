@@ -0,0 +1,97 @@
+from pymongo import ASCENDING, TEXT
+
+from ProductManagementService.env import AppEnv
+from ProductManagementService.indexes import IndexSpec
+from .constants import AppConstants
+from .models import ProductTombstone, product
+
+MODEL = product
+
+INDEXES = (
+    IndexSpec(
+        name="department_id_1__id_1",
+        keys=(("department_id", ASCENDING), ("_id", ASCENDING)),
+        serves=(
+            "GET products/?department_id=",
+            "GET products/?department_id__in=",
+            "GET products/?department_id=&limit=&after= (sort=_id)",
+        ),
+    ),
+    IndexSpec(
+        name="department_id_1_last_update_1",
+        keys=(("department_id", ASCENDING), ("last_update", ASCENDING)),
+        serves=(
+            "ETag of GET products/?department_id= (covered max of "
+            "last_update)",
+        ),
+    ),
+    IndexSpec(
+        name="unit_measure_id_1__id_1",
+        keys=(("unit_measure_id", ASCENDING), ("_id", ASCENDING)),
+        serves=(
+            "GET products/?unit_measure_id=",
+            "GET products/?unit_measure_id__in=",
+            "GET products/?unit_measure_id=&limit=&after= (sort=_id)",
+        ),
+    ),
+    IndexSpec(
+        name="name_1__id_1",
+        keys=(("name", ASCENDING), ("_id", ASCENDING)),
+        serves=(
+            "GET products/?limit=&sort=name",
+            "GET products/?name= (the regex scans the index, not the "
+            "documents)",
+        ),
+    ),
+    IndexSpec(
+        name="quantity_1__id_1",
+        keys=(("quantity", ASCENDING), ("_id", ASCENDING)),
+        serves=(
+            "GET products/?limit=&sort=quantity",
+            "GET products/?quantity__gte=&quantity__lte=",
+        ),
+    ),
+    IndexSpec(
+        name="date_1__id_1",
+        keys=(("date", ASCENDING), ("_id", ASCENDING)),
+        serves=(
+            "GET products/?limit=&sort=date",
+            "GET products/?date__gte=&date__lte=",
+        ),
+    ),
+    IndexSpec(
+        name="last_update_1__id_1",
+        keys=(("last_update", ASCENDING), ("_id", ASCENDING)),
+        serves=(
+            "GET products/?limit=&sort=last_update",
+            "GET products/?last_update__gte=&last_update__lte=",
+            "ETag of GET products/ (covered max of last_update)",
+            "GET products/changes/?since= (updates)",
+        ),
+    ),
+    IndexSpec(
+        name=AppConstants.Search.TEXT_INDEX_NAME,
+        keys=tuple(
+            (field, TEXT) for field in AppConstants.Search.TEXT_INDEX_WEIGHTS
+        ),
+        options={
+            "weights": AppConstants.Search.TEXT_INDEX_WEIGHTS,
+            "default_language": "none",
+        },
+        serves=("GET products/search/?q=",),
+    ),
+)
+
+OTHER_MODELS = (
+    (ProductTombstone, (
+        IndexSpec(
+            name="deleted_at_1",
+            keys=(("deleted_at", ASCENDING),),
+            options={"expireAfterSeconds": AppEnv.TOMBSTONE_RETENTION},
+            serves=(
+                "GET products/changes/?since= (deletions)",
+                "Expiration of the tombstones",
+            ),
+        ),
+    )),
+)
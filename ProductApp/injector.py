@@ -1,12 +1,30 @@
 import injector
-from injector import Binder, singleton
+from injector import Binder, provider, singleton
 
+from DepartmentApp.services.departments import DepartmentsService
+from DepartmentApp.services.departments_async import \
+    DepartmentsAsyncService
+from MeasureApp.services.unitmeasure import UnitMeasureService
+from MeasureApp.services.unitmeasure_async import UnitMeasureAsyncService
+from .components.async_reference_request import AsyncDepartmentRequest, \
+    AsyncUnitMeasureRequest, DepartmentAsyncServiceRequest, \
+    ThreadedDepartmentRequest, ThreadedUnitMeasureRequest, \
+    UnitMeasureAsyncServiceRequest
 from .components.department_api_request import DepartmentRequest, \
-    DepartmentApiRequest
-from .components.product_ops import ProductOps, ProductOpsMongo
+    DepartmentApiRequest, DepartmentServiceRequest
+from ProductManagementService.env import AppEnv
+from .components.product_async_ops import ProductAsyncOps, \
+    ProductOpsMotor
+from .components.product_ops import ProductOps, ProductOpsMongo, \
+    ProductOpsPyMongo
+from .components.reference_cache import CachedAsyncDepartmentRequest, \
+    CachedAsyncUnitMeasureRequest, CachedDepartmentRequest, \
+    CachedUnitMeasureRequest
 from .components.unitmeasure_api_request import UnitMeasureRequest, \
-    UnitMeasureApiRest
+    UnitMeasureApiRest, UnitMeasureServiceRequest
 from .services.products import ProductService, ProductMongoService
+from .services.products_async import ProductAsyncService, \
+    ProductMotorService
 
 
 class ProductInjector(injector.Module):
@@ -21,7 +39,8 @@ class ProductInjector(injector.Module):
         """
         binder.bind(
             ProductOps,
-            to=ProductOpsMongo,
+            to=ProductOpsPyMongo if AppEnv.MONGO_OPS_DRIVER == "pymongo"
+            else ProductOpsMongo,
             scope=singleton,
 
         )
@@ -31,12 +50,81 @@ class ProductInjector(injector.Module):
             scope=singleton
         )
         binder.bind(
-            UnitMeasureRequest,
-            to=UnitMeasureApiRest,
-            scope=singleton,
+            ProductAsyncOps,
+            to=ProductOpsMotor,
+            scope=singleton
         )
         binder.bind(
-            DepartmentRequest,
-            to=DepartmentApiRequest,
-            scope=singleton,
+            ProductAsyncService,
+            to=ProductMotorService,
+            scope=singleton
         )
+
+    @singleton
+    @provider
+    def provide_unit_measure_request(
+            self, unit_measure_service: UnitMeasureService
+    ) -> UnitMeasureRequest:
+        """
+        This method selects the unit measure adapter and puts the reference
+        cache in front of it.
+        """
+        if AppEnv.REFERENCE_VALIDATION == "http":
+            unit_measure_request = UnitMeasureApiRest()
+        else:
+            unit_measure_request = UnitMeasureServiceRequest(
+                unit_measure_service)
+        if AppEnv.REFERENCE_CACHE_SIZE > 0:
+            return CachedUnitMeasureRequest(unit_measure_request)
+        return unit_measure_request
+
+    @singleton
+    @provider
+    def provide_department_request(
+            self, department_service: DepartmentsService
+    ) -> DepartmentRequest:
+        """
+        This method selects the department adapter and puts the reference
+        cache in front of it.
+        """
+        if AppEnv.REFERENCE_VALIDATION == "http":
+            department_request = DepartmentApiRequest()
+        else:
+            department_request = DepartmentServiceRequest(department_service)
+        if AppEnv.REFERENCE_CACHE_SIZE > 0:
+            return CachedDepartmentRequest(department_request)
+        return department_request
+
+    @singleton
+    @provider
+    def provide_async_unit_measure_request(
+            self, unit_measure_service: UnitMeasureAsyncService,
+            unit_measure_request: UnitMeasureRequest
+    ) -> AsyncUnitMeasureRequest:
+        """
+        This method selects the unit measure adapter of the async views, the
+        api rest adapter runs in a worker thread.
+        """
+        if AppEnv.REFERENCE_VALIDATION == "http":
+            return ThreadedUnitMeasureRequest(unit_measure_request)
+        async_request = UnitMeasureAsyncServiceRequest(unit_measure_service)
+        if AppEnv.REFERENCE_CACHE_SIZE > 0:
+            return CachedAsyncUnitMeasureRequest(async_request)
+        return async_request
+
+    @singleton
+    @provider
+    def provide_async_department_request(
+            self, department_service: DepartmentsAsyncService,
+            department_request: DepartmentRequest
+    ) -> AsyncDepartmentRequest:
+        """
+        This method selects the department adapter of the async views, the
+        api rest adapter runs in a worker thread.
+        """
+        if AppEnv.REFERENCE_VALIDATION == "http":
+            return ThreadedDepartmentRequest(department_request)
+        async_request = DepartmentAsyncServiceRequest(department_service)
+        if AppEnv.REFERENCE_CACHE_SIZE > 0:
+            return CachedAsyncDepartmentRequest(async_request)
+        return async_request
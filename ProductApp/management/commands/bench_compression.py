@@ -0,0 +1,116 @@
+import random
+import time
+
+from bson import ObjectId
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from DepartmentApp.models import Department
+from DepartmentApp.serializers import DEPARTMENT_ENCODER
+from ProductApp.models import product
+from ProductApp.serializer import PRODUCT_ENCODER
+from ProductManagementService.compression import available_codecs
+from ProductManagementService.env import AppEnv
+
+LEVELS: dict = {
+    "gzip": (1, 4, 6, 9),
+    "zstd": (1, 3, 6, 9, 15),
+}
+
+WORDS: tuple = ("Sparkling", "water", "600", "ml", "Whole", "milk", "1",
+                "l", "Rice", "5", "kg", "Coffee", "beans", "Organic",
+                "Tomato", "sauce", "Bread", "Cheese", "Detergent", "Soap")
+
+
+class Command(BaseCommand):
+    help = ("Measures the CPU time and the bytes saved by each encoding and "
+            "level on catalog listings, as a whole response and as an "
+            "NDJSON stream flushed per chunk. It does not need a "
+            "database.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--departments", type=int, default=20)
+        parser.add_argument("--unit-measures", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        codecs = available_codecs("zstd,gzip")
+        if len(codecs) < 2:
+            self.stdout.write("The 'zstandard' package is not installed, "
+                              "only gzip is measured.")
+        payloads = self.build_payloads(rows, options["departments"],
+                                       options["unit_measures"])
+        for name, content, chunks in payloads:
+            self.stdout.write(f"\n{name}: {len(content):,} bytes, "
+                              f"{len(chunks)} stream chunks")
+            for codec in codecs:
+                for level in LEVELS[codec.name]:
+                    self.measure(codec, level, content, chunks,
+                                 options["repeat"])
+
+    def build_payloads(self, rows: int, departments: int,
+                       unit_measures: int) -> list:
+        rng = random.Random(7)
+        now = timezone.now()
+        department_ids = [str(ObjectId()) for _ in range(departments)]
+        unit_measure_ids = [str(ObjectId()) for _ in range(unit_measures)]
+        products = [
+            product(_id=ObjectId(),
+                    name=" ".join(rng.sample(WORDS, 3)),
+                    description=" ".join(rng.sample(WORDS, 6)),
+                    quantity=rng.randint(0, 500),
+                    url_picture=f"https://cdn.example.com/p/{i}.png",
+                    location=f"Aisle {rng.randint(1, 30)}",
+                    lot_flag=rng.random() < 0.2,
+                    price_lot_flag=False,
+                    alert_minimum_stock_flag=rng.random() < 0.5,
+                    alert_expiration_date_flag=False, comments="",
+                    date=now, last_update=now,
+                    department_id=rng.choice(department_ids),
+                    unit_measure_id=rng.choice(unit_measure_ids))
+            for i in range(rows)
+        ]
+        department_models = [
+            Department(_id=ObjectId(), name=f"Department {i}",
+                       description="Beverages and snacks", date=now,
+                       last_update_date=now)
+            for i in range(departments * 10)
+        ]
+        records = [PRODUCT_ENCODER.from_model(p) for p in products]
+        batch = AppEnv.STREAM_BATCH_SIZE
+        chunks = [
+            b"".join(PRODUCT_ENCODER.dumps(record) + b"\n"
+                     for record in records[start:start + batch])
+            for start in range(0, len(records), batch)
+        ]
+        departments_content = DEPARTMENT_ENCODER.dumps_models(
+            department_models)
+        return [
+            ("product listing", PRODUCT_ENCODER.dumps(records), chunks),
+            ("department listing", departments_content,
+             [departments_content]),
+        ]
+
+    def measure(self, codec, level: int, content: bytes, chunks: list,
+                repeat: int):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            compressed = codec.compress(content, level)
+        seconds = (time.perf_counter() - start) / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            streamed = sum(len(data) for data in
+                           codec.compress_stream(chunks, level))
+        stream_seconds = (time.perf_counter() - start) / repeat
+
+        self.stdout.write(
+            f"  {codec.name:<4} {level:>2}: {len(compressed):>10,} bytes "
+            f"({len(compressed) / len(content):6.1%}) "
+            f"{seconds * 1000:8.2f} ms "
+            f"{len(content) / seconds / 2 ** 20:8.1f} MB/s  "
+            f"stream: {streamed:>10,} bytes "
+            f"{stream_seconds * 1000:8.2f} ms"
+        )
@@ -0,0 +1,111 @@
+import time
+
+from bson import ObjectId
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse
+from django.utils import timezone
+
+from DepartmentApp.models import Department
+from DepartmentApp.serializers import DEPARTMENT_ENCODER, OutSerializer
+from MeasureApp.models import UnitMeasure
+from MeasureApp.serializer import (OutInitMeasureWithIdSerializer,
+                                   UNIT_MEASURE_ENCODER)
+from ProductApp.models import product
+from ProductApp.serializer import OutSerializerAllFields, PRODUCT_ENCODER
+
+
+def legacy_product_dict(object_model: product) -> dict:
+    return {
+        '_id': str(object_model._id),
+        'name': object_model.name,
+        'description': object_model.description,
+        'quantity': object_model.quantity,
+        'url_picture': object_model.url_picture,
+        'location': object_model.location,
+        'lot_flag': object_model.lot_flag,
+        'price_lot_flag': object_model.price_lot_flag,
+        'alert_minimum_stock_flag': object_model.alert_minimum_stock_flag,
+        'alert_expiration_date_flag':
+            object_model.alert_expiration_date_flag,
+        'comments': object_model.comments,
+        'date': object_model.formatted_date(),
+        'last_update': object_model.formatted_last_update(),
+        'department_id': object_model.department_id,
+        'unit_measure_id': object_model.unit_measure_id
+    }
+
+
+def legacy_catalog_dict(object_model) -> dict:
+    object_dict = {
+        '_id': str(object_model._id),
+        'name': object_model.name,
+        'description': object_model.description,
+        'date': object_model.formatted_date(),
+        'last_update_date': object_model.formatted_last_update_date()
+    }
+    if hasattr(object_model, "abbreviation"):
+        object_dict["abbreviation"] = object_model.abbreviation
+    return object_dict
+
+
+class Command(BaseCommand):
+    help = ("Measures the rows per second of the product, department and "
+            "unit measure output encoding, comparing convert_to_dict plus "
+            "serializer validation against the precompiled encoders. It "
+            "does not need a database.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100000)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        now = timezone.now()
+        products = [
+            product(_id=ObjectId(), name=f"Product {i}",
+                    description="Sparkling water 600 ml", quantity=i % 500,
+                    url_picture="https://cdn.example.com/p.png",
+                    location="Aisle 4", lot_flag=False, price_lot_flag=False,
+                    alert_minimum_stock_flag=True,
+                    alert_expiration_date_flag=False, comments="",
+                    date=now, last_update=now,
+                    department_id=str(ObjectId()),
+                    unit_measure_id=str(ObjectId()))
+            for i in range(rows)
+        ]
+        departments = [
+            Department(_id=ObjectId(), name=f"Department {i}",
+                       description="Beverages", date=now,
+                       last_update_date=now)
+            for i in range(rows)
+        ]
+        unit_measures = [
+            UnitMeasure(_id=ObjectId(), name=f"Unit {i}", abbreviation="kg",
+                        description="Kilogram", date=now,
+                        last_update_date=now)
+            for i in range(rows)
+        ]
+        cases = (
+            ("product", products, legacy_product_dict,
+             OutSerializerAllFields, PRODUCT_ENCODER),
+            ("department", departments, legacy_catalog_dict,
+             OutSerializer, DEPARTMENT_ENCODER),
+            ("unit measure", unit_measures, legacy_catalog_dict,
+             OutInitMeasureWithIdSerializer, UNIT_MEASURE_ENCODER),
+        )
+        for name, models, legacy_dict, serializer_class, encoder in cases:
+            start = time.perf_counter()
+            serializer = serializer_class(
+                data=[legacy_dict(model) for model in models], many=True)
+            serializer.is_valid(raise_exception=True)
+            JsonResponse(serializer.data, safe=False)
+            legacy_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            encoder.dumps_models(models)
+            encoder_seconds = time.perf_counter() - start
+
+            self.stdout.write(
+                f"{name:<13} serializer: {rows / legacy_seconds:>10,.0f} "
+                f"rows/s  encoder: {rows / encoder_seconds:>10,.0f} rows/s  "
+                f"({legacy_seconds / encoder_seconds:.1f}x)"
+            )
@@ -0,0 +1,87 @@
+import json
+import time
+
+from bson import ObjectId
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ProductApp.models import product
+from ProductApp.serializer import PRODUCT_ENCODER
+from ProductManagementService.json_codec import OrjsonCodec, StdlibCodec, \
+    format_datetime, orjson
+
+
+def converted_product_dict(document: dict) -> dict:
+    """
+    This function converts the id and dates to text before the encoding, as
+    the encoders did before the codec handled them.
+    """
+    return dict(document, _id=str(document["_id"]),
+                date=format_datetime(document["date"]),
+                last_update=format_datetime(document["last_update"]))
+
+
+class Command(BaseCommand):
+    help = ("Measures the encode and decode throughput of the JSON codecs "
+            "on product payloads: a listing written and read as a single "
+            "array, and the same records as one document each, as in the "
+            "request bodies and the NDJSON streams. It does not need a "
+            "database.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100000)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        now = timezone.now()
+        documents = [
+            PRODUCT_ENCODER.from_model(product(
+                _id=ObjectId(), name=f"Product {i}",
+                description="Sparkling water 600 ml", quantity=i % 500,
+                url_picture="https://cdn.example.com/p.png",
+                location="Aisle 4", lot_flag=False, price_lot_flag=False,
+                alert_minimum_stock_flag=True,
+                alert_expiration_date_flag=False, comments="",
+                date=now, last_update=now,
+                department_id=str(ObjectId()),
+                unit_measure_id=str(ObjectId())))
+            for i in range(rows)
+        ]
+
+        start = time.perf_counter()
+        json.dumps([converted_product_dict(document)
+                    for document in documents])
+        baseline_seconds = time.perf_counter() - start
+        self.stdout.write(f"{'baseline':<8} encode: "
+                          f"{rows / baseline_seconds:>11,.0f} rows/s "
+                          f"(json.dumps of the converted records)")
+
+        codecs = [StdlibCodec()]
+        if orjson is not None:
+            codecs.append(OrjsonCodec())
+        else:
+            self.stdout.write("orjson is not installed, only the stdlib "
+                              "codec is measured.")
+        for codec in codecs:
+            start = time.perf_counter()
+            payload = codec.dumps(documents)
+            encode_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            codec.loads(payload)
+            decode_seconds = time.perf_counter() - start
+
+            lines = [codec.dumps(document) for document in documents]
+            start = time.perf_counter()
+            for line in lines:
+                codec.loads(line)
+            bodies_seconds = time.perf_counter() - start
+
+            megabytes = len(payload) / 1024 / 1024
+            self.stdout.write(
+                f"{codec.name:<8} encode: {rows / encode_seconds:>11,.0f} "
+                f"rows/s ({megabytes / encode_seconds:,.0f} MB/s)  "
+                f"decode: {rows / decode_seconds:>11,.0f} rows/s  "
+                f"decode documents: {rows / bodies_seconds:>11,.0f} "
+                f"docs/s  ({baseline_seconds / encode_seconds:.1f}x)"
+            )
@@ -0,0 +1,90 @@
+import time
+
+from bson import ObjectId
+from django.core.management.base import BaseCommand
+
+from DepartmentApp.components.department_ops import DepartmentOpsMongo, \
+    DepartmentOpsPyMongo
+from MeasureApp.components.unitmeasure_ops import UnitMeasureOpsMongo, \
+    UnitMeasureOpsPyMongo
+from ProductApp.components.product_ops import ProductOpsMongo, \
+    ProductOpsPyMongo
+
+PRODUCT_DATA = {
+    "name": "bench-ops product",
+    "description": "Sparkling water 600 ml",
+    "quantity": 10,
+    "url_picture": "https://cdn.example.com/p.png",
+    "location": "Aisle 4",
+    "lot_flag": False,
+    "price_lot_flag": False,
+    "alert_minimum_stock_flag": True,
+    "alert_expiration_date_flag": False,
+    "comments": "",
+    "department_id": str(ObjectId()),
+    "unit_measure_id": str(ObjectId()),
+}
+DEPARTMENT_DATA = {"name": "bench-ops department", "description": "Bench"}
+UNIT_MEASURE_DATA = {"name": "bench-ops unit", "abbreviation": "bo",
+                     "description": "Bench"}
+
+
+class Command(BaseCommand):
+    help = ("Compares the operations per second of the djongo and the "
+            "pymongo implementations of ProductOps, DepartmentOps and "
+            "UnitMeasureOps. The records are created with a 'bench-ops' "
+            "name and deleted at the end. It needs a running mongod.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        cases = (
+            ("product", PRODUCT_DATA,
+             ProductOpsMongo(), ProductOpsPyMongo()),
+            ("department", DEPARTMENT_DATA,
+             DepartmentOpsMongo(), DepartmentOpsPyMongo()),
+            ("unit measure", UNIT_MEASURE_DATA,
+             UnitMeasureOpsMongo(), UnitMeasureOpsPyMongo()),
+        )
+        for label, data, djongo_ops, pymongo_ops in cases:
+            djongo_results = self.run(djongo_ops, data, iterations)
+            pymongo_results = self.run(pymongo_ops, data, iterations)
+            self.stdout.write(label)
+            for operation, djongo_rate in djongo_results.items():
+                pymongo_rate = pymongo_results[operation]
+                self.stdout.write(
+                    f"  {operation:<14} djongo: {djongo_rate:>9,.0f} op/s  "
+                    f"pymongo: {pymongo_rate:>9,.0f} op/s  "
+                    f"({pymongo_rate / djongo_rate:.1f}x)"
+                )
+
+    def run(self, ops, data: dict, iterations: int) -> dict:
+        results = {}
+
+        start = time.perf_counter()
+        created = [ops.create(data) for _ in range(iterations)]
+        results["create"] = iterations / (time.perf_counter() - start)
+        ids = [record._id for record in created]
+
+        start = time.perf_counter()
+        for oid in ids:
+            ops.query_by_id(oid)
+        results["query_by_id"] = iterations / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(10):
+            list(ops.query_by_name("bench-ops"))
+        results["query_by_name"] = 10 / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for record in created:
+            ops.update(record)
+        results["update"] = iterations / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for oid in ids:
+            ops.delete(oid)
+        results["delete"] = iterations / (time.perf_counter() - start)
+        return results
@@ -0,0 +1,75 @@
+import statistics
+import time
+
+from bson import ObjectId
+from django.core.management.base import BaseCommand
+
+from ProductApp.components.department_api_request import DepartmentRequest
+from ProductApp.components.product_ops import ProductOpsMongo
+from ProductApp.components.reference_response import ReferenceResponse
+from ProductApp.components.unitmeasure_api_request import UnitMeasureRequest
+from ProductApp.services.products import ProductMongoService
+from ProductManagementService.concurrency import get_executor
+
+
+class SlowDepartmentRequest(DepartmentRequest):
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def query_by_id(self, id: str) -> ReferenceResponse:
+        time.sleep(self.latency)
+        return ReferenceResponse(200, "{}")
+
+
+class SlowUnitMeasureRequest(UnitMeasureRequest):
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def query_by_id(self, id: str) -> ReferenceResponse:
+        time.sleep(self.latency)
+        return ReferenceResponse(200, "{}")
+
+
+class Command(BaseCommand):
+    help = ("Measures the latency of the reference validation of a product "
+            "create, and of a bulk create with many distinct references, "
+            "checking them one after the other and concurrently. The "
+            "lookups are simulated with a fixed latency, so it does not "
+            "need a database nor the other services.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--department-latency", type=float, default=40,
+                            help="Milliseconds.")
+        parser.add_argument("--unit-measure-latency", type=float,
+                            default=30, help="Milliseconds.")
+        parser.add_argument("--distinct", type=int, default=40,
+                            help="Distinct references of the bulk create.")
+
+    def handle(self, *args, **options):
+        service = ProductMongoService(
+            ProductOpsMongo(),
+            SlowUnitMeasureRequest(options["unit_measure_latency"] / 1000),
+            SlowDepartmentRequest(options["department_latency"] / 1000),
+        )
+        records = [
+            (index, {"unit_measure_id": str(ObjectId()),
+                     "department_id": str(ObjectId())})
+            for index in range(options["distinct"] // 2)
+        ]
+        for label, executor in (("sequential", None),
+                                ("concurrent", get_executor())):
+            service.executor = executor
+            samples = []
+            for _ in range(options["iterations"]):
+                start = time.perf_counter()
+                service.validate_references(str(ObjectId()),
+                                            str(ObjectId()))
+                samples.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            service.check_references(records)
+            bulk = (time.perf_counter() - start) * 1000
+            self.stdout.write(
+                f"{label:<12} create p50 {statistics.median(samples):8.1f} "
+                f"ms  max {max(samples):8.1f} ms  bulk "
+                f"({len(records) * 2} references) {bulk:8.1f} ms")
@@ -0,0 +1,100 @@
+import random
+import re
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from pymongo import TEXT
+
+from ProductApp.constants import AppConstants
+from ProductManagementService.mongo import get_database
+
+WORDS = ("water", "sparkling", "juice", "orange", "apple", "milk", "cheese",
+         "bread", "rice", "beans", "coffee", "tea", "sugar", "salt", "oil",
+         "soap", "shampoo", "paper", "towel", "battery", "cable", "charger",
+         "lamp", "glass", "bottle", "box", "organic", "light", "family",
+         "pack", "premium", "classic", "natural", "fresh", "frozen")
+
+
+class Command(BaseCommand):
+    help = ("Seeds a scratch collection with synthetic products and "
+            "compares the latency of the text index search against the "
+            "unanchored case-insensitive regex used by 'icontains'. It needs "
+            "a running mongod.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=1000000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--collection", default="bench_product_search")
+        parser.add_argument("--keep", action="store_true",
+                            help="Do not drop the scratch collection.")
+
+    def handle(self, *args, **options):
+        collection = get_database()[options["collection"]]
+        random.seed(7)
+        if collection.estimated_document_count() < options["products"]:
+            self.seed(collection, options["products"])
+        weights = AppConstants.Search.TEXT_INDEX_WEIGHTS
+        collection.create_index(
+            [(field, TEXT) for field in weights],
+            name=AppConstants.Search.TEXT_INDEX_NAME,
+            weights=weights,
+            default_language="none",
+        )
+        # Half of the queries are common words and half are selective
+        # tokens, which force the regex to scan the whole collection.
+        terms = [
+            random.choice(WORDS) if i % 2 else
+            str(random.randrange(options["products"]))
+            for i in range(options["queries"])
+        ]
+        limit = options["limit"]
+
+        def text_search(term):
+            return list(collection.find(
+                {"$text": {"$search": term}},
+                {"score": {"$meta": "textScore"}}
+            ).sort([("score", {"$meta": "textScore"})]).limit(limit))
+
+        def regex_search(term):
+            return list(collection.find(
+                {"name": {"$regex": re.escape(term), "$options": "i"}}
+            ).limit(limit))
+
+        for label, search in (("text index", text_search),
+                              ("icontains regex", regex_search)):
+            latencies = []
+            for term in terms:
+                start = time.perf_counter()
+                search(term)
+                latencies.append((time.perf_counter() - start) * 1000)
+            latencies.sort()
+            self.stdout.write(
+                f"{label:<16} p50: {statistics.median(latencies):8.2f} ms  "
+                f"p95: {latencies[int(len(latencies) * 0.95) - 1]:8.2f} ms  "
+                f"max: {latencies[-1]:8.2f} ms"
+            )
+        if not options["keep"]:
+            collection.drop()
+
+    def seed(self, collection, total: int):
+        collection.drop()
+        now = timezone.now()
+        batch = []
+        for i in range(total):
+            batch.append({
+                "name": " ".join(random.sample(WORDS, 3)) + f" {i}",
+                "description": " ".join(random.sample(WORDS, 8)),
+                "comments": " ".join(random.sample(WORDS, 4)),
+                "quantity": random.randint(0, 500),
+                "date": now,
+                "last_update": now,
+            })
+            if len(batch) == 10000:
+                collection.insert_many(batch, ordered=False)
+                batch = []
+        if batch:
+            collection.insert_many(batch, ordered=False)
+        self.stdout.write(f"Seeded {total} products.")
@@ -0,0 +1,54 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = ("Sends the same GET request from many concurrent clients and "
+            "reports the throughput and the latency percentiles of each "
+            "url. To compare WSGI with ASGI, serve the project twice, e.g. "
+            "'gunicorn -w 4 -b :8000 ProductManagementService.wsgi' and "
+            "'uvicorn --workers 4 --port 8001 "
+            "ProductManagementService.asgi:application', and pass "
+            "http://127.0.0.1:8000/products/?limit=50 and "
+            "http://127.0.0.1:8001/async/products/?limit=50.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", nargs="+", required=True)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--timeout", type=float, default=10,
+                            help="Seconds.")
+
+    def handle(self, *args, **options):
+        for url in options["url"]:
+            self.run(url, options["concurrency"], options["requests"],
+                     options["timeout"])
+
+    def run(self, url: str, concurrency: int, total: int, timeout: float):
+        session = requests.Session()
+        session.mount("http://", requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=concurrency))
+
+        def send(_):
+            start = time.perf_counter()
+            try:
+                ok = session.get(url, timeout=timeout).ok
+            except requests.RequestException:
+                ok = False
+            return (time.perf_counter() - start) * 1000, ok
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(send, range(total)))
+        elapsed = time.perf_counter() - start
+        latencies = sorted(latency for latency, _ in samples)
+        errors = sum(1 for _, ok in samples if not ok)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"{url}\n  {total / elapsed:8.1f} req/s  p50 "
+            f"{statistics.median(latencies):8.1f} ms  p99 {p99:8.1f} ms  "
+            f"errors {errors}")
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ProductManagementService.indexes import sync_all
+
+
+class Command(BaseCommand):
+    help = ("Creates the indexes declared in the 'indexes' module of each "
+            "app, rebuilds the ones whose definition drifted and reports the "
+            "queries each index serves. It is idempotent and meant to run "
+            "at deploy time.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check", action="store_true",
+            help="Only report, fail if an index is missing or drifted.")
+        parser.add_argument(
+            "--drop-extra", action="store_true",
+            help="Drop the indexes that are not declared.")
+
+    def handle(self, *args, **options):
+        reports = sync_all(apply=not options["check"],
+                           drop_extra=options["drop_extra"])
+        for report in reports:
+            self.stdout.write(
+                f"{report.collection:<28} {report.name:<28} {report.status}")
+            for query in report.serves:
+                self.stdout.write(f"{'':<30}serves {query}")
+        failed = [report for report in reports
+                  if report.status in ("missing", "drift")]
+        if options["check"] and failed:
+            raise CommandError(
+                f"{len(failed)} index(es) are missing or drifted.")
@@ -0,0 +1,22 @@
+# Generated by Django 4.1.13 on 2026-10-18 16:36
+
+from django.db import migrations, models
+import djongo.models.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ProductApp', '0002_rename_alert_expiration_flag_product_alert_expiration_date_flag_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductTombstone',
+            fields=[
+                ('_id', djongo.models.fields.ObjectIdField(auto_created=True, primary_key=True, serialize=False)),
+                ('product_id', models.TextField(max_length=50)),
+                ('deleted_at', models.DateTimeField()),
+            ],
+        ),
+    ]
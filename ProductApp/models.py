@@ -41,3 +41,14 @@ def set_date_on_create(sender, instance, **kwargs):
         instance.date = timezone.now()
     else:
         instance.last_update = timezone.now()
+
+
+class ProductTombstone(models.Model):
+    """
+        Records the deletion of a product, so the mirrors of the catalog can
+        apply the deletions incrementally. The records expire after
+        TOMBSTONE_RETENTION seconds.
+    """
+    _id = models.ObjectIdField(primary_key=True)
+    product_id = models.TextField(max_length=50)
+    deleted_at = models.DateTimeField()
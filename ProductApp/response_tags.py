@@ -0,0 +1,53 @@
+from typing import List, Optional
+
+from bson import ObjectId
+from django.dispatch import receiver
+from rest_framework import request
+
+from ProductApp.filters import ProductFilter
+from ProductApp.signals import products_changed
+from ProductManagementService.response_cache import invalidate
+
+# Tags of the cached product responses. A listing filtered by department or
+# unit measure only depends on the products of that reference, any other
+# listing depends on every product.
+PRODUCTS_TAG: str = "products"
+PRODUCT_TAG: str = "product"
+DEPARTMENT_PRODUCTS_TAG: str = "products:department"
+UNIT_MEASURE_PRODUCTS_TAG: str = "products:unit_measure"
+
+
+def product_tags(request: request.Request) -> tuple:
+    """
+    This function returns the tags of a product GET. Every scoped entry
+    also has the tag of its scope, so a write whose previous references are
+    not known invalidates the whole scope.
+    """
+    id = request.query_params.get("id")
+    if id is not None:
+        return PRODUCT_TAG, f"{PRODUCT_TAG}:{ObjectId(id)}"
+    lookups = ProductFilter(request.query_params).lookups
+    tags = []
+    for field, tag in (("department_id", DEPARTMENT_PRODUCTS_TAG),
+                       ("unit_measure_id", UNIT_MEASURE_PRODUCTS_TAG)):
+        value = lookups.get(field)
+        if value is not None:
+            tags.extend((tag, f"{tag}:{value}"))
+    return tuple(tags) or (PRODUCTS_TAG,)
+
+
+@receiver(products_changed)
+def invalidate_products(sender, products: Optional[List[dict]], **kwargs):
+    if products is None:
+        invalidate((PRODUCTS_TAG, PRODUCT_TAG, DEPARTMENT_PRODUCTS_TAG,
+                    UNIT_MEASURE_PRODUCTS_TAG))
+        return
+    tags = {PRODUCTS_TAG}
+    for product in products:
+        tags.add(f"{PRODUCT_TAG}:{product['_id']}")
+        if product.get("department_id") is not None:
+            tags.add(f"{DEPARTMENT_PRODUCTS_TAG}:{product['department_id']}")
+        if product.get("unit_measure_id") is not None:
+            tags.add(
+                f"{UNIT_MEASURE_PRODUCTS_TAG}:{product['unit_measure_id']}")
+    invalidate(tags)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from ProductManagementService.encoders import ModelEncoder
 from .models import product
 
 
@@ -46,3 +47,8 @@ class OutSerializerAllFields(serializers.ModelSerializer):
                   "alert_expiration_date_flag", "comments", "date",
                   "last_update", "department_id",
                   "unit_measure_id")
+
+
+PRODUCT_ENCODER = ModelEncoder(
+    fields=OutSerializerAllFields.Meta.fields,
+)
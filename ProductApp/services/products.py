@@ -1,17 +1,97 @@
 import abc
+from datetime import datetime, timedelta
+from functools import partial
 from typing import Any
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 from bson import ObjectId
 from django.db.models import QuerySet
+from django.dispatch import receiver
+from django.utils import timezone
 from injector import inject
+from rest_framework.exceptions import ValidationError
 
 from ProductApp.components.department_api_request import DepartmentRequest
 from ProductApp.components.product_ops import ProductOps
 from ProductApp.components.unitmeasure_api_request import UnitMeasureRequest
+from ProductApp.constants import AppConstants
+from ProductApp.exceptions import AmbiguousKeyError, \
+    ExpiredWatermarkError
+from ProductApp.filters import parse_object_id
 from ProductApp.models import product
+from ProductApp.serializer import InSerializer, PRODUCT_ENCODER
+from ProductApp.signals import products_changed
+from ProductManagementService import metrics
+from ProductManagementService.bulk import batches
+from ProductManagementService.concurrency import SingleFlight, coalesced, \
+    get_executor, run_concurrently
 from ProductManagementService.env import AppEnv
 from ProductManagementService.logger import logger
+from ProductManagementService.mongo import DUPLICATE_KEY_ERROR
+from ProductManagementService.pagination import decode_cursor, \
+    decode_watermark, encode_cursor, encode_watermark
+
+
+# The listings of products that are read at the same time share the query.
+PRODUCT_QUERIES = SingleFlight()
+metrics.register("product_queries", PRODUCT_QUERIES.stats)
+
+
+@receiver(products_changed)
+def forget_product_queries(sender, **kwargs):
+    PRODUCT_QUERIES.forget()
+
+
+def changed_product(record: product) -> dict:
+    """
+    This function returns the id and references of a record, which is all
+    that the receivers of products_changed need to know.
+    """
+    return {"_id": record._id,
+            **{field: getattr(record, field)
+               for field in ProductOps.REFERENCE_FIELDS}}
+
+
+def page_position(sort_key: str, after: Optional[str],
+                  fields: Optional[tuple]
+                  ) -> Tuple[Optional[tuple], Optional[tuple]]:
+    """
+    This function validates the sort key and decodes the cursor of a page.
+    :return: Tuple with the position after which the page starts and the
+    fields to load, the cursor needs the sort field even if it was not
+    requested.
+    """
+    sort_field = sort_key.lstrip("-")
+    if sort_field not in AppConstants.Pagination.SORT_KEYS:
+        raise ValueError(
+            f"The products can not be sorted by '{sort_key}'.")
+    position = decode_cursor(after, sort_key) if after else None
+    query_fields = fields
+    if fields is not None and sort_field not in fields:
+        query_fields = fields + (sort_field,)
+    return position, query_fields
+
+
+def page_result(products: List[product], sort_key: str, limit: int,
+                fields: Optional[tuple]) -> dict:
+    """
+    This function builds a page from 'limit + 1' products, the extra one
+    only tells if there is a next page.
+    """
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        last_product = products[-1]
+        next_cursor = encode_cursor(
+            sort_key,
+            getattr(last_product, sort_key.lstrip("-")),
+            last_product._id
+        )
+    encoder = PRODUCT_ENCODER.subset(fields)
+    return {
+        "results": [encoder.from_model(p) for p in products],
+        "next": next_cursor
+    }
 
 
 class ProductService(abc.ABC):
@@ -26,7 +106,27 @@ class ProductService(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_all(self) -> QuerySet[product]:
+    def bulk_create(self, rows: List) -> dict:
+        """
+        This method validates and creates many products, every record is
+        processed even if others fail.
+        :return: The created and failed counts and one result per record.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def bulk_update(self, rows: List, upsert_key: Optional[str] = None,
+                    ordered: bool = False) -> dict:
+        """
+        This method applies many partial updates, or upserts by an external
+        key, with one write per batch.
+        :return: The matched, modified and upserted counts in total and by
+        batch, and the records that failed.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def query_all(self, fields: Optional[tuple] = None) -> QuerySet[product]:
         """
         This method retrieves a unit measure by ID from the ProductOpsMongo
         concrete class.
@@ -34,7 +134,8 @@ class ProductService(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_id(self, id: str) -> product:
+    def query_by_id(self, id: str,
+                    fields: Optional[tuple] = None) -> product:
         """
         This method retrieves a product by ID from the ProductOpsMongo
         concrete class.
@@ -42,7 +143,9 @@ class ProductService(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_department_id(self, id: str) -> List[product]:
+    def query_by_department_id(self, id: str,
+                               fields: Optional[tuple] = None
+                               ) -> List[product]:
         """
         This method retrieves a product by department ID from the
         ProductOpsMongo concrete class.
@@ -50,7 +153,9 @@ class ProductService(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_unit_measure_id(self, id: str) -> List[product]:
+    def query_by_unit_measure_id(self, id: str,
+                                 fields: Optional[tuple] = None
+                                 ) -> List[product]:
         """
         This method retrieves a product by Unit measure ID from the
         ProductOpsMongo concrete class.
@@ -58,7 +163,8 @@ class ProductService(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_name(self, name: str) -> List[product]:
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> List[product]:
         """
         This method retrieves a product by name from the ProductOpsMongo
         concrete class.
@@ -66,13 +172,73 @@ class ProductService(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def query_by_description(self, description: str) -> List[product]:
+    def query_by_description(self, description: str,
+                             fields: Optional[tuple] = None
+                             ) -> List[product]:
         """
         This method retrieves a product by description from the
         ProductOpsMongo concrete class.
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def query_by_filters(self, filters: dict,
+                         fields: Optional[tuple] = None) -> List[dict]:
+        """
+        This method retrieves the products that match every criterion of a
+        ProductFilter in a single query.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def query_page(self, filters: dict, sort_key: str, after: Optional[str],
+                   limit: int, fields: Optional[tuple] = None) -> dict:
+        """
+        This method retrieves a page of products using keyset pagination,
+        the result contains the records and the cursor of the next page.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def version(self, filters: dict, id: Optional[str] = None
+                ) -> Tuple[int, Optional[datetime]]:
+        """
+        This method returns the number of products that match the filters,
+        or the id, and their most recent last update date. It identifies the
+        state of a listing without loading it.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def query_changes(self, since: Optional[str], limit: int,
+                      fields: Optional[tuple] = None) -> dict:
+        """
+        This method retrieves the products created or updated, and the ones
+        deleted, after the watermark of a previous call. Without a
+        watermark every product is returned.
+        :return: Dictionary with the changed products, the deletions, the
+        watermark of the next call and whether there are more changes.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iterate(self, filters: dict,
+                fields: Optional[tuple] = None) -> Iterator[dict]:
+        """
+        This method lazily retrieves the products that match the filters,
+        it is used to stream large listings.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def search(self, text: str, limit: int,
+               fields: Optional[tuple] = None) -> List[dict]:
+        """
+        This method retrieves the products that best match the text,
+        ordered by relevance.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def delete(self, id: str) -> bool:
         """
@@ -82,6 +248,27 @@ class ProductService(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def bulk_delete(self, filters: dict, dry_run: bool = False) -> dict:
+        """
+        This method deletes every product that matches the filters with a
+        single query, or only counts them in a dry run.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def adjust_stock(self, rows: List, allow_negative: bool = False) -> dict:
+        """
+        This method applies many signed quantity deltas, each one is an
+        atomic increment.
+        :param rows: Records like {'_id': '...', 'delta': -2}.
+        :param allow_negative: Let the quantity go below zero.
+        :return: The adjusted and failed counts and one result per record,
+        with the resulting quantity. A record that could not be written has
+        the code 500, the other records are still applied.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def update(self, data: dict, id: str) -> dict:
         """
@@ -90,6 +277,16 @@ class ProductService(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def partial_update(self, data: dict, id: str) -> dict:
+        """
+        This method sets only the fields sent by the client, after checking
+        the department and unit measure that change.
+        :return: The code and the updated product, or the code and message
+        of the failed check.
+        """
+        raise NotImplementedError
+
 
 class ProductMongoService(ProductService):
 
@@ -100,160 +297,634 @@ class ProductMongoService(ProductService):
         self.product_ops = product_ops
         self.unitmeasure_ops = unitmeasure_ops
         self.department_ops = department_ops
+        self.executor = get_executor()
 
     def create(self, data: dict) -> dict[str, Any]:
         logger.info("Service Layer -create method")
 
-        unit_measure_id = data.get("unit_measure_id")
-        department_id = data.get("department_id")
-        if unit_measure_id is not None:
+        error = self.validate_references(data.get("unit_measure_id"),
+                                         data.get("department_id"))
+        if error is not None:
+            return error
 
-            url_measure = f"{AppEnv.QUERY_UNIT_MEASURE_BY_ID}?id={str(
-                unit_measure_id)}"
-            unit_measure = self.unitmeasure_ops.query_by_id(url_measure)
+        product = self.convert_to_dict(self.product_ops.create(data))
+        products_changed.send(sender=self.__class__, products=[product])
+        return {
+            "code": 201,
+            "product": product
+        }
 
-            if unit_measure.status_code != 200:
-                return {
-                    "code": unit_measure.status_code,
-                    "message": unit_measure.text
-                }
+    def validate_references(self, unit_measure_id: Optional[str],
+                            department_id: Optional[str]) -> Optional[dict]:
+        """
+        This method checks the unit measure and the department at the same
+        time, so the latency is the slowest check instead of the sum. The
+        error of the unit measure is returned first, as when they were
+        checked one after the other.
+        :return: None if both exist, otherwise the code and message of the
+        failed check.
+        """
+        checks = []
+        if unit_measure_id is not None:
+            checks.append(partial(self.check_unit_measure, unit_measure_id))
         if department_id is not None:
-            url_department = \
-                f"{AppEnv.QUERY_DEPARTMENT_BY_ID}?id={str(department_id)}"
-            department = self.department_ops.query_by_id(url_department)
-            status_code = department.status_code
-            if department.status_code != 201:
-                if status_code == 404:
-                    return {
-                        "code": status_code,
-                        "message": department.text
-                    }
+            checks.append(partial(self.check_department, department_id))
+        for error in run_concurrently(self.executor, checks):
+            if error is not None:
+                return error
+        return None
+
+    def check_unit_measure(self, unit_measure_id: str) -> Optional[dict]:
+        """
+        This method verifies that the unit measure exists.
+        :return: None if it exists, otherwise the code and message of the
+        unit measure service.
+        """
+        unit_measure = self.unitmeasure_ops.query_by_id(str(unit_measure_id))
+        if not unit_measure.ok:
+            return {
+                "code": unit_measure.status_code,
+                "message": unit_measure.text
+            }
+        return None
+
+    def check_department(self, department_id: str) -> Optional[dict]:
+        """
+        This method verifies that the department exists.
+        :return: None if it exists, otherwise the code and message of the
+        department service.
+        """
+        department = self.department_ops.query_by_id(str(department_id))
+        if not department.ok:
+            return {
+                "code": department.status_code,
+                "message": department.text
+            }
+        return None
+
+    def bulk_create(self, rows: List) -> dict:
+        logger.info("Service Layer - bulk_create method")
+        results: list = [None] * len(rows)
+        valid = []
+        # A single serializer validates every record, as ListSerializer
+        # does, instead of building the fields once per record.
+        serializer = InSerializer()
+        for index, row in enumerate(rows):
+            try:
+                valid.append((index, serializer.run_validation(row)))
+            except ValidationError as e:
+                results[index] = {"index": index, "code": 400,
+                                  "error": e.detail}
+
+        reference_errors = self.check_references(valid)
+        pending = []
+        for index, data in valid:
+            error = reference_errors.get(index)
+            if error is None:
+                pending.append((index, data))
+            else:
+                results[index] = {"index": index, "code": error["code"],
+                                  "error": error["message"]}
+
+        created = []
+        for batch in batches(pending):
+            ids, errors = self.product_ops.bulk_create(
+                [data for index, data in batch])
+            for position, (index, data) in enumerate(batch):
+                error = errors.get(position)
+                if error is None:
+                    created.append(dict(data, _id=str(ids[position])))
+                    results[index] = {"index": index, "code": 201,
+                                      "_id": str(ids[position])}
                 else:
-                    return {
-                        "code": status_code,
-                        "message": department.text
-                    }
+                    code = 409 if error["code"] == DUPLICATE_KEY_ERROR \
+                        else 500
+                    results[index] = {"index": index, "code": code,
+                                      "error": error["errmsg"]}
+        if created:
+            products_changed.send(sender=self.__class__, products=created)
+        return {
+            "created": len(created),
+            "failed": len(rows) - len(created),
+            "results": results
+        }
 
-        product = self.convert_to_dict(self.product_ops.create(data))
+    def bulk_update(self, rows: List, upsert_key: Optional[str] = None,
+                    ordered: bool = False) -> dict:
+        logger.info("Service Layer - bulk_update method")
+        if upsert_key is not None \
+                and upsert_key not in AppConstants.Bulk.UPSERT_KEYS:
+            raise ValueError(
+                f"The products can not be upserted by '{upsert_key}'.")
+        errors = []
+        valid = []
+        matches = {}
+        if upsert_key is not None:
+            matches = self.product_ops.count_by_key(upsert_key, list({
+                row[upsert_key] for row in rows if isinstance(row, dict)
+                and isinstance(row.get(upsert_key), str)
+            }))
+        # The changes only contain the fields to write, an upsert that
+        # inserts the record is also validated as a complete record.
+        serializers = (InSerializer(partial=True), InSerializer())
+        for index, row in enumerate(rows):
+            try:
+                valid.append((index, self.parse_update(
+                    serializers, row, upsert_key, matches)))
+            except ValidationError as e:
+                errors.append({"index": index, "code": 400,
+                               "error": e.detail})
+            except AmbiguousKeyError as e:
+                errors.append({"index": index, "code": 409,
+                               "error": str(e)})
+            except ValueError as e:
+                errors.append({"index": index, "code": 400,
+                               "error": str(e)})
+
+        reference_errors = self.check_references(
+            [(index, changes)
+             for index, (selector, changes, defaults) in valid])
+        pending = []
+        for index, update in valid:
+            error = reference_errors.get(index)
+            if error is None:
+                pending.append((index, update))
+            else:
+                errors.append({"index": index, "code": error["code"],
+                               "error": error["message"]})
+
+        totals = {"matched": 0, "modified": 0}
+        upserted = []
+        batch_results = []
+        skipped = 0
+        written = 0
+        changed = []
+        for number, batch in enumerate(batches(pending)):
+            updates = [update for index, update in batch]
+            changed.extend(
+                self.previous_products(updates, upsert_key or "_id"))
+            result = self.product_ops.bulk_update(
+                updates, upsert=upsert_key is not None, ordered=ordered)
+            totals["matched"] += result["matched"]
+            totals["modified"] += result["modified"]
+            for position, _id in result["upserted"].items():
+                upserted.append({"index": batch[position][0],
+                                 "_id": str(_id)})
+                selector, changes, defaults = updates[position]
+                changed.append(dict(defaults, **changes, _id=_id))
+            for position, error in result["errors"].items():
+                code = 409 if error["code"] == DUPLICATE_KEY_ERROR else 500
+                errors.append({"index": batch[position][0], "code": code,
+                               "error": error["errmsg"]})
+            batch_results.append({
+                "batch": number,
+                "size": len(batch),
+                "matched": result["matched"],
+                "modified": result["modified"],
+                "upserted": len(result["upserted"]),
+                "failed": len(result["errors"]),
+            })
+            if ordered and result["errors"]:
+                # The records after the first error were not written.
+                skipped = len(pending) - written - min(result["errors"]) - 1
+                break
+            written += len(batch)
+        if totals["matched"] or upserted:
+            products_changed.send(sender=self.__class__, products=changed)
         return {
-            "code": 201,
-            "product": product
+            "matched": totals["matched"],
+            "modified": totals["modified"],
+            "upserted": upserted,
+            "failed": len(errors),
+            "skipped": skipped,
+            "batches": batch_results,
+            "errors": sorted(errors, key=lambda error: error["index"])
         }
 
-    def query_all(self) -> dict:
+    def previous_products(self, updates: List[Tuple[dict, dict, dict]],
+                          key: str) -> List[dict]:
+        """
+        This method reads the references of the records that a batch of
+        updates matches before it is written, the listings of the previous
+        references and of the new ones are both affected.
+        :param key: The field of the selectors, _id or the upsert key.
+        :return: The id and references of each record, before and after.
+        """
+        records = self.product_ops.query_by_filters(
+            {f"{key}__in": [selector[key]
+                            for selector, changes, defaults in updates]},
+            tuple(dict.fromkeys(("_id", key,
+                                 *ProductOps.REFERENCE_FIELDS))))
+        by_key = {getattr(record, key): record for record in records}
+        products = []
+        for selector, changes, defaults in updates:
+            record = by_key.get(selector[key])
+            if record is None:
+                continue
+            previous = changed_product(record)
+            products.append(previous)
+            products.append(dict(previous, **{
+                field: changes[field]
+                for field in ProductOps.REFERENCE_FIELDS if field in changes
+            }))
+        return products
+
+    def parse_update(self, serializers: Tuple[InSerializer, InSerializer],
+                     row: Any, upsert_key: Optional[str],
+                     matches: Dict[str, int]) -> Tuple[dict, dict, dict]:
+        """
+        This method validates a record of a bulk update, like
+        {'_id': '...', 'changes': {...}} or, when upserting by name,
+        {'name': '...', 'changes': {...}}.
+        :param serializers: The partial serializer of the changes and the
+        complete one of the records that are inserted.
+        :param matches: Number of records by value of the upsert key.
+        :return: The selector of the record, the validated changes and the
+        defaults of the fields left out, which are only written if the
+        upsert inserts the record.
+        :raise AmbiguousKeyError: The key matches more than one record.
+        """
+        changes_serializer, record_serializer = serializers
+        if not isinstance(row, dict) or not isinstance(row.get("changes"),
+                                                       dict):
+            raise ValueError("Each record must contain a 'changes' object.")
+        changes = row["changes"]
+        if upsert_key is None:
+            if row.get("_id") is None:
+                raise ValueError("The '_id' field is required.")
+            selector = {"_id": ObjectId(parse_object_id("_id", row["_id"]))}
+        else:
+            value = row.get(upsert_key)
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError(f"The '{upsert_key}' field is required.")
+            if matches.get(value, 0) > 1:
+                raise AmbiguousKeyError(
+                    f"The {upsert_key} '{value}' matches "
+                    f"{matches[value]} products.")
+            selector = {upsert_key: value}
+            changes = dict(changes, **selector)
+        validated = dict(changes_serializer.run_validation(changes))
+        if not validated:
+            raise ValueError("The 'changes' object does not contain any "
+                             "field.")
+        defaults = {}
+        if upsert_key is not None and not matches.get(selector[upsert_key]):
+            record = record_serializer.run_validation(changes)
+            defaults = {name: value for name, value in record.items()
+                        if name not in validated}
+        return selector, validated, defaults
+
+    def check_references(self, records: List[Tuple[int, dict]]
+                         ) -> Dict[int, dict]:
+        """
+        This method verifies the department and unit measure of many
+        records, each distinct reference is requested once and all of them
+        are requested concurrently.
+        :param records: Pairs of (index, data).
+        :return: The code and message of the failed reference by index.
+        """
+        references = []
+        for field, check in (("unit_measure_id", self.check_unit_measure),
+                             ("department_id", self.check_department)):
+            ids = {data[field] for index, data in records
+                   if data.get(field) is not None}
+            references.extend((field, id, check) for id in ids)
+        results = run_concurrently(
+            self.executor,
+            [partial(check, id) for field, id, check in references])
+        checks = {"unit_measure_id": {}, "department_id": {}}
+        for (field, id, check), error in zip(references, results):
+            checks[field][id] = error
+        errors = {}
+        for index, data in records:
+            for field, results in checks.items():
+                if data.get(field) is None:
+                    continue
+                error = results[data[field]]
+                if error is not None:
+                    errors[index] = error
+                    break
+        return errors
+
+    @coalesced(PRODUCT_QUERIES)
+    def query_all(self, fields: Optional[tuple] = None) -> dict:
         logger.info("Service Layer -query_all method")
-        departments = self.product_ops.query_all()
+        departments = self.product_ops.query_all(fields)
         departments_list = [
-            self.convert_to_dict(department) for department in departments
+            self.convert_to_dict(department, fields)
+            for department in departments
         ]
         return departments_list
 
-    def query_by_id(self, id: str) -> dict:
+    def query_by_id(self, id: str, fields: Optional[tuple] = None) -> dict:
         logger.info("Service layer - query_by_id method")
         oid = ObjectId(id)
-        product = self.product_ops.query_by_id(oid)
-        return self.convert_to_dict(product)
+        product = self.product_ops.query_by_id(oid, fields)
+        return self.convert_to_dict(product, fields)
 
-    def query_by_department_id(self, id: str) -> List[product]:
+    @coalesced(PRODUCT_QUERIES)
+    def query_by_department_id(self, id: str,
+                               fields: Optional[tuple] = None
+                               ) -> List[product]:
         logger.info("Service layer - query_by_department_id method")
         oid = ObjectId(id)
-        products = self.product_ops.query_by_department_id(oid)
+        products = self.product_ops.query_by_department_id(oid, fields)
         products_list = [
-            self.convert_to_dict(product) for product in products
+            self.convert_to_dict(product, fields) for product in products
         ]
         return products_list
 
-    def query_by_unit_measure_id(self, id: str) -> List[product]:
+    @coalesced(PRODUCT_QUERIES)
+    def query_by_unit_measure_id(self, id: str,
+                                 fields: Optional[tuple] = None
+                                 ) -> List[product]:
         logger.info("Service layer - query_by_unit_measure_id method")
         oid = ObjectId(id)
-        products = self.product_ops.query_by_unit_measure_id(oid)
+        products = self.product_ops.query_by_unit_measure_id(oid, fields)
         products_list = [
-            self.convert_to_dict(product) for product in products
+            self.convert_to_dict(product, fields) for product in products
         ]
         return products_list
 
-    def query_by_name(self, name: str) -> List[dict]:
+    def query_by_name(self, name: str,
+                      fields: Optional[tuple] = None) -> List[dict]:
         logger.info("Service layer - query_by_name method")
-        departments = self.product_ops.query_by_name(name)
+        departments = self.product_ops.query_by_name(name, fields)
         department_list = [
-            self.convert_to_dict(department) for department in departments
+            self.convert_to_dict(department, fields)
+            for department in departments
         ]
         return department_list
 
-    def query_by_description(self, description: str) -> List[dict]:
+    def query_by_description(self, description: str,
+                             fields: Optional[tuple] = None) -> List[dict]:
         logger.info("Service layer - query_by_description method")
-        departments = self.product_ops.query_by_description(description)
+        departments = self.product_ops.query_by_description(description,
+                                                            fields)
         department_list = [
-            self.convert_to_dict(department) for department in departments
+            self.convert_to_dict(department, fields)
+            for department in departments
         ]
         return department_list
 
+    @coalesced(PRODUCT_QUERIES)
+    def query_by_filters(self, filters: dict,
+                         fields: Optional[tuple] = None) -> List[dict]:
+        logger.info("Service layer - query_by_filters method")
+        products = self.product_ops.query_by_filters(filters, fields)
+        return [self.convert_to_dict(product, fields) for product in products]
+
+    def query_page(self, filters: dict, sort_key: str, after: Optional[str],
+                   limit: int, fields: Optional[tuple] = None) -> dict:
+        logger.info("Service layer - query_page method")
+        position, query_fields = page_position(sort_key, after, fields)
+        products = self.product_ops.query_page(filters, sort_key, position,
+                                               limit + 1, query_fields)
+        return page_result(products, sort_key, limit, fields)
+
+    def version(self, filters: dict, id: Optional[str] = None
+                ) -> Tuple[int, Optional[datetime]]:
+        logger.info("Service layer - version method")
+        if id is not None:
+            filters = {"_id": ObjectId(id)}
+        return self.product_ops.version(filters)
+
+    def query_changes(self, since: Optional[str], limit: int,
+                      fields: Optional[tuple] = None) -> dict:
+        logger.info("Service layer - query_changes method")
+        now = timezone.now()
+        # The writes of the last seconds may still be in flight with older
+        # timestamps, they are returned by the next call.
+        until = now - timedelta(seconds=AppEnv.CHANGES_SETTLE_LAG)
+        if since:
+            positions, issued = decode_watermark(since)
+            if issued < now - timedelta(seconds=AppEnv.TOMBSTONE_RETENTION):
+                raise ExpiredWatermarkError(
+                    "The 'since' token expired, the whole catalog must be "
+                    "synchronized again.")
+            product_position = positions.get("products")
+            deleted_position = positions.get("deleted")
+        else:
+            # The first call returns the whole catalog, so only the
+            # deletions after it matter.
+            product_position = None
+            deleted_position = (until, ObjectId(b"\x00" * 12))
+        query_fields = fields
+        if fields is not None and "last_update" not in fields:
+            query_fields = fields + ("last_update",)
+        products = self.product_ops.query_page(
+            {"last_update__lte": until}, "last_update", product_position,
+            limit + 1, query_fields)
+        tombstones = self.product_ops.query_tombstones(
+            deleted_position, until, limit + 1)
+        has_more = len(products) > limit or len(tombstones) > limit
+        products, tombstones = products[:limit], tombstones[:limit]
+        if products:
+            product_position = (products[-1].last_update, products[-1]._id)
+        if tombstones:
+            deleted_position = (tombstones[-1].deleted_at, tombstones[-1]._id)
+        encoder = PRODUCT_ENCODER.subset(fields)
+        return {
+            "changes": [encoder.from_model(p) for p in products],
+            "deleted": [
+                {"_id": tombstone.product_id,
+                 "deleted_at": tombstone.deleted_at}
+                for tombstone in tombstones
+            ],
+            "next": encode_watermark({"products": product_position,
+                                      "deleted": deleted_position}, now),
+            "has_more": has_more
+        }
+
+    def iterate(self, filters: dict,
+                fields: Optional[tuple] = None) -> Iterator[dict]:
+        logger.info("Service layer - iterate method")
+        products = self.product_ops.iterate(filters,
+                                            AppEnv.STREAM_BATCH_SIZE, fields)
+        return (self.convert_to_dict(product, fields) for product in products)
+
+    def search(self, text: str, limit: int,
+               fields: Optional[tuple] = None) -> List[dict]:
+        logger.info("Service layer - search method")
+        if not text or not text.strip():
+            raise ValueError("The 'q' parameter is required.")
+        encoder = PRODUCT_ENCODER.subset(fields)
+        results = []
+        for document in self.product_ops.search(text, limit, fields):
+            result = encoder.from_document(document)
+            result["score"] = document["score"]
+            results.append(result)
+        return results
+
     def delete(self, id: str) -> bool:
         logger.info("Services layer -delete method:::")
         oid = ObjectId(id)
-        return self.product_ops.delete(oid)
+        deleted = self.product_ops.delete(oid)
+        if deleted is None:
+            return False
+        products_changed.send(sender=self.__class__,
+                              products=[changed_product(deleted)])
+        return True
+
+    def bulk_delete(self, filters: dict, dry_run: bool = False) -> dict:
+        logger.info("Services layer - bulk_delete method:::")
+        # Without criteria the whole collection would be deleted.
+        if not filters:
+            raise ValueError("The ids or at least one filter are required.")
+        if dry_run:
+            return {
+                "matched": self.product_ops.count(filters),
+                "deleted": 0,
+                "dry_run": True
+            }
+        deleted = self.product_ops.delete_many(filters)
+        if deleted:
+            products_changed.send(sender=self.__class__, products=None)
+        return {
+            "matched": deleted,
+            "deleted": deleted,
+            "dry_run": False
+        }
+
+    def adjust_stock(self, rows: List, allow_negative: bool = False) -> dict:
+        logger.info("Service Layer - adjust_stock method:::")
+        results: list = [None] * len(rows)
+        pending = []
+        for index, row in enumerate(rows):
+            try:
+                pending.append((index, *self.parse_adjustment(row)))
+            except ValueError as e:
+                results[index] = {"index": index, "code": 400,
+                                  "error": str(e)}
+
+        # The increments of different products are independent round trips,
+        # so they are sent at the same time. The ones of the same product
+        # are applied in the order of the request.
+        by_product: Dict[ObjectId, list] = {}
+        for index, oid, delta in pending:
+            by_product.setdefault(oid, []).append(delta)
+        adjusted_products = run_concurrently(self.executor, [
+            partial(self.adjust_product_stock, oid, deltas, allow_negative)
+            for oid, deltas in by_product.items()
+        ])
+        product_records = {oid: iter(records) for oid, records
+                           in zip(by_product, adjusted_products)}
+        records = [next(product_records[oid])
+                   for index, oid, delta in pending]
+        not_updated = [oid for (index, oid, delta), record
+                       in zip(pending, records) if record is None]
+        current = {}
+        if not_updated:
+            # A record that exists was not updated by the stock guard.
+            current = {
+                p._id: p.quantity for p in self.product_ops.query_by_filters(
+                    {"_id__in": not_updated}, ("_id", "quantity"))
+            }
+
+        adjusted = 0
+        changed = {}
+        for (index, oid, delta), record in zip(pending, records):
+            if isinstance(record, Exception):
+                results[index] = {"index": index, "_id": str(oid),
+                                  "code": 500, "error": str(record)}
+            elif record is not None:
+                adjusted += 1
+                changed[oid] = changed_product(record)
+                results[index] = {"index": index, "_id": str(oid),
+                                  "code": 200, "quantity": record.quantity}
+            elif oid in current:
+                results[index] = {"index": index, "_id": str(oid),
+                                  "code": 409,
+                                  "quantity": current[oid] or 0,
+                                  "error": "The quantity can not be "
+                                           "negative."}
+            else:
+                results[index] = {"index": index, "_id": str(oid),
+                                  "code": 404,
+                                  "error": "product matching query does "
+                                           "not exist."}
+        if changed:
+            products_changed.send(sender=self.__class__,
+                                  products=list(changed.values()))
+        return {
+            "adjusted": adjusted,
+            "failed": len(rows) - adjusted,
+            "results": results
+        }
+
+    def adjust_product_stock(self, oid: ObjectId, deltas: List[int],
+                             allow_negative: bool
+                             ) -> List[Union[Optional[product], Exception]]:
+        """
+        This method applies the deltas of a product in order. A delta that
+        fails does not stop the others, its exception is returned in its
+        place, so the increments already written are still reported and a
+        retry of the failed records does not apply them twice.
+        :return: The record returned by each delta, see
+        ProductOps.adjust_stock.
+        """
+        records = []
+        for delta in deltas:
+            try:
+                records.append(self.product_ops.adjust_stock(
+                    oid, delta, allow_negative))
+            except Exception as e:
+                logger.error(f"The stock of {oid} was not adjusted:"
+                             f"{str(e)}")
+                records.append(e)
+        return records
+
+    def parse_adjustment(self, row: Any) -> Tuple[ObjectId, int]:
+        if not isinstance(row, dict):
+            raise ValueError("Each record must be an object.")
+        if row.get("_id") is None:
+            raise ValueError("The '_id' field is required.")
+        delta = row.get("delta")
+        # bool is a subclass of int.
+        if isinstance(delta, bool) or not isinstance(delta, int):
+            raise ValueError("The 'delta' field must be an integer.")
+        return ObjectId(parse_object_id("_id", row["_id"])), delta
 
     def update(self, data: dict, id: str) -> dict:
         logger.info("Serice Layer -update method:::")
+        # The fields sent as null keep their value.
+        changes = {field: value for field, value in data.items()
+                   if value is not None}
+        updated, previous = self.product_ops.partial_update(ObjectId(id),
+                                                            changes)
+        update_product = self.convert_to_dict(updated)
+        self.notify_update(update_product, previous)
+        return update_product
+
+    def partial_update(self, data: dict, id: str) -> dict:
+        logger.info("Service Layer - partial_update method:::")
+        if not data:
+            raise ValueError("The body does not contain any field.")
         oid = ObjectId(id)
-        get_product = self.product_ops.query_by_id(oid)
-        name = data.get("name")
-        if name is not None:
-            get_product.name = name
-        description = data.get("description")
-        if description is not None:
-            get_product.description = description
-        quantity = data.get("quantity")
-        if quantity is not None:
-            get_product.quantity = quantity
-        url_picture = data.get("url_picture")
-        if url_picture is not None:
-            get_product.url_picture = url_picture
-        location = data.get("location")
-        if location is not None:
-            get_product.location = location
-        lot_flag = data.get("lot_flag")
-        if lot_flag is not None:
-            get_product.lot_flag = lot_flag
-        price_lot_flag = data.get("price_lot_flag")
-        if price_lot_flag is not None:
-            get_product.price_lot_flag = price_lot_flag
-        alert_minimum_stock_flag = data.get("alert_minimum_stock_flag")
-        if alert_minimum_stock_flag is not None:
-            get_product.alert_minimum_stock_flag = alert_minimum_stock_flag
-        alert_expiration_date_flag = data.get("alert_expiration_date_flag")
-        if alert_expiration_date_flag is not None:
-            get_product.alert_expiration_date_flag = alert_expiration_date_flag
-        comments = data.get("comments")
-        if comments is not None:
-            get_product.comments = comments
-        department_id = data.get("department_id")
-        if department_id is not None:
-            get_product.department_id = department_id
-        unit_measure_id = data.get("unit_measure_id")
-        if unit_measure_id is not None:
-            get_product.unit_measure_id = unit_measure_id
-        update_product = self.product_ops.update(get_product)
-        return self.convert_to_dict(update_product)
-
-    def convert_to_dict(self, object_model: product):
-
-        object_dict = {
-            '_id': str(object_model._id),
-            'name': object_model.name,
-            'description': object_model.description,
-            'quantity': object_model.quantity,
-            'url_picture': object_model.url_picture,
-            'location': object_model.location,
-            'lot_flag': object_model.lot_flag,
-            'price_lot_flag': object_model.price_lot_flag,
-            'alert_minimum_stock_flag': object_model.alert_minimum_stock_flag,
-            'alert_expiration_date_flag':
-                object_model.alert_expiration_date_flag,
-            'comments': object_model.comments,
-            'date': object_model.formatted_date(),
-            'last_update': object_model.formatted_last_update(),
-            'department_id': object_model.department_id,
-            'unit_measure_id': object_model.unit_measure_id
+        error = self.validate_references(data.get("unit_measure_id"),
+                                         data.get("department_id"))
+        if error is not None:
+            return error
+        updated, previous = self.product_ops.partial_update(oid, data)
+        update_product = self.convert_to_dict(updated)
+        self.notify_update(update_product, previous)
+        return {
+            "code": 200,
+            "product": update_product
         }
-        return object_dict
+
+    def notify_update(self, product: dict, previous: dict):
+        """
+        This method signals an update. When the references changed, the
+        listings of the previous ones are also affected.
+        :param previous: The references of the record before the update.
+        """
+        products = [product]
+        if any(product.get(field) != previous.get(field)
+               for field in ProductOps.REFERENCE_FIELDS):
+            products.append(dict(previous, _id=product["_id"]))
+        products_changed.send(sender=self.__class__, products=products)
+
+    def convert_to_dict(self, object_model: product,
+                        fields: Optional[tuple] = None):
+        return PRODUCT_ENCODER.subset(fields).from_model(object_model)
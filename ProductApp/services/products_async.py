@@ -0,0 +1,130 @@
+import abc
+import asyncio
+from typing import List, Optional
+
+from bson import ObjectId
+from injector import inject
+
+from ProductApp.components.async_reference_request import \
+    AsyncDepartmentRequest, AsyncUnitMeasureRequest
+from ProductApp.components.product_async_ops import ProductAsyncOps
+from ProductApp.serializer import PRODUCT_ENCODER
+from ProductApp.services.products import changed_product, \
+    page_position, page_result
+from ProductApp.signals import products_changed
+from ProductManagementService.logger import logger
+
+
+class ProductAsyncService(abc.ABC):
+    """
+    This interface defines the business logic used by the async views,
+    every method is a coroutine.
+    """
+
+    @abc.abstractmethod
+    async def create(self, data: dict) -> dict:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def query_by_id(self, id: str,
+                          fields: Optional[tuple] = None) -> dict:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def query_by_filters(self, filters: dict,
+                               fields: Optional[tuple] = None
+                               ) -> List[dict]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def query_page(self, filters: dict, sort_key: str,
+                         after: Optional[str], limit: int,
+                         fields: Optional[tuple] = None) -> dict:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, id: str) -> bool:
+        raise NotImplementedError
+
+
+class ProductMotorService(ProductAsyncService):
+    """
+    Concrete class implements the methods of the 'ProductAsyncService'
+    interface over the ProductAsyncOps operations.
+    """
+
+    @inject
+    def __init__(self, product_ops: ProductAsyncOps,
+                 unitmeasure_ops: AsyncUnitMeasureRequest,
+                 department_ops: AsyncDepartmentRequest):
+        self.product_ops = product_ops
+        self.unitmeasure_ops = unitmeasure_ops
+        self.department_ops = department_ops
+
+    async def create(self, data: dict) -> dict:
+        logger.info("Service Layer - async create method")
+        error = await self.validate_references(data.get("unit_measure_id"),
+                                               data.get("department_id"))
+        if error is not None:
+            return error
+        product = PRODUCT_ENCODER.from_model(
+            await self.product_ops.create(data))
+        products_changed.send(sender=self.__class__, products=[product])
+        return {
+            "code": 201,
+            "product": product
+        }
+
+    async def validate_references(self, unit_measure_id: Optional[str],
+                                  department_id: Optional[str]
+                                  ) -> Optional[dict]:
+        """
+        This method awaits both checks at the same time, the error of the
+        unit measure is returned first as in the sync service.
+        :return: None if both exist, otherwise the code and message of the
+        failed check.
+        """
+        checks = []
+        if unit_measure_id is not None:
+            checks.append(self.unitmeasure_ops.query_by_id(
+                str(unit_measure_id)))
+        if department_id is not None:
+            checks.append(self.department_ops.query_by_id(
+                str(department_id)))
+        for response in await asyncio.gather(*checks):
+            if not response.ok:
+                return {
+                    "code": response.status_code,
+                    "message": response.text
+                }
+        return None
+
+    async def query_by_id(self, id: str,
+                          fields: Optional[tuple] = None) -> dict:
+        logger.info("Service layer - async query_by_id method")
+        product = await self.product_ops.query_by_id(ObjectId(id), fields)
+        return PRODUCT_ENCODER.subset(fields).from_model(product)
+
+    async def query_by_filters(self, filters: dict,
+                               fields: Optional[tuple] = None
+                               ) -> List[dict]:
+        logger.info("Service layer - async query_by_filters method")
+        encoder = PRODUCT_ENCODER.subset(fields)
+        products = await self.product_ops.query_by_filters(filters, fields)
+        return [encoder.from_model(product) for product in products]
+
+    async def query_page(self, filters: dict, sort_key: str,
+                         after: Optional[str], limit: int,
+                         fields: Optional[tuple] = None) -> dict:
+        logger.info("Service layer - async query_page method")
+        position, query_fields = page_position(sort_key, after, fields)
+        products = await self.product_ops.query_page(
+            filters, sort_key, position, limit + 1, query_fields)
+        return page_result(products, sort_key, limit, fields)
+
+    async def delete(self, id: str) -> bool:
+        logger.info("Services layer - async delete method:::")
+        deleted = await self.product_ops.delete(ObjectId(id))
+        products_changed.send(sender=self.__class__,
+                              products=[changed_product(deleted)])
+        return True
@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+# Sent after products are created, updated or deleted. The 'products'
+# argument lists the written products as dictionaries with their '_id',
+# 'department_id' and 'unit_measure_id', or is None when they are not
+# known, e.g. after a bulk delete or a change of department.
+products_changed = Signal()
@@ -1,3 +1,1555 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from unittest import mock
 
-# Create your tests here.
+import requests
+from bson import ObjectId
+from injector import Module
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import BulkWriteError, OperationFailure
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from django.apps import apps
+from django.http import HttpResponse, QueryDict
+from django.test import RequestFactory, SimpleTestCase
+
+from DepartmentApp.models import Department
+from DepartmentApp.signals import department_changed
+from DepartmentApp.services.departments import DepartmentsMongoService
+from ProductApp.components.department_api_request import \
+    DepartmentApiRequest, DepartmentServiceRequest
+from ProductApp.components import product_ops
+from ProductApp.components import reference_cache
+from ProductApp.components.reference_cache import CachedDepartmentRequest
+from ProductApp.components.reference_response import ReferenceResponse
+from ProductApp.components.product_ops import ProductOps, \
+    ProductOpsMongo, page_query
+from ProductApp.exceptions import ExpiredWatermarkError, \
+    MissingIndexError
+from ProductApp.filters import ProductFilter
+from ProductApp.models import ProductTombstone, product
+from ProductApp.serializer import PRODUCT_ENCODER
+from ProductApp import response_tags
+from ProductApp.services import products
+from ProductApp.services.products import PRODUCT_QUERIES, \
+    ProductMongoService, page_position, page_result
+from ProductApp.signals import products_changed
+from ProductApp.services.products_async import ProductAsyncService, \
+    ProductMotorService
+from ProductApp.views import ProductAPIView, ProductAsyncAPIView, \
+    ProductBulkDeleteAPIView, ProductChangesAPIView, ProductSearchAPIView
+from ProductManagementService import concurrency, http_client, mongo, \
+    response_cache
+from ProductManagementService.compression import CompressionMiddleware
+from ProductManagementService.bulk import batches, read_rows
+from ProductManagementService import cache
+from ProductManagementService.cache import ResponseCache, TTLCache
+from ProductManagementService.concurrency import SingleFlight, coalesced
+from ProductManagementService.conditional import conditional_get, make_etag
+from ProductManagementService.env import AppEnv
+from ProductManagementService.http_client import CircuitBreaker, \
+    CircuitOpenError, HttpClient
+from ProductManagementService.indexes import IndexSpec, sync_collection
+from ProductManagementService.mongo import lookups_to_query, \
+    set_fields, set_fields_with_previous
+from ProductManagementService.pagination import decode_cursor, \
+    decode_watermark, encode_cursor, encode_watermark, parse_limit
+from ProductManagementService.streaming import stream_format, \
+    streaming_response
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(http_client.time, "monotonic",
+                                    lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    def open_circuit(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.stats()["rejected"], 1)
+
+    def test_success_resets_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_opens_after_reset_timeout(self):
+        self.open_circuit()
+        self.now += 29
+        self.assertFalse(self.breaker.allow())
+        self.now += 1
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        # A single trial call is let through.
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_closes_on_success(self):
+        self.open_circuit()
+        self.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+        self.assertTrue(self.breaker.allow())
+
+    def test_half_open_reopens_on_failure(self):
+        self.open_circuit()
+        self.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.stats()["times_opened"], 2)
+
+
+class HttpClientTests(SimpleTestCase):
+
+    def setUp(self):
+        self.client = HttpClient(
+            retries=0, breaker=CircuitBreaker(failure_threshold=2,
+                                              reset_timeout=30))
+
+    def test_failed_requests_open_the_circuit(self):
+        with mock.patch.object(self.client.session, "get",
+                               side_effect=requests.ConnectionError):
+            for _ in range(2):
+                with self.assertRaises(requests.ConnectionError):
+                    self.client.get("http://departments/")
+            with self.assertRaises(CircuitOpenError):
+                self.client.get("http://departments/")
+            self.assertEqual(self.client.session.get.call_count, 2)
+
+    def test_server_errors_count_as_failures(self):
+        response = mock.Mock(status_code=500)
+        with mock.patch.object(self.client.session, "get",
+                               return_value=response):
+            self.client.get("http://departments/")
+            self.client.get("http://departments/")
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.OPEN)
+
+    def test_unexpected_error_in_the_trial_reopens_the_circuit(self):
+        now = [1000.0]
+        self.client.breaker.record_failure()
+        self.client.breaker.record_failure()
+        with mock.patch.object(http_client.time, "monotonic",
+                               lambda: now[0]), \
+                mock.patch.object(self.client.session, "get",
+                                  side_effect=ValueError("bad url")):
+            self.client.breaker.opened_at = now[0]
+            now[0] += 30
+            with self.assertRaises(ValueError):
+                self.client.get("http://departments/")
+            self.assertEqual(self.client.breaker.state, CircuitBreaker.OPEN)
+            now[0] += 30
+            self.assertTrue(self.client.breaker.allow())
+
+    def test_open_circuit_returns_service_unavailable(self):
+        department_request = DepartmentApiRequest()
+        department_request.client = self.client
+        self.client.breaker.record_failure()
+        self.client.breaker.record_failure()
+        with mock.patch.object(self.client.session, "get") as get:
+            response = department_request.query_by_id("id")
+        get.assert_not_called()
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.ok)
+        self.assertIn("unavailable", response.text)
+
+
+class RunConcurrentlyTests(SimpleTestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_results_keep_the_order_of_the_calls(self):
+        release = threading.Event()
+
+        def slow():
+            release.wait(5)
+            return 1
+
+        def fast():
+            release.set()
+            return 2
+
+        results = concurrency.run_concurrently(self.executor, [slow, fast])
+        self.assertEqual(results, [1, 2])
+
+    def test_first_error_in_the_order_of_the_calls_is_raised(self):
+        def fail(message):
+            raise ValueError(message)
+
+        with self.assertRaisesMessage(ValueError, "unit measure"):
+            concurrency.run_concurrently(self.executor, [
+                lambda: fail("unit measure"), lambda: fail("department")])
+
+
+def stock(oid: ObjectId, quantity: int) -> product:
+    return product(_id=oid, quantity=quantity, department_id="d1",
+                   unit_measure_id="u1")
+
+
+class AdjustStockTests(SimpleTestCase):
+
+    def setUp(self):
+        self.product_ops = mock.Mock(spec=ProductOps)
+        self.product_ops.query_by_filters.return_value = []
+        self.service = ProductMongoService(self.product_ops, None, None)
+        self.failing, self.healthy = ObjectId(), ObjectId()
+
+    def test_failed_product_does_not_fail_the_batch(self):
+        def adjust_stock(oid, delta, allow_negative):
+            if oid == self.failing:
+                raise RuntimeError("not primary")
+            return stock(oid, 10 + delta)
+
+        self.product_ops.adjust_stock.side_effect = adjust_stock
+        result = self.service.adjust_stock([
+            {"_id": str(self.failing), "delta": 1},
+            {"_id": str(self.healthy), "delta": 2},
+            {"_id": str(self.healthy), "delta": 3},
+        ])
+        self.assertEqual(result["adjusted"], 2)
+        self.assertEqual(result["failed"], 1)
+        self.assertEqual([item["code"] for item in result["results"]],
+                         [500, 200, 200])
+        self.assertEqual(result["results"][0]["error"], "not primary")
+        self.assertEqual(result["results"][2]["quantity"], 13)
+
+    def test_failed_delta_does_not_stop_the_next_ones(self):
+        self.product_ops.adjust_stock.side_effect = [
+            RuntimeError("timeout"), stock(self.healthy, 7)]
+        result = self.service.adjust_stock([
+            {"_id": str(self.healthy), "delta": 1},
+            {"_id": str(self.healthy), "delta": 2},
+        ])
+        self.assertEqual([item["code"] for item in result["results"]],
+                         [500, 200])
+        self.assertEqual(self.product_ops.adjust_stock.call_count, 2)
+
+    def test_rejected_null_quantity_is_reported_as_zero(self):
+        self.product_ops.adjust_stock.return_value = None
+        self.product_ops.query_by_filters.return_value = [
+            mock.Mock(_id=self.healthy, quantity=None)]
+        result = self.service.adjust_stock([
+            {"_id": str(self.healthy), "delta": -1}])
+        self.assertEqual(result["results"][0]["code"], 409)
+        self.assertEqual(result["results"][0]["quantity"], 0)
+
+
+def wait_for(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("The condition was not met in time.")
+        time.sleep(0.001)
+
+
+class BlockedCall:
+    """
+    A function that blocks until it is released, it counts its runs.
+    """
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.runs = 0
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.runs += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def start_calls(flight: SingleFlight, key, function, count: int) -> tuple:
+    """
+    This function calls the flight from count threads and waits until all
+    of them joined, it returns the list the outcomes are added to and the
+    threads.
+    """
+    outcomes = []
+    lock = threading.Lock()
+
+    def call():
+        try:
+            outcome = flight.do(key, function)
+        except Exception as e:
+            outcome = e
+        with lock:
+            outcomes.append(outcome)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    calls = flight.stats()["calls"]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: flight.stats()["calls"] == calls + count)
+    return outcomes, threads
+
+
+class SingleFlightTests(SimpleTestCase):
+
+    def setUp(self):
+        self.flight = SingleFlight()
+
+    def join(self, threads):
+        for thread in threads:
+            thread.join(5)
+
+    def test_concurrent_calls_share_the_result(self):
+        function = BlockedCall(result=["a"])
+        outcomes, threads = start_calls(self.flight, "key", function, 5)
+        function.release.set()
+        self.join(threads)
+        self.assertEqual(function.runs, 1)
+        self.assertEqual(outcomes, [["a"]] * 5)
+        stats = self.flight.stats()
+        self.assertEqual((stats["shared"], stats["in_flight"]), (4, 0))
+
+    def test_waiters_receive_the_exception_of_the_leader(self):
+        error = RuntimeError("not primary")
+        function = BlockedCall(error=error)
+        outcomes, threads = start_calls(self.flight, "key", function, 3)
+        function.release.set()
+        self.join(threads)
+        self.assertEqual(function.runs, 1)
+        self.assertEqual(outcomes, [error] * 3)
+
+    def test_calls_after_the_first_one_finished_run_again(self):
+        self.assertEqual(self.flight.do("key", lambda: 1), 1)
+        self.assertEqual(self.flight.do("key", lambda: 2), 2)
+
+    def test_forget_stops_sharing_the_call_in_progress(self):
+        function = BlockedCall(result="before")
+        outcomes, threads = start_calls(self.flight, "key", function, 1)
+        self.flight.forget()
+        self.assertEqual(self.flight.do("key", lambda: "after"), "after")
+        function.release.set()
+        self.join(threads)
+        self.assertEqual(outcomes, ["before"])
+
+
+class Listing:
+    """
+    A service whose listing records the arguments of its calls.
+    """
+
+    flight = SingleFlight()
+
+    def __init__(self):
+        self.calls = []
+
+    @coalesced(flight)
+    def query_all(self, fields=None):
+        self.calls.append(fields)
+        return fields
+
+
+class CoalescedTests(SimpleTestCase):
+
+    def test_arguments_are_part_of_the_key(self):
+        service = Listing()
+        with mock.patch.object(Listing.flight, "do",
+                               wraps=Listing.flight.do) as do:
+            service.query_all(("name",))
+            service.query_all(fields=("name",))
+        keys = [call.args[0] for call in do.call_args_list]
+        self.assertNotEqual(keys[0], keys[1])
+        self.assertEqual(service.calls, [("name",), ("name",)])
+
+    def test_disabled_coalescing_calls_the_method(self):
+        service = Listing()
+        with mock.patch.object(AppEnv, "QUERY_COALESCING", False), \
+                mock.patch.object(Listing.flight, "do") as do:
+            self.assertEqual(service.query_all(("name",)), ("name",))
+        do.assert_not_called()
+
+    def test_product_write_forgets_the_queries_in_progress(self):
+        function = BlockedCall()
+        outcomes, threads = start_calls(PRODUCT_QUERIES, "products",
+                                        function, 1)
+        self.assertEqual(PRODUCT_QUERIES.stats()["in_flight"], 1)
+        products_changed.send(sender=None, products=None)
+        self.assertEqual(PRODUCT_QUERIES.stats()["in_flight"], 0)
+        function.release.set()
+        for thread in threads:
+            thread.join(5)
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+
+    content = b'{"name":"Sparkling water"}' * 100
+
+    def setUp(self):
+        patcher = mock.patch.object(AppEnv, "COMPRESSION_ENCODINGS", "gzip")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.request = RequestFactory().get("/products/",
+                                            HTTP_ACCEPT_ENCODING="gzip")
+
+    def response(self, request):
+        return HttpResponse(self.content, content_type="application/json")
+
+    def assertCompressed(self, response):
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), self.content)
+
+    def test_compresses_in_the_sync_path(self):
+        middleware = CompressionMiddleware(self.response)
+        self.assertCompressed(middleware(self.request))
+
+    def test_compresses_in_the_async_path(self):
+        async def response(request):
+            return self.response(request)
+
+        middleware = CompressionMiddleware(response)
+        result = middleware(self.request)
+        self.assertTrue(asyncio.iscoroutine(result))
+        self.assertCompressed(asyncio.run(result))
+
+
+class ProductFilterTests(SimpleTestCase):
+
+    def test_parameters_become_lookups(self):
+        department_id = str(ObjectId())
+        lookups = ProductFilter(QueryDict(
+            f"name=water&department_id={department_id}&quantity__lte=5"
+            f"&lot_flag=false&limit=10&fields=name")).lookups
+        self.assertEqual(lookups, {
+            "department_id": department_id,
+            "quantity__lte": 5,
+            "lot_flag": False,
+            "name__icontains": "water",
+        })
+
+    def test_without_parameters_the_filter_is_empty(self):
+        self.assertFalse(ProductFilter(QueryDict("limit=10")))
+
+    def test_invalid_values_are_rejected(self):
+        for query in ("department_id=1", "quantity=many", "lot_flag=yes",
+                      "date__gte=today", "name=%20", "_id__in=,"):
+            with self.subTest(query=query), self.assertRaises(ValueError):
+                ProductFilter(QueryDict(query))
+
+    def test_naive_dates_are_utc(self):
+        lookups = ProductFilter(QueryDict(
+            "date__gte=2024-01-02T03:04:05")).lookups
+        self.assertEqual(lookups["date__gte"].isoformat(),
+                         "2024-01-02T03:04:05+00:00")
+
+
+class SyncIndexesTests(SimpleTestCase):
+
+    def setUp(self):
+        self.collection = mock.Mock()
+        self.collection.name = "ProductApp_product"
+        self.spec = IndexSpec(name="name_1",
+                              keys=(("name", ASCENDING),))
+
+    def statuses(self, indexes: dict, **options) -> dict:
+        self.collection.index_information.return_value = indexes
+        return {report.name: report.status for report in
+                sync_collection(self.collection, (self.spec,), **options)}
+
+    def test_missing_index_is_created(self):
+        self.assertEqual(self.statuses({}), {"name_1": "created"})
+        self.collection.create_index.assert_called_once_with(
+            [("name", ASCENDING)], name="name_1")
+
+    def test_check_only_reports_the_missing_index(self):
+        self.assertEqual(self.statuses({}, apply=False),
+                         {"name_1": "missing"})
+        self.collection.create_index.assert_not_called()
+
+    def test_drifted_index_is_rebuilt(self):
+        statuses = self.statuses({"name_1": {"key": [("name", ASCENDING)],
+                                             "unique": True}})
+        self.assertEqual(statuses, {"name_1": "rebuilt"})
+        self.collection.drop_index.assert_called_once_with("name_1")
+
+    def test_drop_extra_keeps_the_indexes_of_mongo_and_djongo(self):
+        statuses = self.statuses({
+            "_id_": {"key": [("_id", ASCENDING)]},
+            "__primary_key__": {"key": [("id", ASCENDING)],
+                                "unique": True},
+            "name_1": {"key": [("name", ASCENDING)]},
+            "old_1": {"key": [("old", ASCENDING)]},
+        }, drop_extra=True)
+        self.assertEqual(statuses, {"name_1": "ok", "old_1": "dropped"})
+        self.collection.drop_index.assert_called_once_with("old_1")
+
+
+class SearchTests(SimpleTestCase):
+
+    def search_view(self, service, **params):
+        view = ProductSearchAPIView(service)
+        request = APIRequestFactory().get("/products/search/", params)
+        view.setup(request)
+        return view.dispatch(request)
+
+    def test_results_are_ranked_by_text_score(self):
+        collection = mock.MagicMock()
+        with mock.patch.object(product_ops, "get_collection",
+                               return_value=collection):
+            ProductOpsMongo().search("water", 10, ("_id", "name"))
+        collection.find.assert_called_once_with(
+            {"$text": {"$search": "water"}},
+            {"score": {"$meta": "textScore"}, "_id": True, "name": True})
+        collection.find.return_value.sort.assert_called_once_with(
+            [("score", {"$meta": "textScore"})])
+        collection.find.return_value.sort.return_value.limit \
+            .assert_called_once_with(10)
+
+    def test_score_is_returned_with_the_requested_fields(self):
+        ops = mock.Mock(spec=ProductOps)
+        ops.search.return_value = [
+            {"_id": 1, "name": "water", "score": 11.5},
+            {"_id": 2, "name": "sparkling water", "score": 7.0}]
+        service = ProductMongoService(ops, mock.Mock(), mock.Mock())
+        self.assertEqual(service.search("water", 5, ("_id", "name")), [
+            {"_id": 1, "name": "water", "score": 11.5},
+            {"_id": 2, "name": "sparkling water", "score": 7.0}])
+
+    def test_text_is_required(self):
+        service = ProductMongoService(mock.Mock(spec=ProductOps),
+                                      mock.Mock(), mock.Mock())
+        for text in (None, "", "  "):
+            with self.assertRaisesMessage(ValueError, "'q'"):
+                service.search(text, 5)
+
+    def test_limit_is_bounded(self):
+        service = mock.Mock()
+        service.search.return_value = []
+        response = self.search_view(service, q="water",
+                                    limit=AppEnv.SEARCH_MAX_LIMIT + 1)
+        self.assertEqual(response.status_code, 200)
+        service.search.assert_called_once_with(
+            "water", AppEnv.SEARCH_MAX_LIMIT, None)
+
+    def test_missing_text_index_is_reported(self):
+        collection = mock.MagicMock()
+        cursor = collection.find.return_value.sort.return_value.limit
+        cursor.return_value.__iter__.side_effect = OperationFailure(
+            "text index required for $text query", code=27)
+        with mock.patch.object(product_ops, "get_collection",
+                               return_value=collection), \
+                self.assertRaisesMessage(MissingIndexError, "sync_indexes"):
+            ProductOpsMongo().search("water", 10)
+
+    def test_missing_text_index_returns_service_unavailable(self):
+        service = mock.Mock()
+        service.search.side_effect = MissingIndexError(
+            "run 'manage.py sync_indexes'.")
+        with self.assertLogs(level="ERROR"):
+            response = self.search_view(service, q="water")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn(b"sync_indexes", response.content)
+
+
+PRODUCT_ROW = {
+    "description": "Sparkling water", "quantity": 1, "url_picture": "",
+    "location": "Aisle 4", "lot_flag": False,
+    "alert_minimum_stock_flag": True, "alert_expiration_date_flag": False,
+    "comments": "", "department_id": "d1", "unit_measure_id": "u1",
+}
+
+
+class BulkUpdateTests(SimpleTestCase):
+
+    def setUp(self):
+        self.product_ops = mock.Mock(spec=ProductOps)
+        self.product_ops.count_by_key.return_value = {"water": 1,
+                                                      "soda": 2}
+        self.product_ops.query_by_filters.return_value = []
+        self.product_ops.bulk_update.side_effect = self.write
+        self.service = ProductMongoService(self.product_ops, mock.Mock(),
+                                           mock.Mock())
+        self.updates = []
+        # The write errors of each call, by position in the batch.
+        self.write_errors = []
+
+    def write(self, updates, upsert=False, ordered=False):
+        self.updates.extend(updates)
+        errors = self.write_errors.pop(0) if self.write_errors else {}
+        return {"matched": len(updates), "modified": len(updates),
+                "upserted": {}, "errors": errors}
+
+    def test_upsert_of_an_existing_record_only_sets_its_changes(self):
+        result = self.service.bulk_update(
+            [{"name": "water", "changes": {"quantity": 5}}], "name")
+        self.assertEqual(result["failed"], 0)
+        self.assertEqual(self.updates, [
+            ({"name": "water"}, {"name": "water", "quantity": 5}, {})])
+
+    def test_upsert_of_a_new_record_inserts_the_defaults(self):
+        result = self.service.bulk_update(
+            [{"name": "juice", "changes": PRODUCT_ROW}], "name")
+        self.assertEqual(result["failed"], 0)
+        selector, changes, defaults = self.updates[0]
+        self.assertNotIn("price_lot_flag", changes)
+        self.assertEqual(defaults, {"price_lot_flag": False})
+
+    def test_upsert_of_an_incomplete_new_record_is_rejected(self):
+        result = self.service.bulk_update(
+            [{"name": "juice", "changes": {"quantity": 5}}], "name")
+        self.assertEqual(result["errors"][0]["code"], 400)
+        self.assertIn("department_id", result["errors"][0]["error"])
+        self.assertEqual(self.updates, [])
+
+    def test_upsert_key_matching_many_records_is_rejected(self):
+        result = self.service.bulk_update(
+            [{"name": "soda", "changes": {"quantity": 5}}], "name")
+        self.assertEqual(result["errors"][0]["code"], 409)
+        self.assertEqual(self.updates, [])
+
+    def test_ordered_update_skips_the_records_after_the_error(self):
+        rows = [{"_id": str(ObjectId()), "changes": {"quantity": i}}
+                for i in range(5)]
+        self.write_errors = [{}, {0: {"code": 2, "errmsg": "failed"}}]
+        with mock.patch.object(products, "batches",
+                               partial(batches, size=2)):
+            result = self.service.bulk_update(rows, ordered=True)
+        # The first batch is written, the second fails at its first record.
+        self.assertEqual(len(self.updates), 4)
+        self.assertEqual(result["errors"][0]["index"], 2)
+        self.assertEqual(result["skipped"], 2)
+        self.assertEqual(len(result["batches"]), 2)
+
+    def test_upsert_defaults_are_only_set_on_insert(self):
+        collection = mock.Mock()
+        collection.bulk_write.return_value.bulk_api_result = {
+            "nMatched": 1, "nModified": 1, "upserted": [],
+            "writeErrors": []}
+        with mock.patch.object(product_ops, "get_collection",
+                               return_value=collection):
+            ProductOpsMongo().bulk_update(
+                [({"name": "juice"}, {"name": "juice", "quantity": 5},
+                  {"price_lot_flag": False})], upsert=True)
+        update = collection.bulk_write.call_args.args[0][0]._doc
+        self.assertEqual(set(update["$set"]),
+                         {"name", "quantity", "last_update"})
+        self.assertFalse(update["$setOnInsert"]["price_lot_flag"])
+        self.assertIn("date", update["$setOnInsert"])
+        self.assertFalse(set(update["$set"]) & set(update["$setOnInsert"]))
+
+
+LISTING_TAGS = ("products", "products:department:d1",
+                "products:department:d2", "products:department:d3",
+                "products:unit_measure:u1")
+
+
+class ProductInvalidationTests(SimpleTestCase):
+
+    def setUp(self):
+        cache = ResponseCache(max_bytes=1000, ttl=60, max_entry_bytes=100)
+        patcher = mock.patch.object(response_cache, "RESPONSE_CACHE", cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = cache
+        self.product_ops = mock.Mock(spec=ProductOps)
+        self.product_ops.query_by_filters.return_value = []
+        self.service = ProductMongoService(self.product_ops, mock.Mock(),
+                                           mock.Mock())
+        self.id = ObjectId()
+        for tag in LISTING_TAGS + (f"product:{self.id}",):
+            cache.set(tag, tag, 1, (tag,), cache.generation)
+
+    def cached(self) -> set:
+        return {tag for tag in LISTING_TAGS
+                if self.cache.get(tag)[0] is not None}
+
+    def updated(self, **references) -> product:
+        return product(_id=self.id, name="water", quantity=1,
+                       **dict({"department_id": "d1",
+                               "unit_measure_id": "u1"}, **references))
+
+    def test_update_with_the_same_references_keeps_other_listings(self):
+        self.product_ops.partial_update.return_value = (
+            self.updated(), {"department_id": "d1", "unit_measure_id": "u1"})
+        self.service.update({"name": "water", "department_id": "d1",
+                             "unit_measure_id": "u1"}, str(self.id))
+        self.assertEqual(self.cached(), {"products:department:d2",
+                                         "products:department:d3"})
+
+    def test_update_that_moves_the_product_invalidates_both_listings(self):
+        self.product_ops.partial_update.return_value = (
+            self.updated(department_id="d2"),
+            {"department_id": "d1", "unit_measure_id": "u1"})
+        self.service.update({"department_id": "d2"}, str(self.id))
+        self.assertEqual(self.cached(), {"products:department:d3"})
+
+    def test_delete_invalidates_the_listings_of_its_references(self):
+        self.product_ops.delete.return_value = self.updated(
+            unit_measure_id="u2")
+        self.assertTrue(self.service.delete(str(self.id)))
+        self.assertEqual(self.cached(), {"products:department:d2",
+                                         "products:department:d3",
+                                         "products:unit_measure:u1"})
+
+    def test_stock_adjustment_invalidates_the_listings_of_its_references(self):
+        self.product_ops.adjust_stock.return_value = stock(self.id, 4)
+        self.service.adjust_stock([{"_id": str(self.id), "delta": -1}])
+        self.assertEqual(self.cached(), {"products:department:d2",
+                                         "products:department:d3"})
+        self.assertIsNone(self.cache.get(f"product:{self.id}")[0])
+
+    def test_bulk_update_invalidates_the_previous_and_new_references(self):
+        self.product_ops.query_by_filters.return_value = [self.updated()]
+        self.product_ops.bulk_update.return_value = {
+            "matched": 1, "modified": 1, "upserted": {}, "errors": {}}
+        self.service.bulk_update([{"_id": str(self.id),
+                                   "changes": {"department_id": "d2"}}])
+        self.assertEqual(self.cached(), {"products:department:d3"})
+        self.assertEqual(
+            self.product_ops.query_by_filters.call_args.args,
+            ({"_id__in": [self.id]},
+             ("_id", "department_id", "unit_measure_id")))
+
+
+def reference_response(status_code: int, text: str = "") -> mock.Mock:
+    return mock.Mock(status_code=status_code, ok=status_code < 400,
+                     text=text)
+
+
+class ProductMotorServiceTests(SimpleTestCase):
+
+    def setUp(self):
+        self.product_ops = mock.AsyncMock()
+        self.unit_measures = mock.AsyncMock()
+        self.departments = mock.AsyncMock()
+        self.service = ProductMotorService(
+            self.product_ops, self.unit_measures, self.departments)
+
+    async def test_references_are_checked_at_the_same_time(self):
+        department_checked = asyncio.Event()
+
+        async def unit_measure(id):
+            # It only finishes once the department check has started.
+            await asyncio.wait_for(department_checked.wait(), 5)
+            return reference_response(404, "unit measure")
+
+        async def department(id):
+            department_checked.set()
+            return reference_response(404, "department")
+
+        self.unit_measures.query_by_id.side_effect = unit_measure
+        self.departments.query_by_id.side_effect = department
+        error = await self.service.validate_references("u1", "d1")
+        # The error of the unit measure is returned first.
+        self.assertEqual(error, {"code": 404, "message": "unit measure"})
+
+    async def test_only_the_given_references_are_checked(self):
+        self.departments.query_by_id.return_value = reference_response(200)
+        self.assertIsNone(await self.service.validate_references(None,
+                                                                 "d1"))
+        self.unit_measures.query_by_id.assert_not_called()
+
+    async def test_product_with_a_missing_reference_is_not_created(self):
+        self.unit_measures.query_by_id.return_value = reference_response(200)
+        self.departments.query_by_id.return_value = reference_response(
+            404, "department")
+        result = await self.service.create({"unit_measure_id": "u1",
+                                            "department_id": "d1"})
+        self.assertEqual(result["code"], 404)
+        self.product_ops.create.assert_not_called()
+
+    async def test_delete_invalidates_the_listings_of_its_references(self):
+        id = ObjectId()
+        self.product_ops.delete.return_value = product(
+            _id=id, department_id="d1", unit_measure_id="u1")
+        with mock.patch.object(response_tags, "invalidate") as invalidate:
+            self.assertTrue(await self.service.delete(str(id)))
+        self.assertEqual(set(invalidate.call_args.args[0]), {
+            "products", f"product:{id}", "products:department:d1",
+            "products:unit_measure:u1"})
+
+
+class AsyncAPIViewTests(SimpleTestCase):
+
+    def setUp(self):
+        self.service = mock.AsyncMock(spec=ProductAsyncService)
+        config = apps.get_app_config("django_injector")
+
+        class Services(Module):
+            def configure(module, binder):
+                binder.bind(ProductAsyncService, to=self.service)
+
+        patcher = mock.patch.object(
+            config, "injector",
+            config.injector.create_child_injector([Services()]))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.factory = RequestFactory()
+
+    async def test_view_is_a_coroutine_with_injected_dependencies(self):
+        view = ProductAsyncAPIView.as_view()
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+        self.assertTrue(view.csrf_exempt)
+        id = str(ObjectId())
+        self.service.query_by_id.return_value = {"_id": id, "name": "water"}
+        response = await view(self.factory.get("/async/products/",
+                                               {"id": id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content,
+                         b'{"_id":"' + id.encode() + b'","name":"water"}')
+        self.service.query_by_id.assert_awaited_once_with(id, None)
+
+    async def test_each_request_gets_a_new_view(self):
+        view = ProductAsyncAPIView.as_view()
+        self.service.query_by_filters.return_value = []
+        with mock.patch.object(ProductAsyncAPIView, "setup",
+                               autospec=True,
+                               side_effect=ProductAsyncAPIView.setup) as setup:
+            await view(self.factory.get("/async/products/"))
+            await view(self.factory.get("/async/products/"))
+        first, second = (call.args[0] for call in setup.call_args_list)
+        self.assertIsNot(first, second)
+
+    async def test_missing_record_returns_not_found(self):
+        self.service.delete.side_effect = product.DoesNotExist("missing")
+        view = ProductAsyncAPIView.as_view()
+        with self.assertLogs(level="CRITICAL"):
+            response = await view(self.factory.delete(
+                f"/async/products/?id={ObjectId()}"))
+        self.assertEqual(response.status_code, 404)
+
+    def test_unknown_arguments_are_rejected(self):
+        with self.assertRaises(TypeError):
+            ProductAsyncAPIView.as_view(unknown=True)
+
+
+class PaginationTests(SimpleTestCase):
+
+    def setUp(self):
+        self.id = ObjectId()
+
+    def test_limit_is_bounded(self):
+        self.assertEqual(parse_limit(None, 20, 100), 20)
+        self.assertEqual(parse_limit("500", 20, 100), 100)
+        for limit in ("0", "ten"):
+            with self.subTest(limit=limit), self.assertRaises(ValueError):
+                parse_limit(limit)
+
+    def test_cursor_round_trip(self):
+        date = datetime(2024, 1, 2, 3, 4, 5, 6000, tzinfo=timezone.utc)
+        for sort_key, value in (("name", "water"), ("-date", date),
+                                ("_id", self.id)):
+            with self.subTest(sort_key=sort_key):
+                cursor = encode_cursor(sort_key, value, self.id)
+                self.assertNotIn("=", cursor)
+                expected = str(value) if sort_key == "_id" else value
+                self.assertEqual(decode_cursor(cursor, sort_key),
+                                 (expected, self.id))
+
+    def test_cursor_of_another_sort_is_rejected(self):
+        cursor = encode_cursor("name", "water", self.id)
+        with self.assertRaisesMessage(ValueError, "does not match"):
+            decode_cursor(cursor, "-name")
+
+    def test_invalid_cursor_is_rejected(self):
+        for cursor in ("not a cursor", "e30", encode_cursor("name", "a", 1)):
+            with self.subTest(cursor=cursor), \
+                    self.assertRaisesMessage(ValueError, "is not valid"):
+                decode_cursor(cursor, "name")
+
+    def test_first_page_query(self):
+        query, sort = page_query({"department_id": "d1"}, "name", None)
+        self.assertEqual(query, {"department_id": "d1"})
+        self.assertEqual(sort, [("name", ASCENDING), ("_id", ASCENDING)])
+
+    def test_next_page_starts_after_the_last_record(self):
+        query, sort = page_query({"department_id": "d1"}, "-quantity",
+                                 (5, self.id))
+        self.assertEqual(query, {"$and": [{"department_id": "d1"}, {"$or": [
+            {"quantity": {"$lt": 5}},
+            {"quantity": 5, "_id": {"$lt": self.id}},
+        ]}]})
+        self.assertEqual(sort, [("quantity", DESCENDING),
+                                ("_id", DESCENDING)])
+
+    def test_pages_sorted_by_id_only_compare_the_id(self):
+        query, sort = page_query({}, "_id", (str(self.id), self.id))
+        self.assertEqual(query, {"_id": {"$gt": self.id}})
+        self.assertEqual(sort, [("_id", ASCENDING)])
+
+    def test_page_loads_the_sort_field(self):
+        position, fields = page_position("-quantity", None, ("name",))
+        self.assertIsNone(position)
+        self.assertEqual(fields, ("name", "quantity"))
+        with self.assertRaises(ValueError):
+            page_position("comments", None, None)
+
+    def test_page_has_a_next_cursor_only_if_there_are_more_records(self):
+        records = [product(_id=ObjectId(), name=name, quantity=1)
+                   for name in ("a", "b", "c")]
+        page = page_result(records, "name", 2, ("_id", "name"))
+        self.assertEqual([p["name"] for p in page["results"]], ["a", "b"])
+        self.assertEqual(decode_cursor(page["next"], "name"),
+                         ("b", records[1]._id))
+        self.assertIsNone(page_result(records, "name", 3, None)["next"])
+
+
+class StreamingTests(SimpleTestCase):
+
+    rows = [{"name": f"product {i}", "quantity": i} for i in range(5)]
+
+    def setUp(self):
+        patcher = mock.patch.object(AppEnv, "STREAM_BATCH_SIZE", 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def format(self, path: str, **headers):
+        request = Request(APIRequestFactory().get(path, **headers))
+        return stream_format(request)
+
+    def test_format_is_negotiated(self):
+        self.assertIsNone(self.format("/products/"))
+        self.assertIsNone(self.format("/products/?stream=false"))
+        self.assertEqual(self.format("/products/?stream=1"), "json")
+        self.assertEqual(self.format("/products/?stream=ndjson"), "ndjson")
+        self.assertEqual(
+            self.format("/products/",
+                        HTTP_ACCEPT="application/x-ndjson"), "ndjson")
+
+    def test_json_array_is_written_in_chunks(self):
+        response = streaming_response(iter(self.rows), "json")
+        chunks = list(response.streaming_content)
+        # The opening bracket, three chunks of at most two rows and the
+        # closing bracket.
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(json.loads(b"".join(chunks)), self.rows)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_empty_listing_is_an_empty_array(self):
+        response = streaming_response(iter([]), "json")
+        self.assertEqual(b"".join(response.streaming_content), b"[]")
+
+    def test_ndjson_writes_a_record_per_line(self):
+        response = streaming_response(iter(self.rows), "ndjson")
+        body = b"".join(response.streaming_content)
+        self.assertEqual([json.loads(line) for line in body.splitlines()],
+                         self.rows)
+        self.assertTrue(body.endswith(b"\n"))
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+    def test_rows_are_read_as_the_response_is_sent(self):
+        read = []
+
+        def rows():
+            for row in self.rows:
+                read.append(row)
+                yield row
+
+        content = streaming_response(rows(), "ndjson").streaming_content
+        self.assertEqual(read, [])
+        next(content)
+        self.assertEqual(len(read), 2)
+
+
+class ProductEncoderTests(SimpleTestCase):
+
+    date = datetime(2024, 5, 1, 12, 30, 15, 250000)
+
+    def document(self, **values) -> dict:
+        return dict({
+            "_id": ObjectId("6630b1c2f1a2b3c4d5e6f708"), "name": "flour",
+            "description": "wheat", "quantity": 7, "url_picture": "u",
+            "location": "l", "lot_flag": True, "price_lot_flag": False,
+            "alert_minimum_stock_flag": False,
+            "alert_expiration_date_flag": True, "comments": "c",
+            "date": self.date, "last_update": self.date,
+            "department_id": "d1", "unit_measure_id": "u1"}, **values)
+
+    def test_model_is_converted_in_field_order(self):
+        content = PRODUCT_ENCODER.from_model(product(**self.document()))
+        self.assertEqual(tuple(content), PRODUCT_ENCODER.fields)
+        self.assertEqual(content["quantity"], 7)
+
+    def test_missing_document_fields_are_null(self):
+        document = self.document()
+        del document["comments"]
+        self.assertIsNone(PRODUCT_ENCODER.from_document(document)["comments"])
+
+    def test_ids_and_dates_are_written_as_the_serializer_did(self):
+        content = json.loads(PRODUCT_ENCODER.dumps_models(
+            [product(**self.document())]))
+        self.assertEqual(content[0]["_id"], "6630b1c2f1a2b3c4d5e6f708")
+        self.assertEqual(content[0]["date"], "2024-05-01T12:30:15.250000Z")
+        self.assertEqual(content[0]["last_update"],
+                         product(**self.document()).formatted_last_update())
+
+
+class FieldsetTests(SimpleTestCase):
+
+    def test_all_fields_by_default(self):
+        self.assertIsNone(PRODUCT_ENCODER.parse_fields(None))
+        self.assertIsNone(PRODUCT_ENCODER.parse_fields(""))
+        self.assertIs(PRODUCT_ENCODER.subset(None), PRODUCT_ENCODER)
+
+    def test_fields_keep_the_output_order_and_the_id(self):
+        self.assertEqual(PRODUCT_ENCODER.parse_fields(" quantity,name, "),
+                         ("_id", "name", "quantity"))
+
+    def test_unknown_fields_are_rejected(self):
+        with self.assertRaisesMessage(ValueError, "Unknown fields: price."):
+            PRODUCT_ENCODER.parse_fields("name,price")
+
+    def test_subset_encoders_are_compiled_once(self):
+        fields = ("_id", "name")
+        encoder = PRODUCT_ENCODER.subset(fields)
+        self.assertIs(PRODUCT_ENCODER.subset(fields), encoder)
+        self.assertEqual(
+            encoder.from_document({"_id": 1, "name": "flour", "quantity": 7}),
+            {"_id": 1, "name": "flour"})
+
+
+class LookupsToQueryTests(SimpleTestCase):
+
+    def test_lookups_are_translated_in_order(self):
+        query = lookups_to_query({"department_id": "d1",
+                                  "quantity__lte": 5,
+                                  "_id__in": ["a", "b"]})
+        self.assertEqual(list(query), ["department_id", "quantity", "_id"])
+        self.assertEqual(query, {"department_id": "d1",
+                                 "quantity": {"$lte": 5},
+                                 "_id": {"$in": ["a", "b"]}})
+
+    def test_icontains_matches_the_literal_text(self):
+        self.assertEqual(lookups_to_query({"name__icontains": "1.5 kg"}),
+                         {"name": {"$regex": r"1\.5\ kg", "$options": "i"}})
+
+    def test_lookups_over_the_same_field_are_merged(self):
+        self.assertEqual(
+            lookups_to_query({"quantity__gte": 1, "quantity__lt": 9}),
+            {"quantity": {"$gte": 1, "$lt": 9}})
+        self.assertEqual(
+            lookups_to_query({"quantity": 3, "quantity__in": [3, 4]}),
+            {"quantity": {"$eq": 3, "$in": [3, 4]}})
+
+    def test_filter_lookups_are_supported(self):
+        product_filter = ProductFilter(QueryDict(
+            "name=water&quantity__gte=2&quantity__lte=8"))
+        query = lookups_to_query(product_filter.lookups)
+        self.assertEqual(query["quantity"], {"$gte": 2, "$lte": 8})
+        self.assertEqual(query["name"]["$regex"], "water")
+
+    def test_unsupported_lookup(self):
+        with self.assertRaisesMessage(ValueError, "name__startswith"):
+            lookups_to_query({"name__startswith": "wa"})
+
+
+def reference_request(missing: tuple = ()) -> mock.Mock:
+    request = mock.Mock()
+    request.query_by_id.side_effect = lambda id: ReferenceResponse(
+        404 if id in missing else 200, "not found" if id in missing else "")
+    return request
+
+
+class BulkCreateTests(SimpleTestCase):
+
+    def setUp(self):
+        self.product_ops = mock.Mock(spec=ProductOps)
+        self.departments = reference_request(missing=("d9",))
+        self.service = ProductMongoService(
+            self.product_ops, reference_request(), self.departments)
+
+    def test_each_record_has_its_result(self):
+        ids = [ObjectId(), ObjectId()]
+        self.product_ops.bulk_create.return_value = (
+            ids, {1: {"code": 11000, "errmsg": "duplicate key"}})
+        rows = [dict(PRODUCT_ROW, name="water"), {"quantity": 1},
+                dict(PRODUCT_ROW, name="soda", department_id="d9"),
+                dict(PRODUCT_ROW, name="water")]
+        with mock.patch.object(products_changed, "send") as send:
+            result = self.service.bulk_create(rows)
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(result["failed"], 3)
+        self.assertEqual([row["code"] for row in result["results"]],
+                         [201, 400, 404, 409])
+        self.assertEqual(result["results"][0]["_id"], str(ids[0]))
+        self.assertEqual(result["results"][2]["error"], "not found")
+        # Only the records that passed the checks are written.
+        written = self.product_ops.bulk_create.call_args.args[0]
+        self.assertEqual([data["name"] for data in written],
+                         ["water", "water"])
+        self.assertEqual(
+            [product["_id"] for product in send.call_args.kwargs["products"]],
+            [str(ids[0])])
+
+    def test_each_reference_is_checked_once(self):
+        self.product_ops.bulk_create.return_value = (
+            [ObjectId() for _ in range(3)], {})
+        self.service.bulk_create([dict(PRODUCT_ROW, name=f"p{i}")
+                                  for i in range(3)])
+        self.departments.query_by_id.assert_called_once_with("d1")
+
+    def test_insert_errors_are_reported_by_position(self):
+        def insert_many(documents, ordered=True):
+            # pymongo assigns the ids before sending the documents.
+            for document in documents:
+                document["_id"] = ObjectId()
+            raise BulkWriteError({"writeErrors": [
+                {"index": 1, "code": 11000, "errmsg": "dup"}]})
+
+        collection = mock.Mock()
+        collection.insert_many.side_effect = insert_many
+        with mock.patch.object(product_ops, "get_collection",
+                               return_value=collection):
+            ids, errors = ProductOpsMongo().bulk_create(
+                [dict(PRODUCT_ROW, name="water")] * 2)
+        self.assertEqual(list(errors), [1])
+        self.assertEqual(collection.insert_many.call_args.kwargs,
+                         {"ordered": False})
+        self.assertEqual(len(ids), 2)
+
+    def test_rows_are_read_from_ndjson(self):
+        request = Request(APIRequestFactory().post(
+            "/products/bulk/", data=b'{"name": "a"}\n\n{"name": "b"}\n',
+            content_type="application/x-ndjson"))
+        self.assertEqual(read_rows(request), [{"name": "a"}, {"name": "b"}])
+
+    def test_invalid_bodies_are_rejected(self):
+        for data, content_type in ((b'{"name": "a"}', "application/json"),
+                                   (b"[]", "application/json"),
+                                   (b"{\n", "application/x-ndjson")):
+            request = Request(APIRequestFactory().post(
+                "/products/bulk/", data=data, content_type=content_type))
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                read_rows(request)
+        request = Request(APIRequestFactory().post(
+            "/products/bulk/", data=b"[1, 2, 3]",
+            content_type="application/json"))
+        with self.assertRaisesMessage(ValueError, "at most 2"):
+            read_rows(request, max_rows=2)
+
+
+class BulkDeleteTests(SimpleTestCase):
+
+    def setUp(self):
+        self.product_ops = mock.Mock(spec=ProductOps)
+        self.service = ProductMongoService(self.product_ops, mock.Mock(),
+                                           mock.Mock())
+
+    def delete_view(self, path: str, body: bytes = b""):
+        service = mock.Mock()
+        service.bulk_delete.return_value = {"matched": 0, "deleted": 0,
+                                            "dry_run": False}
+        view = ProductBulkDeleteAPIView(service)
+        request = APIRequestFactory().post(
+            path, data=body, content_type="application/json")
+        view.setup(request)
+        return view.dispatch(request), service
+
+    def test_criteria_are_required(self):
+        with self.assertRaises(ValueError):
+            self.service.bulk_delete({})
+        self.product_ops.delete_many.assert_not_called()
+
+    def test_dry_run_only_counts(self):
+        self.product_ops.count.return_value = 3
+        with mock.patch.object(products_changed, "send") as send:
+            result = self.service.bulk_delete({"quantity": 0}, dry_run=True)
+        self.assertEqual(result, {"matched": 3, "deleted": 0,
+                                  "dry_run": True})
+        self.product_ops.delete_many.assert_not_called()
+        send.assert_not_called()
+
+    def test_delete_invalidates_the_listings(self):
+        self.product_ops.delete_many.return_value = 2
+        with mock.patch.object(products_changed, "send") as send:
+            result = self.service.bulk_delete({"quantity": 0})
+        self.assertEqual(result["deleted"], 2)
+        send.assert_called_once()
+
+    def test_body_ids_are_combined_with_the_filters(self):
+        ids = [str(ObjectId()), str(ObjectId())]
+        response, service = self.delete_view(
+            "/products/bulk_delete/?quantity=0&dry_run=true",
+            json.dumps({"ids": ids}).encode())
+        self.assertEqual(response.status_code, 200)
+        filters, dry_run = service.bulk_delete.call_args.args
+        self.assertEqual(filters["quantity"], 0)
+        self.assertEqual([str(id) for id in filters["_id__in"]], ids)
+        self.assertTrue(dry_run)
+
+    def test_invalid_bodies_are_rejected(self):
+        id = str(ObjectId())
+        for path, body in (
+                ("/products/bulk_delete/", b"[]"),
+                ("/products/bulk_delete/", b'{"ids": "' + id.encode()
+                 + b'"}'),
+                (f"/products/bulk_delete/?_id__in={id}",
+                 b'{"ids": ["' + id.encode() + b'"]}')):
+            with self.subTest(path=path, body=body), \
+                    self.assertLogs(level="ERROR"):
+                response, service = self.delete_view(path, body)
+            self.assertEqual(response.status_code, 400)
+            service.bulk_delete.assert_not_called()
+
+
+class ReferenceValidationTests(SimpleTestCase):
+
+    def setUp(self):
+        self.department_ops = mock.Mock()
+        self.request = DepartmentServiceRequest(
+            DepartmentsMongoService(self.department_ops))
+
+    def test_existing_reference_reads_only_the_id(self):
+        _id = ObjectId()
+        self.department_ops.query_by_id.return_value = Department(_id=_id)
+        response = self.request.query_by_id(str(_id))
+        self.assertTrue(response.ok)
+        self.assertEqual(json.loads(response.text), {"_id": str(_id)})
+        self.department_ops.query_by_id.assert_called_once_with(_id,
+                                                                ("_id",))
+
+    def test_missing_reference_is_not_found(self):
+        self.department_ops.query_by_id.side_effect = \
+            Department.DoesNotExist("Department matching query does not "
+                                    "exist.")
+        response = self.request.query_by_id(str(ObjectId()))
+        self.assertFalse(response.ok)
+        self.assertEqual(response.status_code, 404)
+        self.assertIn("does not exist", json.loads(response.text)["error"])
+
+    def test_invalid_reference_is_a_bad_request(self):
+        response = self.request.query_by_id("d1")
+        self.assertEqual(response.status_code, 400)
+        self.department_ops.query_by_id.assert_not_called()
+
+    def test_create_stops_at_the_failed_reference(self):
+        product_ops = mock.Mock(spec=ProductOps)
+        service = ProductMongoService(product_ops, reference_request(),
+                                      self.request)
+        self.assertEqual(service.create(dict(PRODUCT_ROW))["code"], 400)
+        product_ops.create.assert_not_called()
+
+
+class TTLCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(cache.time, "monotonic", return_value=0)
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = TTLCache(max_size=2, ttl=10)
+
+    def test_entries_expire_after_their_ttl(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", None, ttl=1)
+        self.clock.return_value = 5
+        self.assertEqual(self.cache.get("a"), (True, 1))
+        self.assertEqual(self.cache.get("b"), (False, None))
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.assertEqual(self.cache.get("b"), (False, None))
+        self.assertEqual(self.cache.get("a"), (True, 1))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+
+class ReferenceCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.cache = TTLCache(max_size=10, ttl=60)
+        patcher = mock.patch.object(reference_cache, "DEPARTMENT_CACHE",
+                                    self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.departments = mock.Mock()
+        self.request = CachedDepartmentRequest(self.departments, self.cache)
+
+    def test_existing_references_are_cached_by_canonical_id(self):
+        id = "6630B1C2F1A2B3C4D5E6F708"
+        self.departments.query_by_id.return_value = ReferenceResponse(200)
+        self.assertTrue(self.request.query_by_id(id).ok)
+        self.assertTrue(self.request.query_by_id(id.lower()).ok)
+        self.departments.query_by_id.assert_called_once_with(id)
+
+    def test_missing_references_use_the_negative_ttl(self):
+        self.departments.query_by_id.return_value = ReferenceResponse(404)
+        with mock.patch.object(self.cache, "set") as set_entry:
+            self.request.query_by_id(str(ObjectId()))
+        self.assertEqual(set_entry.call_args.args[2],
+                         AppEnv.REFERENCE_CACHE_NEGATIVE_TTL)
+
+    def test_other_errors_are_not_cached(self):
+        self.departments.query_by_id.return_value = ReferenceResponse(503)
+        id = str(ObjectId())
+        self.request.query_by_id(id)
+        self.request.query_by_id(id)
+        self.assertEqual(self.departments.query_by_id.call_count, 2)
+
+    def test_department_write_invalidates_its_entry(self):
+        id = str(ObjectId())
+        self.departments.query_by_id.return_value = ReferenceResponse(200)
+        self.request.query_by_id(id.upper())
+        department_changed.send(sender=None, id=id)
+        self.request.query_by_id(id)
+        self.assertEqual(self.departments.query_by_id.call_count, 2)
+
+
+class SetFieldsTests(SimpleTestCase):
+
+    def setUp(self):
+        self.collection = mock.Mock()
+        patcher = mock.patch.object(mongo, "get_collection",
+                                    return_value=self.collection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.oid = ObjectId()
+
+    def test_only_the_changes_and_the_timestamp_are_set(self):
+        self.collection.find_one_and_update.return_value = {
+            "_id": self.oid, "name": "water", "quantity": 4}
+        updated = set_fields(product, self.oid, {"quantity": 4},
+                             "last_update")
+        query, update = self.collection.find_one_and_update.call_args.args
+        self.assertEqual(query, {"_id": self.oid})
+        self.assertEqual(list(update), ["$set"])
+        self.assertEqual(set(update["$set"]), {"quantity", "last_update"})
+        self.assertEqual(
+            self.collection.find_one_and_update.call_args.kwargs,
+            {"return_document": ReturnDocument.AFTER})
+        self.assertEqual(updated.quantity, 4)
+
+    def test_missing_record(self):
+        self.collection.find_one_and_update.return_value = None
+        with self.assertRaises(product.DoesNotExist):
+            set_fields(product, self.oid, {"quantity": 4}, "last_update")
+        with self.assertRaises(product.DoesNotExist):
+            set_fields_with_previous(product, self.oid, {"quantity": 4},
+                                     "last_update")
+
+    def test_previous_document_is_returned_with_the_update(self):
+        previous = {"_id": self.oid, "name": "water", "department_id": "d1"}
+        self.collection.find_one_and_update.return_value = previous
+        updated, before = set_fields_with_previous(
+            product, self.oid, {"department_id": "d2"}, "last_update")
+        self.assertIs(before, previous)
+        self.assertEqual((updated.name, updated.department_id),
+                         ("water", "d2"))
+        # The returned date is the stored one, Mongo keeps milliseconds.
+        self.assertEqual(updated.last_update.microsecond % 1000, 0)
+
+
+class PartialUpdateTests(SimpleTestCase):
+
+    def setUp(self):
+        self.product_ops = mock.Mock(spec=ProductOps)
+        self.oid = ObjectId()
+        self.product_ops.partial_update.side_effect = \
+            lambda oid, changes: (product(_id=oid, **changes), {})
+        self.departments = reference_request(missing=("d9",))
+        self.service = ProductMongoService(self.product_ops,
+                                           reference_request(),
+                                           self.departments)
+
+    def test_put_keeps_the_fields_sent_as_null(self):
+        with mock.patch.object(products_changed, "send"):
+            self.service.update({"quantity": 3, "comments": None},
+                                str(self.oid))
+        self.product_ops.partial_update.assert_called_once_with(
+            self.oid, {"quantity": 3})
+
+    def test_patch_sets_the_fields_sent_as_null(self):
+        with mock.patch.object(products_changed, "send"):
+            result = self.service.partial_update({"comments": None},
+                                                 str(self.oid))
+        self.assertEqual(result["code"], 200)
+        self.product_ops.partial_update.assert_called_once_with(
+            self.oid, {"comments": None})
+        self.departments.query_by_id.assert_not_called()
+
+    def test_patch_checks_the_changed_references(self):
+        result = self.service.partial_update({"department_id": "d9"},
+                                             str(self.oid))
+        self.assertEqual(result["code"], 404)
+        self.product_ops.partial_update.assert_not_called()
+
+    def test_patch_without_fields(self):
+        with self.assertRaisesMessage(ValueError, "any field"):
+            self.service.partial_update({}, str(self.oid))
+
+
+class VersionedView:
+    """
+    A view whose records have the version of the class attribute.
+    """
+
+    version_value = (2, datetime(2024, 5, 1, tzinfo=timezone.utc))
+    status_code = 200
+
+    def __init__(self):
+        self.reads = 0
+
+    def version(self, request):
+        if request.GET.get("id") == "invalid":
+            raise ValueError("The id is not valid.")
+        return self.version_value
+
+    @conditional_get(version)
+    def get(self, request):
+        self.reads += 1
+        return HttpResponse(b"[]", status=self.status_code)
+
+
+class ConditionalGetTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.view = VersionedView()
+
+    def test_etag_depends_on_the_version_and_the_query(self):
+        request = self.factory.get("/products/?limit=5")
+        etag = make_etag(request, VersionedView.version_value)
+        self.assertEqual(etag, make_etag(request,
+                                         VersionedView.version_value))
+        date = VersionedView.version_value[1]
+        self.assertNotEqual(etag, make_etag(request, (3, date)))
+        self.assertNotEqual(etag, make_etag(request, (2, None)))
+        self.assertNotEqual(etag, make_etag(
+            self.factory.get("/products/?limit=6"),
+            VersionedView.version_value))
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.view.get(self.factory.get("/products/"))["ETag"]
+        response = self.view.get(self.factory.get(
+            "/products/", HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.view.reads, 1)
+
+    def test_changed_records_are_read_again(self):
+        etag = self.view.get(self.factory.get("/products/"))["ETag"]
+        self.view.version_value = (1, None)
+        response = self.view.get(self.factory.get(
+            "/products/", HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_errors_and_invalid_parameters_have_no_etag(self):
+        response = self.view.get(self.factory.get("/products/?id=invalid"))
+        self.assertFalse(response.has_header("ETag"))
+        self.view.status_code = 404
+        response = self.view.get(self.factory.get("/products/"))
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_product_version_follows_the_request(self):
+        service = mock.Mock()
+        view = ProductAPIView(service)
+        id = str(ObjectId())
+        self.assertIsNone(view.version(Request(
+            self.factory.get("/products/?stream=ndjson"))))
+        view.version(Request(self.factory.get(f"/products/?id={id}")))
+        service.version.assert_called_with({}, id)
+        view.version(Request(self.factory.get("/products/?quantity=0")))
+        service.version.assert_called_with({"quantity": 0})
+
+
+class ChangesFeedTests(SimpleTestCase):
+
+    def setUp(self):
+        self.product_ops = mock.Mock(spec=ProductOps)
+        self.product_ops.query_page.return_value = []
+        self.product_ops.query_tombstones.return_value = []
+        self.service = ProductMongoService(self.product_ops, mock.Mock(),
+                                           mock.Mock())
+        self.date = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def changed(self, count: int) -> list:
+        return [product(_id=ObjectId(), name=f"p{i}",
+                        last_update=self.date + timedelta(seconds=i))
+                for i in range(count)]
+
+    def test_watermark_round_trip(self):
+        oid = ObjectId()
+        token = encode_watermark({"products": (self.date, oid),
+                                  "deleted": None}, self.date)
+        self.assertNotIn("=", token)
+        self.assertEqual(decode_watermark(token),
+                         ({"products": (self.date, oid), "deleted": None},
+                          self.date))
+
+    def test_invalid_watermarks_are_rejected(self):
+        for token in ("x", "e30", encode_cursor("name", "a", ObjectId())):
+            with self.subTest(token=token), \
+                    self.assertRaisesMessage(ValueError, "'since'"):
+                decode_watermark(token)
+
+    def test_first_call_returns_the_catalog_and_no_deletions(self):
+        self.product_ops.query_page.return_value = self.changed(3)
+        result = self.service.query_changes(None, 2, ("_id", "name"))
+        filters, sort_key, position, limit, fields = \
+            self.product_ops.query_page.call_args.args
+        self.assertIsNone(position)
+        self.assertEqual(limit, 3)
+        # The position of the next call is read from the last update.
+        self.assertEqual(fields, ("_id", "name", "last_update"))
+        self.assertEqual(len(result["changes"]), 2)
+        self.assertNotIn("last_update", result["changes"][0])
+        self.assertTrue(result["has_more"])
+        positions, issued = decode_watermark(result["next"])
+        self.assertEqual(positions["products"][1],
+                         result["changes"][1]["_id"])
+        self.assertEqual(positions["deleted"][0],
+                         self.product_ops.query_tombstones.call_args.args[1])
+
+    def test_next_call_continues_after_the_watermark(self):
+        product_id = ObjectId()
+        tombstone = ProductTombstone(_id=ObjectId(), product_id="p9",
+                                     deleted_at=self.date)
+        self.product_ops.query_tombstones.return_value = [tombstone]
+        since = encode_watermark({"products": (self.date, product_id),
+                                  "deleted": None}, self.date)
+        result = self.service.query_changes(since, 10)
+        self.assertEqual(self.product_ops.query_page.call_args.args[2],
+                         (self.date, product_id))
+        self.assertEqual(result["deleted"],
+                         [{"_id": "p9", "deleted_at": self.date}])
+        self.assertFalse(result["has_more"])
+        positions, issued = decode_watermark(result["next"])
+        self.assertEqual(positions, {"products": (self.date, product_id),
+                                     "deleted": (self.date, tombstone._id)})
+
+    def test_expired_watermark_is_gone(self):
+        issued = self.date - timedelta(seconds=AppEnv.TOMBSTONE_RETENTION
+                                       + 1)
+        since = encode_watermark({"products": None, "deleted": None},
+                                 issued)
+        with self.assertRaises(ExpiredWatermarkError):
+            self.service.query_changes(since, 10)
+        view = ProductChangesAPIView(self.service)
+        request = APIRequestFactory().get("/products/changes/",
+                                          {"since": since})
+        view.setup(request)
+        with self.assertLogs(level="ERROR"):
+            self.assertEqual(view.dispatch(request).status_code, 410)
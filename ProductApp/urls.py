@@ -1,6 +1,9 @@
 from django.urls import path
 
-from ProductApp.views import ProductAPIView
+from ProductApp.views import ProductAPIView, ProductSearchAPIView, \
+    ProductBulkCreateAPIView, ProductBulkUpdateAPIView, \
+    ProductBulkDeleteAPIView, ProductAsyncAPIView, ProductStockAPIView, \
+    ProductChangesAPIView
 from .constants import AppConstants
 
 urlpatterns = [
@@ -24,5 +27,40 @@ urlpatterns = [
         ProductAPIView.as_view(),
         name=AppConstants.Api.UPDATE_PRODUCT_BY_ID_NAME
 
-    )
+    ),
+    path(
+        AppConstants.Api.SEARCH_PRODUCTS,
+        ProductSearchAPIView.as_view(),
+        name=AppConstants.Api.SEARCH_PRODUCTS_NAME
+    ),
+    path(
+        AppConstants.Api.PRODUCT_CHANGES,
+        ProductChangesAPIView.as_view(),
+        name=AppConstants.Api.PRODUCT_CHANGES_NAME
+    ),
+    path(
+        AppConstants.Api.BULK_CREATE_PRODUCTS,
+        ProductBulkCreateAPIView.as_view(),
+        name=AppConstants.Api.BULK_CREATE_PRODUCTS_NAME
+    ),
+    path(
+        AppConstants.Api.BULK_UPDATE_PRODUCTS,
+        ProductBulkUpdateAPIView.as_view(),
+        name=AppConstants.Api.BULK_UPDATE_PRODUCTS_NAME
+    ),
+    path(
+        AppConstants.Api.BULK_DELETE_PRODUCTS,
+        ProductBulkDeleteAPIView.as_view(),
+        name=AppConstants.Api.BULK_DELETE_PRODUCTS_NAME
+    ),
+    path(
+        AppConstants.Api.ADJUST_STOCK,
+        ProductStockAPIView.as_view(),
+        name=AppConstants.Api.ADJUST_STOCK_NAME
+    ),
+    path(
+        AppConstants.Api.ASYNC_PRODUCTS,
+        ProductAsyncAPIView.as_view(),
+        name=AppConstants.Api.ASYNC_PRODUCTS_NAME
+    ),
 ]
@@ -1,17 +1,34 @@
-import json
 import logging
+from typing import Optional
 
 import requests
 from django.core.exceptions import ObjectDoesNotExist
-from django.http import JsonResponse
 from injector import inject
 from rest_framework import request, status
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
 from rest_framework.views import APIView
 
+from ProductApp.constants import AppConstants
+from ProductApp.exceptions import ExpiredWatermarkError, MissingIndexError
+from ProductApp.filters import ProductFilter, parse_boolean, \
+    parse_primary_key_list
+from ProductApp.response_tags import product_tags
 from ProductApp.services.products import ProductService
+from ProductApp.services.products_async import ProductAsyncService
+from ProductManagementService import json_codec
+from ProductManagementService.async_views import AsyncAPIView
+from ProductManagementService.bulk import read_rows
+from ProductManagementService.conditional import conditional_get
+from ProductManagementService.encoders import EncodedJsonResponse, \
+    JsonResponse
 from ProductManagementService.logger import logger
 from ProductManagementService.messages import ApiMessages as msg
-from .serializer import OutSerializerAllFields, InSerializer
+from ProductManagementService.env import AppEnv
+from ProductManagementService.pagination import parse_limit
+from ProductManagementService.response_cache import cached_response
+from ProductManagementService.streaming import stream_format, \
+    streaming_response
+from .serializer import InSerializer, PRODUCT_ENCODER
 
 
 # Create your views here.
@@ -21,6 +38,8 @@ class ProductAPIView(APIView):
     vv
     """
 
+    compression_levels: dict = AppConstants.Compression.LISTING_LEVELS
+
     @inject
     def __init__(self, product_service: ProductService):
         super().__init__()
@@ -29,9 +48,8 @@ class ProductAPIView(APIView):
     def post(self, request: request.Request):
         logger.info("View - post method ")
         try:
-            data = json.loads(request.body)
             serialized_request = InSerializer(
-                data=data,
+                data=request.data,
                 many=False,
             )
             if not serialized_request.is_valid():
@@ -49,20 +67,12 @@ class ProductAPIView(APIView):
                         "message": response_message["message"]
                     }, status=response_message["code"]
                 )
-            new_product = response_message["product"]
-            out_serializer = OutSerializerAllFields(
-                data=new_product,
-                many=False
-            )
-            if not out_serializer.is_valid():
-                return JsonResponse({"error": out_serializer.errors},
-                                    status=status.HTTP_400_BAD_REQUEST)
-            return JsonResponse(
-                out_serializer.validated_data,
+            return EncodedJsonResponse(
+                PRODUCT_ENCODER.dumps(response_message["product"]),
                 status=status.HTTP_201_CREATED
             )
 
-        except ValueError as e:
+        except (ParseError, UnsupportedMediaType, ValueError) as e:
             logging.critical(f"A critical error occurred:{str(e)}",
                              exc_info=True)
             return JsonResponse(
@@ -78,85 +88,60 @@ class ProductAPIView(APIView):
 
             )
 
+    def version(self, request: request.Request):
+        """
+        This method returns the version of the products that get would
+        return, the streams are not validated.
+        """
+        if stream_format(request) is not None:
+            return None
+        id: str = request.query_params.get("id")
+        if id is not None:
+            return self.product_service.version({}, id)
+        return self.product_service.version(
+            ProductFilter(request.query_params).lookups)
+
+    def cache_tags(self, request: request.Request):
+        if stream_format(request) is not None:
+            return None
+        return product_tags(request)
+
+    @cached_response(cache_tags)
+    @conditional_get(version)
     def get(self, request: requests.Request):
         logger.info("View - get method:::")
         try:
             id: str = request.query_params.get("id")
-            name: str = request.query_params.get("name")
-            description: str = request.query_params.get("description")
-            department_id: str = request.query_params.get("department_id")
-            unit_measure_id: str = request.query_params.get("unit_measure_id")
+            limit: str = request.query_params.get("limit")
+            after: str = request.query_params.get("after")
+            fields = PRODUCT_ENCODER.parse_fields(
+                request.query_params.get("fields"))
 
             if id is not None:
-                product = self.product_service.query_by_id(id)
-                serializer = OutSerializerAllFields(
-                    data=product,
-                    many=False
-                )
-
-            elif name is not None:
-                products = self.product_service.query_by_name(name)
-                if not products:
-                    return JsonResponse({
-                        "error": "There is no records "
-                                 "that show."},
-                        status=status.HTTP_404_NOT_FOUND)
-                serializer = OutSerializerAllFields(
-                    data=products,
-                    many=True
-                )
-            elif description is not None:
-                products = self.product_service.query_by_description(
-                    description)
-                if not products:
-                    return JsonResponse({
-                        "error": "There is no records "
-                                 "that show."},
-                        status=status.HTTP_404_NOT_FOUND)
-                serializer = OutSerializerAllFields(
-                    data=products,
-                    many=True
-                )
-            elif department_id is not None:
-                products = self.product_service.query_by_department_id(
-                    department_id)
-                if not products:
-                    return JsonResponse({
-                        "error": "There is no records "
-                                 "that show."},
-                        status=status.HTTP_404_NOT_FOUND)
-                serializer = OutSerializerAllFields(
-                    data=products,
-                    many=True
+                product = self.product_service.query_by_id(id, fields)
+                return EncodedJsonResponse(PRODUCT_ENCODER.dumps(product))
+            product_filter = ProductFilter(request.query_params)
+            output_format = stream_format(request)
+            if output_format is not None:
+                return streaming_response(
+                    self.product_service.iterate(product_filter.lookups,
+                                                 fields),
+                    output_format
                 )
-            elif unit_measure_id is not None:
-                products = self.product_service.query_by_unit_measure_id(
-                    unit_measure_id)
+            if limit is not None or after is not None:
+                return self.get_page(request, product_filter, limit, after,
+                                     fields)
+            if product_filter:
+                products = self.product_service.query_by_filters(
+                    product_filter.lookups, fields)
                 if not products:
                     return JsonResponse({
                         "error": "There is no records "
                                  "that show."},
                         status=status.HTTP_404_NOT_FOUND)
-                serializer = OutSerializerAllFields(
-                    data=products,
-                    many=True
-                )
             else:
-                products = self.product_service.query_all()
-                serializer = OutSerializerAllFields(
-                    data=products,
-                    many=True
-                )
-            if not serializer.is_valid():
-                return JsonResponse(
-                    {"error": serializer.errors},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            return JsonResponse(
-                serializer.data,
-                status=status.HTTP_200_OK,
-                safe=False
-            )
+                products = self.product_service.query_all(fields)
+            return EncodedJsonResponse(PRODUCT_ENCODER.dumps(products))
         except ObjectDoesNotExist as e:
             logging.critical(f"A critical error occurred: {str(e)}",
                              exc_info=True)
@@ -178,6 +163,22 @@ class ProductAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def get_page(self, request: request.Request,
+                 product_filter: ProductFilter, limit: str, after: str,
+                 fields: Optional[tuple]):
+        """
+        This method returns a page of the products that match the filter,
+        the 'next' cursor must be sent in the 'after' parameter to retrieve
+        the following page.
+        """
+        logger.info("View - get_page method:::")
+        sort_key = request.query_params.get(
+            "sort", AppConstants.Pagination.DEFAULT_SORT_KEY)
+        page = self.product_service.query_page(
+            product_filter.lookups, sort_key, after, parse_limit(limit),
+            fields)
+        return EncodedJsonResponse(PRODUCT_ENCODER.dumps(page))
+
     def delete(self, request: requests.Request):
         logger.info("View -delete method::")
         try:
@@ -227,20 +228,58 @@ class ProductAPIView(APIView):
                 )
             update_product = self.product_service.update(
                 serializer.validated_data, id)
-            serializer_out = OutSerializerAllFields(
-                data=update_product,
-                many=False
+            return EncodedJsonResponse(PRODUCT_ENCODER.dumps(update_product),
+                                       status=status.HTTP_201_CREATED)
+        except ObjectDoesNotExist as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except (ParseError, UnsupportedMediaType, ValueError) as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"Error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"Error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def patch(self, request: request.Request):
+        """
+        This method updates only the fields present in the body, with a
+        single write that also sets the last update date.
+        """
+        logger.info("View - patch method ::: ")
+        try:
+            id = request.query_params.get("id")
+            serializer = InSerializer(
+                data=request.data,
+                many=False,
+                partial=True
             )
-            if not serializer_out.is_valid():
+            if not serializer.is_valid():
                 return JsonResponse(
-                    {"error": str(serializer_out.errors)},
+                    {"error": serializer.errors},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            return JsonResponse(
-                update_product,
-                status=status.HTTP_201_CREATED,
-                safe=False
-            )
+            response_message = self.product_service.partial_update(
+                serializer.validated_data, id)
+            if response_message["code"] != 200:
+                return JsonResponse(
+                    {
+                        "message": response_message["message"]
+                    }, status=response_message["code"]
+                )
+            return EncodedJsonResponse(
+                PRODUCT_ENCODER.dumps(response_message["product"]))
         except ObjectDoesNotExist as e:
             logging.critical(f"A critical error occurred:{str(e)}",
                              exc_info=True)
@@ -248,17 +287,394 @@ class ProductAPIView(APIView):
                 {"error": str(e)},
                 status=status.HTTP_404_NOT_FOUND
             )
+        except (ParseError, UnsupportedMediaType, ValueError) as e:
+            logging.error(f"Validate error:{str(e)}", exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ProductSearchAPIView(APIView):
+    """
+    A view class that handles the full-text search of products.
+    """
+
+    @inject
+    def __init__(self, product_service: ProductService):
+        super().__init__()
+        self.product_service = product_service
+
+    def get(self, request: request.Request):
+        logger.info("View - search get method:::")
+        try:
+            limit = parse_limit(request.query_params.get("limit"),
+                                AppEnv.SEARCH_DEFAULT_LIMIT,
+                                AppEnv.SEARCH_MAX_LIMIT)
+            fields = PRODUCT_ENCODER.parse_fields(
+                request.query_params.get("fields"))
+            products = self.product_service.search(
+                request.query_params.get("q"), limit, fields)
+            return EncodedJsonResponse(PRODUCT_ENCODER.dumps(products))
+        except MissingIndexError as e:
+            logging.error(f"Missing index:{str(e)}")
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
         except ValueError as e:
+            logging.error(f"Validate error:{str(e)}", exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
             logging.critical(f"A critical error occurred:{str(e)}",
                              exc_info=True)
             return JsonResponse(
-                {"Error": str(e)},
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ProductChangesAPIView(APIView):
+    """
+    A view class that returns the products created, updated or deleted
+    after the 'since' token of a previous call, it lets a mirror stay in
+    sync without reading the whole catalog.
+    """
+
+    compression_levels: dict = AppConstants.Compression.LISTING_LEVELS
+
+    @inject
+    def __init__(self, product_service: ProductService):
+        super().__init__()
+        self.product_service = product_service
+
+    def get(self, request: request.Request):
+        logger.info("View - changes get method:::")
+        try:
+            limit = parse_limit(request.query_params.get("limit"))
+            fields = PRODUCT_ENCODER.parse_fields(
+                request.query_params.get("fields"))
+            changes = self.product_service.query_changes(
+                request.query_params.get("since"), limit, fields)
+            return EncodedJsonResponse(PRODUCT_ENCODER.dumps(changes))
+        except ExpiredWatermarkError as e:
+            logging.error(f"Expired token:{str(e)}")
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_410_GONE
+            )
+        except ValueError as e:
+            logging.error(f"Validate error:{str(e)}", exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
             logging.critical(f"A critical error occurred:{str(e)}",
                              exc_info=True)
             return JsonResponse(
-                {"Error": str(e)},
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ProductBulkCreateAPIView(APIView):
+    """
+    A view class that creates many products in a single request, the body
+    is a JSON array or NDJSON (application/x-ndjson).
+    """
+
+    @inject
+    def __init__(self, product_service: ProductService):
+        super().__init__()
+        self.product_service = product_service
+
+    def post(self, request: request.Request):
+        logger.info("View - bulk create post method:::")
+        try:
+            result = self.product_service.bulk_create(read_rows(request))
+            # 207 tells the client to look at the result of each record.
+            status_code = status.HTTP_201_CREATED if not result["failed"] \
+                else status.HTTP_207_MULTI_STATUS
+            return EncodedJsonResponse(PRODUCT_ENCODER.dumps(result),
+                                       status=status_code)
+        except ValueError as e:
+            logging.error(f"Validate error:{str(e)}", exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ProductBulkUpdateAPIView(APIView):
+    """
+    A view class that applies many partial updates in a single request.
+    The query parameter 'upsert_key' upserts the records by that key and
+    'ordered' stops at the first failed write.
+    """
+
+    @inject
+    def __init__(self, product_service: ProductService):
+        super().__init__()
+        self.product_service = product_service
+
+    def post(self, request: request.Request):
+        logger.info("View - bulk update post method:::")
+        try:
+            ordered = request.query_params.get("ordered")
+            result = self.product_service.bulk_update(
+                read_rows(request),
+                request.query_params.get("upsert_key"),
+                ordered is not None and parse_boolean("ordered", ordered)
+            )
+            status_code = status.HTTP_200_OK \
+                if not result["failed"] and not result["skipped"] \
+                else status.HTTP_207_MULTI_STATUS
+            return EncodedJsonResponse(PRODUCT_ENCODER.dumps(result),
+                                       status=status_code)
+        except ValueError as e:
+            logging.error(f"Validate error:{str(e)}", exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ProductBulkDeleteAPIView(APIView):
+    """
+    A view class that deletes the products selected by the ids of the body,
+    {"ids": [...]}, and/or by the filters of the product listing, e.g.
+    ?department_id=. With '?dry_run=true' the products are only counted.
+    """
+
+    @inject
+    def __init__(self, product_service: ProductService):
+        super().__init__()
+        self.product_service = product_service
+
+    def post(self, request: request.Request):
+        logger.info("View - bulk delete post method:::")
+        try:
+            product_filter = ProductFilter(request.query_params)
+            filters = product_filter.lookups
+            body = json_codec.loads(request.body) if request.body else {}
+            if not isinstance(body, dict):
+                raise ValueError("The body must be a JSON object.")
+            ids = body.get("ids")
+            if ids is not None:
+                if "_id__in" in filters:
+                    raise ValueError("Send the ids either in the body or in "
+                                     "the '_id__in' parameter.")
+                if not isinstance(ids, list):
+                    raise ValueError("The 'ids' field must be a list.")
+                filters = {
+                    **filters,
+                    "_id__in": parse_primary_key_list(
+                        "ids", ",".join(str(id) for id in ids)),
+                }
+            dry_run = request.query_params.get("dry_run")
+            result = self.product_service.bulk_delete(
+                filters,
+                dry_run is not None and parse_boolean("dry_run", dry_run)
+            )
+            return EncodedJsonResponse(PRODUCT_ENCODER.dumps(result))
+        except ValueError as e:
+            logging.error(f"Validate error:{str(e)}", exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ProductStockAPIView(APIView):
+    """
+    A view class that adds signed deltas to the quantity of many products,
+    the body is a JSON array or NDJSON of {'_id', 'delta'} records. The
+    quantity can not go below zero unless 'allow_negative' is true.
+    """
+
+    @inject
+    def __init__(self, product_service: ProductService):
+        super().__init__()
+        self.product_service = product_service
+
+    def post(self, request: request.Request):
+        logger.info("View - stock post method:::")
+        try:
+            allow_negative = request.query_params.get("allow_negative")
+            result = self.product_service.adjust_stock(
+                read_rows(request, AppEnv.STOCK_MAX_ADJUSTMENTS),
+                allow_negative is not None
+                and parse_boolean("allow_negative", allow_negative)
+            )
+            status_code = status.HTTP_200_OK if not result["failed"] \
+                else status.HTTP_207_MULTI_STATUS
+            return EncodedJsonResponse(PRODUCT_ENCODER.dumps(result),
+                                       status=status_code)
+        except ValueError as e:
+            logging.error(f"Validate error:{str(e)}", exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ProductAsyncAPIView(AsyncAPIView):
+    """
+    This view serves the product listing, creation and deletion natively
+    under ASGI, the Mongo queries and the reference checks are awaited
+    instead of holding a worker thread.
+    """
+
+    compression_levels: dict = AppConstants.Compression.LISTING_LEVELS
+
+    @inject
+    def __init__(self, product_service: ProductAsyncService, **kwargs):
+        super().__init__(**kwargs)
+        self.product_service = product_service
+
+    async def post(self, request):
+        logger.info("View - async post method ")
+        try:
+            serialized_request = InSerializer(
+                data=json_codec.loads(request.body), many=False)
+            if not serialized_request.is_valid():
+                return JsonResponse(
+                    {"error": serialized_request.errors},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            response_message = await self.product_service.create(
+                serialized_request.validated_data)
+            if response_message["code"] != 201:
+                return JsonResponse(
+                    {
+                        "message": response_message["message"]
+                    }, status=response_message["code"]
+                )
+            return EncodedJsonResponse(
+                PRODUCT_ENCODER.dumps(response_message["product"]),
+                status=status.HTTP_201_CREATED
+            )
+        except ValueError as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    async def get(self, request):
+        logger.info("View - async get method:::")
+        try:
+            id: str = request.GET.get("id")
+            limit: str = request.GET.get("limit")
+            after: str = request.GET.get("after")
+            fields = PRODUCT_ENCODER.parse_fields(request.GET.get("fields"))
+
+            if id is not None:
+                content = await self.product_service.query_by_id(id, fields)
+                return EncodedJsonResponse(PRODUCT_ENCODER.dumps(content))
+            product_filter = ProductFilter(request.GET)
+            if limit is not None or after is not None:
+                sort_key = request.GET.get(
+                    "sort", AppConstants.Pagination.DEFAULT_SORT_KEY)
+                content = await self.product_service.query_page(
+                    product_filter.lookups, sort_key, after,
+                    parse_limit(limit), fields)
+                return EncodedJsonResponse(PRODUCT_ENCODER.dumps(content))
+            content = await self.product_service.query_by_filters(
+                product_filter.lookups, fields)
+            if product_filter and not content:
+                return JsonResponse({
+                    "error": "There is no records "
+                             "that show."},
+                    status=status.HTTP_404_NOT_FOUND)
+            return EncodedJsonResponse(PRODUCT_ENCODER.dumps(content))
+        except ObjectDoesNotExist as e:
+            logging.critical(f"A critical error occurred: {str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except ValueError as e:
+            logging.error(f"Validate error:{str(e)}", exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    async def delete(self, request):
+        logger.info("View - async delete method::")
+        try:
+            await self.product_service.delete(request.GET.get("id"))
+            return JsonResponse(
+                {"message": msg.SUCCESSFUL_DELETION_MESSAGE},
+                status=status.HTTP_200_OK
+            )
+        except ObjectDoesNotExist as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
@@ -0,0 +1,37 @@
+from django.apps import apps
+from django.views import View
+
+
+class AsyncAPIView(View):
+    """
+    This class is the base of the views served natively under ASGI, every
+    handler method must be a coroutine.
+
+    django_injector wraps the class based views with a synchronous
+    function, which would run the coroutines in a thread. as_view returns
+    a coroutine function instead and builds the view with the injector of
+    the application, so the dependencies are injected as in the APIView
+    classes.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        for key in initkwargs:
+            if not hasattr(cls, key):
+                raise TypeError(f"{cls.__name__}() received an invalid "
+                                f"keyword {key!r}.")
+
+        async def view(request, *args, **kwargs):
+            injector = apps.get_app_config("django_injector").injector
+            self = injector.create_object(cls, additional_kwargs=initkwargs)
+            self.setup(request, *args, **kwargs)
+            return await self.dispatch(request, *args, **kwargs)
+
+        # The views are called by other services, as the APIView ones.
+        view.csrf_exempt = True
+        view.view_class = cls
+        view.view_initkwargs = initkwargs
+        view.__doc__ = cls.__doc__
+        view.__module__ = cls.__module__
+        view.__name__ = cls.__name__
+        return view
@@ -0,0 +1,44 @@
+from typing import Iterator, List
+
+from rest_framework import request
+
+from . import json_codec
+from .env import AppEnv
+from .streaming import NDJSON_CONTENT_TYPE
+
+
+def read_rows(request: request.Request,
+              max_rows: int = AppEnv.BULK_MAX_ROWS) -> List:
+    """
+    This function reads the records of a bulk request, the body is a JSON
+    array or, with the NDJSON content type, one JSON document per line.
+    :param request: Request received by the view.
+    :param max_rows: Maximum number of records accepted in a request.
+    :return: The records, they are validated one by one by the caller.
+    """
+    if NDJSON_CONTENT_TYPE in request.content_type:
+        rows = []
+        for number, line in enumerate(request.body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                rows.append(json_codec.loads(line))
+            except json_codec.JSONDecodeError:
+                raise ValueError(f"The line {number} is not a valid JSON "
+                                 f"document.")
+    else:
+        rows = json_codec.loads(request.body)
+        if not isinstance(rows, list):
+            raise ValueError("The body must be a JSON array of records.")
+    if not rows:
+        raise ValueError("The body does not contain any record.")
+    if len(rows) > max_rows:
+        raise ValueError(f"A bulk request accepts at most {max_rows} "
+                         f"records.")
+    return rows
+
+
+def batches(items: list, size: int = AppEnv.BULK_BATCH_SIZE
+            ) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
@@ -0,0 +1,237 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+
+class TTLCache:
+    """
+    This class is a thread safe cache bounded by size. Every entry expires
+    after its TTL and, when the cache is full, the least recently used
+    entry is evicted.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        :param max_size: Maximum number of entries.
+        :param ttl: Default time to live of the entries, in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        :return: Tuple with a flag that tells if the key was found and its
+        value, the value can be None.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class ResponseCache:
+    """
+    This class is a thread safe cache of encoded responses bounded by the
+    total size of their content. Every entry expires after the TTL, when
+    the cache is full the least recently used entries are evicted.
+
+    Each entry is stored with tags that describe the records it contains,
+    a write invalidates the entries of the tags it affects only.
+
+    An expired entry is kept for 'max_staleness' seconds more, during that
+    time it is returned as stale so it can be served while it is refreshed.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, max_entry_bytes: int,
+                 max_staleness: float = 0):
+        """
+        :param max_bytes: Maximum size of the cached content, in bytes.
+        :param ttl: Time to live of the entries, in seconds.
+        :param max_entry_bytes: Larger responses are not cached, so a single
+        listing does not evict every other entry.
+        :param max_staleness: Seconds after the TTL during which the entries
+        are still returned as stale, 0 disables it.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self.max_staleness = max_staleness
+        self._entries: OrderedDict = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._refreshing: Set[Hashable] = set()
+        self._size = 0
+        self._lock = threading.Lock()
+        # Incremented by every invalidation, a response read before an
+        # invalidation may contain the old records and is not stored.
+        self.generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.refreshes = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Tuple[Any, bool]:
+        """
+        :return: Tuple with the cached value, or None when the key was not
+        found, and a flag that tells if the value is stale.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at = entry[0]
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], False
+                if expires_at + self.max_staleness > now:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    return entry[1], True
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+            return None, False
+
+    def begin_refresh(self, key: Hashable) -> bool:
+        """
+        This method registers the refresh of a stale entry.
+        :return: False if the entry is already being refreshed.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self.refreshes += 1
+            return True
+
+    def end_refresh(self, key: Hashable):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def set(self, key: Hashable, value: Any, size: int,
+            tags: Iterable[str], generation: int) -> bool:
+        """
+        :param size: Size of the value, in bytes.
+        :param tags: Tags that invalidate the entry.
+        :param generation: Value of 'generation' before the value was read.
+        :return: True if the value was stored.
+        """
+        if size > self.max_entry_bytes or size > self.max_bytes:
+            return False
+        tags = frozenset(tags)
+        with self._lock:
+            if generation != self.generation:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, size,
+                                  tags)
+            self._size += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self.stores += 1
+            return True
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                for key in tuple(self._tags.get(tag, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._tags.clear()
+            self._size = 0
+
+    def _remove(self, key: Hashable):
+        """
+        This method removes an entry and its tags, the lock must be held.
+        """
+        expires_at, value, size, tags = self._entries.pop(key)
+        self._size -= size
+        for tag in tags:
+            keys = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "tags": len(self._tags),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "stale_hits": self.stale_hits,
+                "stores": self.stores,
+                "refreshes": self.refreshes,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,221 @@
+import abc
+import gzip
+import re
+import threading
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from . import metrics
+from .env import AppEnv
+
+try:
+    import zstandard
+except ImportError:
+    # zstd is optional, without it the responses are compressed with gzip.
+    zstandard = None
+
+# Media types whose content is compressed, the JSON listings and streams.
+COMPRESSIBLE_TYPES: tuple = ("application/json", "application/x-ndjson",
+                             "text/")
+
+_accept_encoding_re = re.compile(
+    r"\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*(?:,|$)")
+
+
+class Codec(abc.ABC):
+    """
+    This interface compresses the content of a response with the encoding
+    of its name.
+    """
+
+    name: str
+
+    @abc.abstractmethod
+    def compress(self, content: bytes, level: int) -> bytes:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def compress_stream(self, chunks: Iterable[bytes],
+                        level: int) -> Iterator[bytes]:
+        """
+        This method compresses a stream, the output of each chunk is
+        flushed so the client can decode the records received so far.
+        """
+        raise NotImplementedError
+
+
+class GzipCodec(Codec):
+    name = "gzip"
+
+    def compress(self, content: bytes, level: int) -> bytes:
+        return gzip.compress(content, compresslevel=level, mtime=0)
+
+    def compress_stream(self, chunks: Iterable[bytes],
+                        level: int) -> Iterator[bytes]:
+        # A window of 31 bits writes the gzip header and trailer.
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + \
+                compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class ZstdCodec(Codec):
+    name = "zstd"
+
+    def compress(self, content: bytes, level: int) -> bytes:
+        # The compressors are not thread safe, one is built per response.
+        return zstandard.ZstdCompressor(level=level).compress(content)
+
+    def compress_stream(self, chunks: Iterable[bytes],
+                        level: int) -> Iterator[bytes]:
+        compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk) + \
+                compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def available_codecs(encodings: str) -> List[Codec]:
+    """
+    This function returns the codecs of the configured encodings in order
+    of preference, zstd is skipped when the 'zstandard' package is not
+    installed.
+    """
+    codecs = {"gzip": GzipCodec}
+    if zstandard is not None:
+        codecs["zstd"] = ZstdCodec
+    return [codecs[name]() for name in
+            (item.strip() for item in encodings.split(","))
+            if name in codecs]
+
+
+def negotiate(accept_encoding: str,
+              codecs: List[Codec]) -> Optional[Codec]:
+    """
+    This function chooses the codec with the highest quality in the
+    Accept-Encoding header, the ties are resolved by the server preference.
+    :return: The codec, or None when the content must not be encoded.
+    """
+    qualities = {}
+    for name, quality in _accept_encoding_re.findall(accept_encoding):
+        try:
+            qualities[name.lower()] = float(quality) if quality else 1.0
+        except ValueError:
+            continue
+    best, best_quality = None, 0.0
+    for codec in codecs:
+        quality = qualities.get(codec.name, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
+
+
+class CompressionStats:
+    """
+    This class counts the bytes before and after the compression of the
+    responses that are not streamed, by encoding.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def add(self, encoding: str, original: int, compressed: int):
+        with self._lock:
+            counters = self._counters.setdefault(
+                encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0,
+                           "streams": 0})
+            if original < 0:
+                counters["streams"] += 1
+                return
+            counters["responses"] += 1
+            counters["bytes_in"] += original
+            counters["bytes_out"] += compressed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                encoding: dict(
+                    counters,
+                    ratio=counters["bytes_out"] / counters["bytes_in"]
+                    if counters["bytes_in"] else 0.0)
+                for encoding, counters in self._counters.items()
+            }
+
+
+COMPRESSION_STATS = CompressionStats()
+metrics.register("compression", COMPRESSION_STATS.stats)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    This middleware compresses the responses with the best encoding that
+    the client accepts, zstd or gzip. The streamed listings are compressed
+    chunk by chunk.
+
+    A view can tune the level per encoding with a 'compression_levels'
+    class attribute, e.g. {'gzip': 6, 'zstd': 6}, the other views use the
+    configured defaults.
+
+    As GZipMiddleware, it is built on MiddlewareMixin so it runs in the
+    sync and async request paths.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.codecs = available_codecs(AppEnv.COMPRESSION_ENCODINGS)
+        self.default_levels = {"gzip": AppEnv.COMPRESSION_GZIP_LEVEL,
+                               "zstd": AppEnv.COMPRESSION_ZSTD_LEVEL}
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        request.compression_levels = getattr(view_class,
+                                             "compression_levels", None)
+
+    def process_response(self, request, response):
+        if not self.codecs or response.has_header("Content-Encoding") \
+                or response.status_code in (204, 304):
+            return response
+        if not response.get("Content-Type", "").startswith(
+                COMPRESSIBLE_TYPES):
+            return response
+        if not response.streaming \
+                and len(response.content) < AppEnv.COMPRESSION_MIN_SIZE:
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        codec = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""),
+                          self.codecs)
+        if codec is None:
+            return response
+        levels = getattr(request, "compression_levels", None) or {}
+        level = levels.get(codec.name, self.default_levels[codec.name])
+
+        if response.streaming:
+            response.streaming_content = codec.compress_stream(
+                response.streaming_content, level)
+            del response["Content-Length"]
+            COMPRESSION_STATS.add(codec.name, -1, -1)
+        else:
+            original = len(response.content)
+            compressed = codec.compress(response.content, level)
+            if len(compressed) >= original:
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+            COMPRESSION_STATS.add(codec.name, original, len(compressed))
+
+        # The compressed representation is not byte for byte the same, as
+        # GZipMiddleware does the ETag is made weak.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = codec.name
+        return response
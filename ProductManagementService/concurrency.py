@@ -0,0 +1,146 @@
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from .env import AppEnv
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> Optional[ThreadPoolExecutor]:
+    """
+    This function returns the thread pool shared by the process to run
+    independent blocking calls, e.g. requests to other services, at the
+    same time. It returns None when REFERENCE_CHECK_WORKERS is 0.
+    """
+    global _executor
+    if AppEnv.REFERENCE_CHECK_WORKERS <= 0:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=AppEnv.REFERENCE_CHECK_WORKERS,
+                    thread_name_prefix="reference-check",
+                )
+    return _executor
+
+
+def get_refresh_executor() -> ThreadPoolExecutor:
+    """
+    This function returns the thread pool that reads again the stale
+    responses of the cache, it is separate so a slow database does not
+    block the reference checks.
+    """
+    global _refresh_executor
+    if _refresh_executor is None:
+        with _executor_lock:
+            if _refresh_executor is None:
+                _refresh_executor = ThreadPoolExecutor(
+                    max_workers=max(AppEnv.RESPONSE_CACHE_REFRESH_WORKERS,
+                                    1),
+                    thread_name_prefix="response-refresh",
+                )
+    return _refresh_executor
+
+
+def run_concurrently(executor: Optional[ThreadPoolExecutor],
+                     calls: List[Callable[[], Any]]) -> List[Any]:
+    """
+    This function runs the calls in the pool and waits for all of them.
+    :return: The results in the order of the calls. If a call raised an
+    exception, the first one in that order is raised, as it would be if
+    the calls were run one after the other.
+    """
+    if executor is None or len(calls) < 2:
+        return [call() for call in calls]
+    # The ORM connections of the pool threads are left open: djongo shares
+    # one MongoClient per database between them, and closing a connection
+    # closes that client under every other thread.
+    futures = [executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+
+class SingleFlight:
+    """
+    This class coalesces the identical calls that run at the same time in
+    the process, the first one runs the function and the others wait for
+    its result. The results are not kept, a call that starts after the
+    first one finished runs the function again.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        :param key: Identifies the call, e.g. the method and its arguments.
+        :param function: Function that computes the result.
+        :return: The result of the function, shared by every caller that
+        used the same key while it ran, so it must not be modified.
+        """
+        with self._lock:
+            self.calls += 1
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+
+    def forget(self):
+        """
+        This method stops sharing the calls in progress, the calls that
+        start after a write do not receive a result read before it.
+        """
+        with self._lock:
+            self._calls.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "shared": self.shared,
+                "shared_ratio": self.shared / self.calls if self.calls
+                else 0.0,
+                "in_flight": len(self._calls),
+            }
+
+
+def coalesced(flight: SingleFlight) -> Callable:
+    """
+    This decorator shares the result of a service method between the
+    identical calls in progress, the key is the name of the method and the
+    representation of its arguments.
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(service, *args, **kwargs):
+            if not AppEnv.QUERY_COALESCING:
+                return method(service, *args, **kwargs)
+            key = (method.__name__, repr(args), repr(sorted(kwargs.items())))
+            return flight.do(key, functools.partial(method, service, *args,
+                                                    **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,55 @@
+import functools
+import hashlib
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+from bson.errors import InvalidId
+from django.utils.cache import get_conditional_response
+from rest_framework import request
+
+
+def make_etag(request: request.Request,
+              version: Tuple[int, Optional[datetime]]) -> str:
+    """
+    This function returns a strong ETag for the response of a GET, the
+    representation only depends on the records and on the query string.
+    :param request: Request received by the view.
+    :param version: Number of records and most recent update date.
+    """
+    count, last_update = version
+    source = f"{count}|{last_update.isoformat() if last_update else ''}|" \
+             f"{request.get_full_path()}"
+    return f'"{hashlib.sha1(source.encode("utf-8")).hexdigest()}"'
+
+
+def conditional_get(get_version: Callable) -> Callable:
+    """
+    This decorator answers the GET of a view with 304 Not Modified when the
+    If-None-Match header contains the current ETag, so the records are not
+    queried nor serialized.
+    :param get_version: Method of the view that receives the request and
+    returns the version of the records it would return, or None when the
+    response can not be validated, e.g. a stream.
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(view, request: request.Request, *args, **kwargs):
+            try:
+                version = get_version(view, request)
+            except (ValueError, InvalidId):
+                # The view answers the invalid parameters.
+                version = None
+            if version is None:
+                return method(view, request, *args, **kwargs)
+            # The version is read before the records, if they change in
+            # between the next request receives them again.
+            etag = make_etag(request, version)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+                if not 200 <= response.status_code < 300:
+                    return response
+            response["ETag"] = etag
+            return response
+        return wrapper
+    return decorator
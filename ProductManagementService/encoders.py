@@ -0,0 +1,119 @@
+from typing import Any, Callable, Iterable, Optional
+
+from django.http import HttpResponse
+from rest_framework import status
+
+from . import json_codec
+
+JSON_CONTENT_TYPE: str = "application/json"
+
+
+class ModelEncoder:
+    """
+    This class converts model instances, or raw Mongo documents, to the
+    output representation without running a serializer validation.
+
+    The conversion functions are generated once per model, so each record is
+    converted with a single dictionary literal instead of a loop over the
+    fields. The ids and dates are kept as they are, the JSON codec writes
+    them when the content is dumped.
+    """
+
+    def __init__(self, fields: tuple, required_fields: tuple = ("_id",)):
+        """
+        :param fields: The output fields, in output order.
+        :param required_fields: The fields that are always included when a
+        subset of the fields is requested. They are written as the other
+        fields.
+        """
+        self.fields = fields
+        self.required_fields = required_fields
+        self._subsets: dict = {}
+        self.from_model: Callable[[Any], dict] = self._compile(
+            "object_model.{field}")
+        self.from_document: Callable[[dict], dict] = self._compile(
+            "object_model.get('{field}')")
+
+    def _compile(self, accessor: str) -> Callable[[Any], dict]:
+        items = [f"{field!r}: {accessor.format(field=field)}"
+                 for field in self.fields]
+        source = (
+            "def convert(object_model):\n"
+            f"    return {{{', '.join(items)}}}\n"
+        )
+        namespace = {}
+        exec(compile(source, f"<{self.__class__.__name__}>", "exec"),
+             namespace)
+        return namespace["convert"]
+
+    def parse_fields(self, raw_fields: Optional[str]) -> Optional[tuple]:
+        """
+        This method validates the 'fields' query parameter.
+        :param raw_fields: Comma separated field names, it can be None.
+        :return: The requested fields in output order, the required fields
+        are always included, or None when all the fields were requested.
+        """
+        if not raw_fields:
+            return None
+        requested = {field.strip() for field in raw_fields.split(",")
+                     if field.strip()}
+        unknown = requested.difference(self.fields)
+        if unknown:
+            raise ValueError(
+                f"Unknown fields: {', '.join(sorted(unknown))}.")
+        requested.update(self.required_fields)
+        return tuple(field for field in self.fields if field in requested)
+
+    def subset(self, fields: Optional[tuple]) -> "ModelEncoder":
+        """
+        This method returns an encoder restricted to the given fields, the
+        encoders are compiled once per fieldset.
+        """
+        if fields is None or fields == self.fields:
+            return self
+        encoder = self._subsets.get(fields)
+        if encoder is None:
+            encoder = ModelEncoder(fields=fields,
+                                   required_fields=self.required_fields)
+            self._subsets[fields] = encoder
+        return encoder
+
+    def dumps(self, content: Any) -> bytes:
+        """
+        This method writes a dictionary, or a list of dictionaries, as JSON
+        bytes.
+        """
+        return json_codec.dumps(content)
+
+    def dumps_models(self, object_models: Iterable) -> bytes:
+        """
+        This method converts and writes a list of model instances in a
+        single pass.
+        """
+        return self.dumps([self.from_model(obj) for obj in object_models])
+
+
+class EncodedJsonResponse(HttpResponse):
+    """
+    This class is a JSON response whose content was already encoded.
+    """
+
+    def __init__(self, content: bytes, status: int = status.HTTP_200_OK,
+                 **kwargs):
+        kwargs.setdefault("content_type", JSON_CONTENT_TYPE)
+        super().__init__(content=content, status=status, **kwargs)
+
+
+class JsonResponse(EncodedJsonResponse):
+    """
+    This class has the interface of django's JsonResponse, the content is
+    written with the JSON codec, so the ids and dates of the records are
+    accepted as they are.
+    """
+
+    def __init__(self, data: Any, status: int = status.HTTP_200_OK,
+                 safe: bool = True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be "
+                            "serialized set the safe parameter to False.")
+        super().__init__(json_codec.dumps(data), status=status, **kwargs)
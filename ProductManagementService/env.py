@@ -4,6 +4,48 @@ import os
 class AppEnv:
     LOGGING_LEVEL: str = os.getenv("LOGGING_LEVEL", "INFO")
 
+    # Data access layer, 'djongo' (ORM) or 'pymongo' (direct driver calls).
+    MONGO_OPS_DRIVER: str = os.getenv("MONGO_OPS_DRIVER", "djongo")
+
+    # Validation of the product references, 'local' (services of this
+    # process) or 'http' (api rest of a separate deployment).
+    REFERENCE_VALIDATION: str = os.getenv("REFERENCE_VALIDATION", "local")
+
+    # Cache of the department and unit measure checks, a size of 0 disables
+    # it. The TTLs are in seconds, the negative one applies to the ids that
+    # were not found.
+    REFERENCE_CACHE_SIZE: int = int(os.getenv("REFERENCE_CACHE_SIZE", "1024"))
+    REFERENCE_CACHE_TTL: float = float(
+        os.getenv("REFERENCE_CACHE_TTL", "300"))
+    REFERENCE_CACHE_NEGATIVE_TTL: float = float(
+        os.getenv("REFERENCE_CACHE_NEGATIVE_TTL", "30"))
+
+    # Cache of the GET responses, a size of 0 disables it. The writes only
+    # invalidate the entries of the process that received them, so the TTL,
+    # in seconds, bounds how long the other processes serve the old ones.
+    RESPONSE_CACHE_MAX_BYTES: int = int(
+        os.getenv("RESPONSE_CACHE_MAX_BYTES", "33554432"))
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = int(
+        os.getenv("RESPONSE_CACHE_MAX_ENTRY_BYTES", "1048576"))
+    RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+    # Stale-while-revalidate, 0 disables it. For this many seconds after the
+    # TTL an entry is still returned, marked as stale, while a background
+    # thread reads it again, so the GETs answer while Mongo is unavailable.
+    RESPONSE_CACHE_MAX_STALENESS: float = float(
+        os.getenv("RESPONSE_CACHE_MAX_STALENESS", "0"))
+    RESPONSE_CACHE_REFRESH_WORKERS: int = int(
+        os.getenv("RESPONSE_CACHE_REFRESH_WORKERS", "2"))
+
+    # Threads used to check the references of the products concurrently,
+    # 0 checks them one after the other.
+    REFERENCE_CHECK_WORKERS: int = int(
+        os.getenv("REFERENCE_CHECK_WORKERS", "16"))
+
+    # Identical queries that run at the same time share a single database
+    # call, 'true' or 'false'.
+    QUERY_COALESCING: bool = os.getenv("QUERY_COALESCING",
+                                       "true").lower() == "true"
+
     # Api rest services.
     QUERY_UNIT_MEASURE_BY_ID: str = (
         os.getenv("QUERY_UNIT_MEASURE_BY_ID",
@@ -11,3 +53,61 @@ class AppEnv:
     QUERY_DEPARTMENT_BY_ID: str = (
         os.getenv("QUERY_DEPARTMENT_BY_ID",
                   "http://127.0.0.1:8000/departments/"))
+
+    # HTTP client of the api rest services, the times are in seconds.
+    HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", "10"))
+    HTTP_CONNECT_TIMEOUT: float = float(
+        os.getenv("HTTP_CONNECT_TIMEOUT", "2"))
+    HTTP_READ_TIMEOUT: float = float(os.getenv("HTTP_READ_TIMEOUT", "5"))
+    HTTP_RETRIES: int = int(os.getenv("HTTP_RETRIES", "2"))
+    HTTP_BACKOFF_FACTOR: float = float(
+        os.getenv("HTTP_BACKOFF_FACTOR", "0.1"))
+    HTTP_BACKOFF_JITTER: float = float(
+        os.getenv("HTTP_BACKOFF_JITTER", "0.1"))
+    CIRCUIT_FAILURE_THRESHOLD: int = int(
+        os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_TIMEOUT: float = float(
+        os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+    # Pagination.
+    PAGINATION_DEFAULT_LIMIT: int = int(
+        os.getenv("PAGINATION_DEFAULT_LIMIT", "100"))
+    PAGINATION_MAX_LIMIT: int = int(os.getenv("PAGINATION_MAX_LIMIT", "1000"))
+
+    # Streaming.
+    STREAM_BATCH_SIZE: int = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+
+    # Response compression, the encodings are in order of preference and
+    # an empty list disables it. zstd needs the 'zstandard' package. The
+    # smaller responses are sent as they are.
+    COMPRESSION_ENCODINGS: str = os.getenv("COMPRESSION_ENCODINGS",
+                                           "zstd,gzip")
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE",
+                                              "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL",
+                                                "6"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL",
+                                                "3"))
+
+    # JSON codec of the requests and responses: 'auto' uses orjson when it
+    # is installed, 'orjson' or 'stdlib' force one of them.
+    JSON_CODEC: str = os.getenv("JSON_CODEC", "auto")
+
+    # Search.
+    SEARCH_DEFAULT_LIMIT: int = int(os.getenv("SEARCH_DEFAULT_LIMIT", "20"))
+    SEARCH_MAX_LIMIT: int = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+
+    # Bulk operations.
+    BULK_BATCH_SIZE: int = int(os.getenv("BULK_BATCH_SIZE", "1000"))
+    BULK_MAX_ROWS: int = int(os.getenv("BULK_MAX_ROWS", "100000"))
+
+    # Changes feed, the times are in seconds. The changes more recent than
+    # the settle lag are not returned yet, so the writes in flight, whose
+    # date was set by the clock of another server, are not skipped.
+    CHANGES_SETTLE_LAG: float = float(os.getenv("CHANGES_SETTLE_LAG", "5"))
+    TOMBSTONE_RETENTION: int = int(os.getenv("TOMBSTONE_RETENTION",
+                                             "2592000"))
+
+    # Stock adjustments.
+    STOCK_MAX_ADJUSTMENTS: int = int(os.getenv("STOCK_MAX_ADJUSTMENTS",
+                                               "1000"))
@@ -0,0 +1,162 @@
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .env import AppEnv
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a request is rejected because the circuit breaker of the
+    upstream service is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    This class stops calling an unhealthy service. After failure_threshold
+    consecutive failures the circuit opens and the calls fail fast, once
+    reset_timeout seconds have passed a single trial call is let through
+    (half open), its result closes or opens the circuit again.
+    """
+    CLOSED: str = "closed"
+    OPEN: str = "open"
+    HALF_OPEN: str = "half_open"
+
+    def __init__(self,
+                 failure_threshold: int = AppEnv.CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = AppEnv.CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            elapsed = time.monotonic() - self.opened_at
+            if self.state == self.OPEN and elapsed >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN \
+                    or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
+
+
+class HttpClient:
+    """
+    This class sends the requests to an upstream service through a
+    keep-alive connection pool, with connect and read timeouts, bounded
+    retries with jittered backoff and a circuit breaker.
+    """
+
+    def __init__(self, pool_size: int = AppEnv.HTTP_POOL_SIZE,
+                 connect_timeout: float = AppEnv.HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = AppEnv.HTTP_READ_TIMEOUT,
+                 retries: int = AppEnv.HTTP_RETRIES,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.breaker = breaker or CircuitBreaker()
+        self.adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=AppEnv.HTTP_BACKOFF_FACTOR,
+                backoff_jitter=AppEnv.HTTP_BACKOFF_JITTER,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=("GET",),
+                raise_on_status=False,
+            ),
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: Optional[dict] = None
+            ) -> requests.Response:
+        """
+        :raise CircuitOpenError: The upstream service is unhealthy.
+        :raise requests.RequestException: The request failed after the
+        retries, e.g. a timeout.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"The circuit of {url} is open.")
+        with self._lock:
+            self.requests += 1
+        try:
+            response = self.session.get(url, params=params,
+                                        timeout=self.timeout)
+        except requests.RequestException:
+            with self._lock:
+                self.errors += 1
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Any other error must also release the half open trial, or the
+            # circuit would reject every call from then on.
+            self.breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def stats(self) -> dict:
+        pools = []
+        for key in self.adapter.poolmanager.pools.keys():
+            pool = self.adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            pools.append({
+                "host": f"{pool.scheme}://{pool.host}:{pool.port}",
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle_connections": pool.pool.qsize() if pool.pool else 0,
+                "max_size": self.pool_size,
+            })
+        with self._lock:
+            counters = {"requests": self.requests, "errors": self.errors}
+        return dict(counters, pools=pools, circuit=self.breaker.stats())
@@ -0,0 +1,148 @@
+from dataclasses import dataclass, field
+from importlib import import_module
+from typing import List, Tuple
+
+from django.apps import apps
+from pymongo import TEXT
+from pymongo.collection import Collection
+
+from .mongo import get_collection
+
+# The options of an existing index that are compared with the spec.
+COMPARED_OPTIONS: tuple = ("unique", "sparse", "partialFilterExpression",
+                           "expireAfterSeconds", "weights",
+                           "default_language")
+
+# The indexes that Mongo and djongo create themselves, they are never
+# reported as extra nor dropped.
+UNMANAGED_INDEXES: tuple = ("_id_", "__primary_key__")
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """
+    This class declares an index that a query path needs.
+
+    Fields:
+    - name: The name of the index in Mongo.
+    - keys: Tuple of (field, direction) pairs, as expected by create_index.
+    - options: Extra create_index options, e.g. unique or weights.
+    - serves: Description of the view queries that use the index.
+    """
+    name: str
+    keys: Tuple[Tuple[str, object], ...]
+    options: dict = field(default_factory=dict)
+    serves: Tuple[str, ...] = ()
+
+
+@dataclass
+class IndexReport:
+    collection: str
+    name: str
+    status: str
+    serves: Tuple[str, ...] = ()
+
+
+def _key_signature(keys: list) -> tuple:
+    """
+    This function returns a comparable representation of the index keys.
+    Mongo stores the fields of a text index as '_fts'/'_ftsx' keys, so every
+    text field is replaced by a single marker and the fields are compared
+    through the weights.
+    """
+    signature = []
+    for key, direction in keys:
+        if key == "_fts" or direction == TEXT:
+            if ("$text", TEXT) not in signature:
+                signature.append(("$text", TEXT))
+        elif key != "_ftsx":
+            signature.append((key, direction))
+    return tuple(signature)
+
+
+def _matches(spec: IndexSpec, info: dict) -> bool:
+    if _key_signature(list(spec.keys)) != _key_signature(info["key"]):
+        return False
+    for option in COMPARED_OPTIONS:
+        expected = spec.options.get(option)
+        actual = info.get(option)
+        if option == "default_language" and expected is None:
+            continue
+        if option in ("unique", "sparse"):
+            expected, actual = bool(expected), bool(actual)
+        if expected != actual:
+            return False
+    return True
+
+
+def discover() -> List[Tuple[object, Tuple[IndexSpec, ...]]]:
+    """
+    This function imports the 'indexes' module of every installed app, each
+    module declares MODEL and INDEXES, and OTHER_MODELS with the (model,
+    indexes) pairs of the other models of the app, if any.
+    """
+    specs = []
+    for app_config in apps.get_app_configs():
+        try:
+            module = import_module(f"{app_config.name}.indexes")
+        except ModuleNotFoundError as e:
+            if e.name != f"{app_config.name}.indexes":
+                raise
+            continue
+        specs.append((module.MODEL, module.INDEXES))
+        specs.extend(getattr(module, "OTHER_MODELS", ()))
+    return specs
+
+
+def sync_collection(collection: Collection, specs: Tuple[IndexSpec, ...],
+                    apply: bool = True,
+                    drop_extra: bool = False) -> List[IndexReport]:
+    """
+    This function compares the indexes of a collection with their specs.
+    :param collection: Collection to verify.
+    :param specs: Declared indexes.
+    :param apply: Create the missing indexes and rebuild the ones whose
+    definition drifted, otherwise only report them.
+    :param drop_extra: Drop the indexes that are not declared.
+    :return: One report per declared or extra index, the status is one of
+    ok, created, missing, rebuilt, drift, extra or dropped.
+    """
+    existing = collection.index_information()
+    reports = []
+    for spec in specs:
+        info = existing.pop(spec.name, None)
+        if info is None:
+            status = "missing"
+            if apply:
+                collection.create_index(list(spec.keys), name=spec.name,
+                                        **spec.options)
+                status = "created"
+        elif not _matches(spec, info):
+            status = "drift"
+            if apply:
+                collection.drop_index(spec.name)
+                collection.create_index(list(spec.keys), name=spec.name,
+                                        **spec.options)
+                status = "rebuilt"
+        else:
+            status = "ok"
+        reports.append(IndexReport(collection.name, spec.name, status,
+                                   spec.serves))
+    for name in existing:
+        if name in UNMANAGED_INDEXES:
+            continue
+        status = "extra"
+        if drop_extra:
+            collection.drop_index(name)
+            status = "dropped"
+        reports.append(IndexReport(collection.name, name, status))
+    return reports
+
+
+def sync_all(apply: bool = True,
+             drop_extra: bool = False) -> List[IndexReport]:
+    reports = []
+    for model, specs in discover():
+        reports.extend(sync_collection(get_collection(model), specs, apply,
+                                       drop_extra))
+    return reports
@@ -0,0 +1,21 @@
+import threading
+from typing import Callable, Dict
+
+_sources: Dict[str, Callable[[], dict]] = {}
+_sources_lock = threading.Lock()
+
+
+def register(name: str, source: Callable[[], dict]):
+    """
+    This function publishes the metrics of a component.
+    :param name: Name of the group of metrics, e.g. 'department_cache'.
+    :param source: Function that returns the current values.
+    """
+    with _sources_lock:
+        _sources[name] = source
+
+
+def collect() -> Dict[str, dict]:
+    with _sources_lock:
+        sources = sorted(_sources.items())
+    return {name: source() for name, source in sources}
@@ -0,0 +1,211 @@
+import asyncio
+import re
+import threading
+import weakref
+from datetime import datetime
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from pymongo import DESCENDING, MongoClient, ReturnDocument
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:
+    # motor is only needed by the async views.
+    AsyncIOMotorClient = None
+
+# Code of the write errors caused by a unique index.
+DUPLICATE_KEY_ERROR: int = 11000
+
+_client: MongoClient = None
+_client_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_client() -> MongoClient:
+    """
+    This function returns the pymongo client shared by the whole process,
+    it is created with the same CLIENT options that djongo uses.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                config = settings.DATABASES["default"]
+                _client = MongoClient(**config.get("CLIENT", {}))
+    return _client
+
+
+def get_database() -> Database:
+    return get_client()[settings.DATABASES["default"]["NAME"]]
+
+
+def get_collection(model) -> Collection:
+    """
+    This function returns the collection where djongo stores the model.
+    """
+    return get_database()[model._meta.db_table]
+
+
+def get_async_client():
+    """
+    This function returns the motor client of the running event loop, motor
+    binds a client to the loop where it is created. Under ASGI there is a
+    single loop per worker, so the client is shared by every request.
+    """
+    if AsyncIOMotorClient is None:
+        raise ImproperlyConfigured("The async views need the 'motor' "
+                                   "package.")
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        config = settings.DATABASES["default"]
+        client = AsyncIOMotorClient(io_loop=loop, **config.get("CLIENT", {}))
+        _async_clients[loop] = client
+    return client
+
+
+def get_async_collection(model):
+    database = get_async_client()[settings.DATABASES["default"]["NAME"]]
+    return database[model._meta.db_table]
+
+
+_OPERATORS: dict = {
+    "gt": "$gt",
+    "gte": "$gte",
+    "lt": "$lt",
+    "lte": "$lte",
+    "in": "$in",
+}
+
+
+def lookups_to_query(lookups: dict) -> dict:
+    """
+    This function translates ORM lookups, e.g. the ones built by
+    ProductFilter, into a Mongo filter document keeping their order.
+    :param lookups: Dictionary like {'quantity__lte': 5, 'name__icontains':
+    'kg'}.
+    :return: The equivalent Mongo query.
+    """
+    query = {}
+    for lookup, value in lookups.items():
+        field, _, operator = lookup.partition("__")
+        if not operator:
+            condition = value
+        elif operator == "icontains":
+            condition = {"$regex": re.escape(value), "$options": "i"}
+        elif operator in _OPERATORS:
+            condition = {_OPERATORS[operator]: value}
+        else:
+            raise ValueError(f"The lookup '{lookup}' is not supported.")
+        current = query.get(field)
+        if current is None:
+            query[field] = condition
+        else:
+            # Several lookups over the same field, e.g. a range.
+            if not isinstance(current, dict):
+                current = query[field] = {"$eq": current}
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            current.update(condition)
+    return query
+
+
+def to_projection(fields: Optional[tuple]) -> Optional[dict]:
+    if fields is None:
+        return None
+    return {field: True for field in fields}
+
+
+def to_model(model, document: dict, fields: Optional[tuple] = None):
+    """
+    This function builds a model instance from a raw document, the fields
+    that were not loaded are deferred as they are with QuerySet.only().
+    """
+    # from_db expects the values in the order of the model fields.
+    names = [field.attname for field in model._meta.concrete_fields
+             if fields is None or field.attname in fields]
+    return model.from_db("default", names,
+                         [document.get(name) for name in names])
+
+
+def set_fields(model, id, changes: dict, timestamp_field: str):
+    """
+    This function writes only the given fields of a record, and its update
+    timestamp, with a single find_one_and_update. The record is not read
+    first, so concurrent writers of other fields do not overwrite each
+    other.
+    :param model: Model of the collection.
+    :param id: _id of the record.
+    :param changes: Values of the fields to set.
+    :param timestamp_field: Field that stores the date of the last update.
+    :return: The updated record as a model instance.
+    """
+    document = get_collection(model).find_one_and_update(
+        {"_id": id},
+        {"$set": dict(changes, **{timestamp_field: timezone.now()})},
+        return_document=ReturnDocument.AFTER
+    )
+    if document is None:
+        raise model.DoesNotExist(
+            f"{model._meta.object_name} matching query does not exist.")
+    return to_model(model, document)
+
+
+def set_fields_with_previous(model, id, changes: dict,
+                             timestamp_field: str) -> Tuple[object, dict]:
+    """
+    This function writes the given fields of a record as set_fields does,
+    and also returns the document it had before the update, e.g. to know
+    the references that the update replaced.
+    :return: The updated record as a model instance and the previous
+    document.
+    """
+    now = timezone.now()
+    # Mongo stores the dates with millisecond precision.
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    values = dict(changes, **{timestamp_field: now})
+    previous = get_collection(model).find_one_and_update(
+        {"_id": id}, {"$set": values},
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
+        raise model.DoesNotExist(
+            f"{model._meta.object_name} matching query does not exist.")
+    # $set writes exactly the values, so the record after the update is
+    # the previous one with them.
+    return to_model(model, dict(previous, **values)), previous
+
+
+def get_version(model, query: dict,
+                timestamp_field: str) -> Tuple[int, Optional[datetime]]:
+    """
+    This function returns the number of records that match the query and
+    their most recent update date, any write to those records changes one
+    of them. With an index that starts with the filtered fields and ends
+    with the timestamp both are answered from the index.
+    :param model: Model of the collection.
+    :param query: Mongo query, an empty one uses the collection metadata to
+    count the records.
+    :param timestamp_field: Field that stores the date of the last update.
+    """
+    collection = get_collection(model)
+    count = collection.count_documents(query) if query \
+        else collection.estimated_document_count()
+    latest = collection.find_one(query, {timestamp_field: True, "_id": False},
+                                 sort=[(timestamp_field, DESCENDING)])
+    return count, None if latest is None else latest.get(timestamp_field)
+
+
+def to_document(model_object) -> dict:
+    """
+    This function returns the stored representation of a model instance.
+    """
+    return {
+        field.attname: getattr(model_object, field.attname)
+        for field in model_object._meta.concrete_fields
+    }
@@ -0,0 +1,124 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from .env import AppEnv
+
+
+def parse_limit(raw_limit: Optional[str],
+                default: int = AppEnv.PAGINATION_DEFAULT_LIMIT,
+                maximum: int = AppEnv.PAGINATION_MAX_LIMIT) -> int:
+    """
+    This function validates the 'limit' query parameter and bounds it by the
+    configured maximum page size.
+    :param raw_limit: Value received in the query string, it can be None.
+    :param default: Value used when the parameter was not sent.
+    :param maximum: Upper bound of the result.
+    :return: The page size to use.
+    """
+    if raw_limit is None or raw_limit == "":
+        return default
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise ValueError("The 'limit' parameter must be an integer.")
+    if limit < 1:
+        raise ValueError("The 'limit' parameter must be greater than zero.")
+    return min(limit, maximum)
+
+
+def encode_cursor(sort_key: str, value: Any, last_id: Any) -> str:
+    """
+    This function builds the opaque cursor that points after the last record
+    of a page.
+    :param sort_key: Sort key used to build the page, e.g. 'name' or '-date'.
+    :param value: Value of the sort field in the last record of the page.
+    :param last_id: _id of the last record of the page.
+    :return: URL-safe string.
+    """
+    if isinstance(value, ObjectId):
+        value = str(value)
+    is_datetime = isinstance(value, datetime)
+    payload = {
+        "s": sort_key,
+        "v": value.isoformat() if is_datetime else value,
+        "d": is_datetime,
+        "i": str(last_id),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> Tuple[Any, ObjectId]:
+    """
+    This function decodes a cursor created by 'encode_cursor'.
+    :param cursor: Value received in the 'after' query parameter.
+    :param sort_key: Sort key of the current request, it must match the
+    one used to create the cursor.
+    :return: Tuple with the value of the sort field and the _id.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        value = payload["v"]
+        if payload["d"]:
+            value = datetime.fromisoformat(value)
+        last_id = ObjectId(payload["i"])
+        cursor_sort_key = payload["s"]
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError,
+            KeyError, TypeError, InvalidId):
+        raise ValueError("The 'after' cursor is not valid.")
+    if cursor_sort_key != sort_key:
+        raise ValueError("The 'after' cursor does not match the requested "
+                         "sort.")
+    return value, last_id
+
+
+def encode_watermark(positions: Dict[str, Optional[Tuple[datetime, Any]]],
+                     issued: datetime) -> str:
+    """
+    This function builds the opaque token of a changes feed, it points after
+    the last record returned from each source.
+    :param positions: (date, _id) pair of the last record by source, None
+    when nothing was returned from the source yet.
+    :param issued: Date when the token was created.
+    :return: URL-safe string.
+    """
+    payload = {
+        "t": issued.isoformat(),
+        "p": {
+            name: None if position is None
+            else [position[0].isoformat(), str(position[1])]
+            for name, position in positions.items()
+        },
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_watermark(token: str
+                     ) -> Tuple[Dict[str, Optional[Tuple]], datetime]:
+    """
+    This function decodes a token created by 'encode_watermark'.
+    :return: Tuple with the positions by source and the date when the
+    token was created.
+    """
+    try:
+        padding = "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(token + padding))
+        positions = {
+            name: None if position is None
+            else (datetime.fromisoformat(position[0]), ObjectId(position[1]))
+            for name, position in payload["p"].items()
+        }
+        issued = datetime.fromisoformat(payload["t"])
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError,
+            KeyError, TypeError, ValueError, AttributeError, IndexError,
+            InvalidId):
+        raise ValueError("The 'since' token is not valid.")
+    return positions, issued
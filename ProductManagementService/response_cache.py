@@ -0,0 +1,210 @@
+import copy
+import functools
+import logging
+import time
+from typing import Callable, Iterable, NamedTuple, Optional
+from urllib.parse import urlencode
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.apps import apps
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework import request
+
+from . import metrics
+from .cache import ResponseCache
+from .concurrency import get_refresh_executor
+from .env import AppEnv
+from .logger import logger
+
+RESPONSE_CACHE = ResponseCache(AppEnv.RESPONSE_CACHE_MAX_BYTES,
+                               AppEnv.RESPONSE_CACHE_TTL,
+                               AppEnv.RESPONSE_CACHE_MAX_ENTRY_BYTES,
+                               AppEnv.RESPONSE_CACHE_MAX_STALENESS)
+metrics.register("response_cache", RESPONSE_CACHE.stats)
+
+# Headers that would let the refresh of a stale entry answer 304.
+CONDITIONAL_HEADERS: tuple = ("HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE")
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    content_type: str
+    content: bytes
+    etag: Optional[str]
+    stored_at: float
+
+
+def cache_key(request: request.Request) -> str:
+    """
+    This function returns the path and the sorted query parameters, so the
+    same listing requested with the parameters in another order shares the
+    entry.
+    """
+    params = sorted((name, value) for name, values in request.GET.lists()
+                    for value in values)
+    return f"{request.path}?{urlencode(params)}"
+
+
+def invalidate(tags: Iterable[str]):
+    RESPONSE_CACHE.invalidate_tags(tags)
+
+
+def cached_response(get_tags: Callable) -> Callable:
+    """
+    This decorator answers the GET of a view with the encoded response of a
+    previous request with the same parameters. The responses are cached
+    until a write invalidates one of their tags or the TTL expires. With
+    RESPONSE_CACHE_MAX_STALENESS an expired response is still returned
+    while a single background request per key reads it again.
+    :param get_tags: Method of the view that receives the request and
+    returns the tags of the records the response would contain, or None
+    when the response must not be cached, e.g. a stream.
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(view, request: request.Request, *args, **kwargs):
+            if RESPONSE_CACHE.max_bytes <= 0:
+                return method(view, request, *args, **kwargs)
+            try:
+                tags = get_tags(view, request)
+            except (ValueError, InvalidId):
+                # The view answers the invalid parameters.
+                tags = None
+            if tags is None:
+                return method(view, request, *args, **kwargs)
+            key = cache_key(request)
+            cached, stale = RESPONSE_CACHE.get(key)
+            if cached is not None:
+                if stale:
+                    refresh(type(view), request, method, key, tags, args,
+                            kwargs)
+                return to_response(request, cached, stale)
+            generation = RESPONSE_CACHE.generation
+            response = method(view, request, *args, **kwargs)
+            if store(key, response, tags, generation):
+                response["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
+
+
+def store(key: str, response: HttpResponse, tags: Iterable[str],
+          generation: int) -> bool:
+    """
+    This function caches a successful response that is not a stream.
+    :return: True if the response was stored.
+    """
+    if response.streaming or not 200 <= response.status_code < 300:
+        return False
+    cached = CachedResponse(response.status_code, response["Content-Type"],
+                            response.content, response.get("ETag"),
+                            time.monotonic())
+    return RESPONSE_CACHE.set(key, cached, len(cached.content), tags,
+                              generation)
+
+
+def refresh(view_class: type, request: request.Request, method: Callable,
+            key: str, tags: Iterable[str], args: tuple = (),
+            kwargs: Optional[dict] = None):
+    """
+    This function reads a stale entry again in the refresh pool, unless
+    it is already being refreshed. If the database is still unavailable
+    the view answers an error, it is not stored and the stale entry is
+    served until it reaches the maximum staleness.
+    :param view_class: Class of the view, a new instance answers the
+    refresh, the one of the request is not shared with the pool thread.
+    :param method: Undecorated method of the view.
+    """
+    if not RESPONSE_CACHE.begin_refresh(key):
+        return
+    http_request = copy.copy(request._request)
+    http_request.META = {name: value
+                         for name, value in http_request.META.items()
+                         if name not in CONDITIONAL_HEADERS}
+    kwargs = kwargs or {}
+
+    def run():
+        logger.info("Response cache - refresh method:::")
+        try:
+            generation = RESPONSE_CACHE.generation
+            response = call_view(view_class, method, http_request, args,
+                                 kwargs)
+            if not store(key, response, tags, generation):
+                logger.warning(f"The response of {key} was not refreshed, "
+                               f"status {response.status_code}.")
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+        finally:
+            RESPONSE_CACHE.end_refresh(key)
+
+    try:
+        get_refresh_executor().submit(run)
+    except RuntimeError:
+        # The pool is shut down when the process exits.
+        RESPONSE_CACHE.end_refresh(key)
+
+
+def call_view(view_class: type, method: Callable, http_request,
+              args: tuple, kwargs: dict) -> HttpResponse:
+    """
+    This function answers a request with a new instance of the view, built
+    by the injector as django_injector does for each request, and with the
+    initialization of APIView.dispatch.
+    """
+    injector = apps.get_app_config("django_injector").injector
+    view = injector.create_object(view_class)
+    view.setup(http_request, *args, **kwargs)
+    drf_request = view.initialize_request(http_request, *args, **kwargs)
+    view.request = drf_request
+    view.headers = view.default_response_headers
+    view.initial(drf_request, *args, **kwargs)
+    return method(view, drf_request, *args, **kwargs)
+
+
+def to_response(request: request.Request, cached: CachedResponse,
+                stale: bool = False) -> HttpResponse:
+    """
+    This function rebuilds a cached response, the entry is dropped by any
+    write to its records, so its ETag is still valid and the conditional
+    requests are answered without querying the version. A stale response
+    has its age in the Age header.
+    """
+    if cached.etag is not None:
+        response = get_conditional_response(request, etag=cached.etag)
+        if response is not None:
+            response["ETag"] = cached.etag
+            return response
+    response = HttpResponse(cached.content, status=cached.status,
+                            content_type=cached.content_type)
+    if cached.etag is not None:
+        response["ETag"] = cached.etag
+    if stale:
+        response["X-Cache"] = "STALE"
+        response["Age"] = str(int(time.monotonic() - cached.stored_at))
+    else:
+        response["X-Cache"] = "HIT"
+    return response
+
+
+def collection_tags(collection: str, id: Optional[str]) -> tuple:
+    """
+    This function returns the tags of a GET over a collection, a record
+    read by id only depends on that record, any other query depends on the
+    whole collection.
+    """
+    if id is not None:
+        return (f"{collection}:{ObjectId(id)}",)
+    return (collection,)
+
+
+def record_tags(collection: str, id: Optional[str]) -> tuple:
+    """
+    This function returns the tags invalidated by a write to a record of a
+    collection, e.g. a department.
+    """
+    if id is None:
+        return (collection,)
+    return collection, f"{collection}:{id}"
@@ -53,6 +53,7 @@ INJECTOR_MODULES = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'ProductManagementService.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -110,6 +111,18 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+REST_FRAMEWORK = {
+    'DEFAULT_PARSER_CLASSES': [
+        'ProductManagementService.json_codec.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'ProductManagementService.json_codec.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
 
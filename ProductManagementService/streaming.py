@@ -0,0 +1,83 @@
+from typing import Iterable, Iterator, Optional
+
+from django.http import StreamingHttpResponse
+from rest_framework import request, status
+
+from . import json_codec
+from .env import AppEnv
+from .logger import logger
+
+NDJSON_CONTENT_TYPE: str = "application/x-ndjson"
+JSON_CONTENT_TYPE: str = "application/json"
+
+
+def stream_format(request: request.Request) -> Optional[str]:
+    """
+    This function detects if the client asked for a streamed listing, either
+    with '?stream=1' or with the NDJSON media type in the Accept header.
+    :return: 'ndjson', 'json' or None when the response must not be streamed.
+    """
+    accept = request.META.get("HTTP_ACCEPT", "")
+    if NDJSON_CONTENT_TYPE in accept:
+        return "ndjson"
+    stream = request.query_params.get("stream")
+    if stream is None or stream.lower() in ("0", "false", ""):
+        return None
+    if stream.lower() == "ndjson":
+        return "ndjson"
+    return "json"
+
+
+def _encode_rows(rows: Iterable[dict], output_format: str) -> Iterator[bytes]:
+    """
+    This generator writes the rows in chunks of STREAM_BATCH_SIZE records,
+    so a single chunk is kept in memory at a time.
+    """
+    separator = b"\n" if output_format == "ndjson" else b","
+    if output_format == "json":
+        yield b"["
+    first_chunk = True
+    chunk = []
+    try:
+        for row in rows:
+            chunk.append(json_codec.dumps(row))
+            if len(chunk) >= AppEnv.STREAM_BATCH_SIZE:
+                yield _join_chunk(chunk, separator, first_chunk,
+                                  output_format)
+                first_chunk = False
+                chunk = []
+        if chunk:
+            yield _join_chunk(chunk, separator, first_chunk, output_format)
+    except Exception as e:
+        # The status code was already sent, the client receives a
+        # truncated body.
+        logger.critical(f"A critical error occurred while streaming:"
+                        f"{str(e)}", exc_info=True)
+        raise
+    if output_format == "json":
+        yield b"]"
+
+
+def _join_chunk(chunk: list, separator: bytes, first_chunk: bool,
+                output_format: str) -> bytes:
+    body = separator.join(chunk)
+    if output_format == "ndjson":
+        body += b"\n"
+    elif not first_chunk:
+        body = separator + body
+    return body
+
+
+def streaming_response(rows: Iterable[dict],
+                       output_format: str) -> StreamingHttpResponse:
+    """
+    This function wraps an iterator of dictionaries into a streamed JSON
+    array or NDJSON response.
+    """
+    content_type = NDJSON_CONTENT_TYPE if output_format == "ndjson" \
+        else JSON_CONTENT_TYPE
+    return StreamingHttpResponse(
+        _encode_rows(rows, output_format),
+        content_type=content_type,
+        status=status.HTTP_200_OK
+    )
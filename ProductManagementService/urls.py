@@ -16,8 +16,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from .views import MetricsAPIView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics/', MetricsAPIView.as_view(), name='metrics'),
     path('', include("DepartmentApp.urls")),
     path('', include("MeasureApp.urls")),
     path('', include("ProductApp.urls")),
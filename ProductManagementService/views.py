@@ -0,0 +1,27 @@
+import logging
+
+from rest_framework import request, status
+from rest_framework.views import APIView
+
+from .encoders import JsonResponse
+from .logger import logger
+from .metrics import collect
+
+
+class MetricsAPIView(APIView):
+    """
+    A view class that returns the metrics published by the components of
+    the process, e.g. the hit ratio of the caches.
+    """
+
+    def get(self, request: request.Request):
+        logger.info("View - metrics get method:::")
+        try:
+            return JsonResponse(collect(), status=status.HTTP_200_OK)
+        except Exception as e:
+            logging.critical(f"A critical error occurred:{str(e)}",
+                             exc_info=True)
+            return JsonResponse(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )